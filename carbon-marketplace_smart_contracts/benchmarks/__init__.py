@@ -0,0 +1,8 @@
+"""
+Offline cost benchmarks for the three contracts.
+
+Every ABI method is exercised in the algorand-python-testing emulator and its
+resource usage (inner transactions, box I/O, return size) is compared against
+benchmarks/baseline.json. Run `python -m benchmarks` to print the current
+numbers, `python -m benchmarks --update` to re-record the baseline.
+"""
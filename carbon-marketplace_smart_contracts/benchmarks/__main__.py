@@ -0,0 +1,51 @@
+"""
+python -m benchmarks [--update] [--threshold 0.1]
+
+Prints every method's metrics next to the baseline, plus the start-up time
+of the smart_contracts CLI, and exits non-zero on a regression. --update records the current numbers as the new baseline.
+"""
+
+import argparse
+import sys
+
+from benchmarks.harness import DEFAULT_THRESHOLD, compare, load_baseline, save_baseline
+from benchmarks.scenarios import run_all, unbenchmarked_methods
+from benchmarks.startup import startup_ms
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("--update", action="store_true", help="re-record benchmarks/baseline.json")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    results = run_all()
+    baseline = load_baseline()
+
+    for method, metrics in results.items():
+        recorded = baseline.get(method, {})
+        cells = [
+            f"{metric}={value}" + (f" ({recorded[metric]})" if recorded.get(metric, value) != value else "")
+            for metric, value in metrics.as_dict().items()
+            if value or recorded.get(metric)
+        ]
+        print(f"{method:55} {' '.join(cells)}")
+
+    for method in unbenchmarked_methods():
+        print(f"{method:55} no scenario")
+
+    print(f"{'smart_contracts CLI startup':55} {startup_ms():.0f} ms")
+
+    if args.update:
+        save_baseline(results)
+        print(f"Baseline updated ({len(results)} methods)")
+        return 0
+
+    regressions = compare(baseline, results, args.threshold)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
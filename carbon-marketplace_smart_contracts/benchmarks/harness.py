@@ -0,0 +1,214 @@
+"""
+Measurement primitives for the benchmark suite.
+
+The emulator executes contract code as plain Python, so it cannot report AVM
+opcode cost. Instead each call is measured by what bounds it on-chain: inner
+transactions (16 per call / 256 per group), box I/O (1 KB per box reference)
+and the size of the ABI return log (1 KB). Box traffic is observed by tracing
+the emulator's ledger while the call runs.
+"""
+
+import ast
+import contextlib
+import dataclasses
+import json
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+
+_CONTRACTS_DIR = Path(__file__).resolve().parent.parent / "smart_contracts"
+CONTRACT_SOURCES = {
+    "CreditIssuanceRegistry": _CONTRACTS_DIR / "credit_issuance" / "contract.py",
+    "CarbonMarketplace": _CONTRACTS_DIR / "marketplace" / "contract.py",
+    "RetirementRegistry": _CONTRACTS_DIR / "retirement" / "contract.py",
+}
+
+# A metric regresses when it grows by more than this fraction of its baseline.
+DEFAULT_THRESHOLD = 0.10
+
+ABI_RETURN_PREFIX_BYTES = 4
+
+
+@dataclasses.dataclass
+class Metrics:
+    """Resource usage of one ABI call. Lower is better for every field."""
+
+    inner_txns: int = 0
+    box_reads: int = 0
+    box_read_bytes: int = 0
+    box_writes: int = 0
+    box_write_bytes: int = 0
+    boxes_created: int = 0
+    boxes_deleted: int = 0
+    return_bytes: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return dataclasses.asdict(self)
+
+
+@dataclasses.dataclass(frozen=True)
+class Regression:
+    method: str
+    metric: str
+    baseline: int
+    current: int
+
+    def __str__(self) -> str:
+        return f"{self.method}: {self.metric} {self.baseline} -> {self.current}"
+
+
+class Measurement:
+    """Filled in when the `measure()` block exits; set `result` to the call's return value."""
+
+    def __init__(self) -> None:
+        self.result: Any = None
+        self.metrics = Metrics()
+
+
+class BoxTracer:
+    """
+    Observes box traffic by wrapping the emulator ledger's box accessors.
+    Subclasses override the on_* hooks. Tracers nest: entering one inside
+    another chains to the outer wrappers, and exiting restores them.
+    """
+
+    _METHODS = ("get_box", "set_box", "delete_box")
+
+    def __init__(self, ledger: Any) -> None:
+        self.ledger = ledger
+        self._shadowed: dict[str, Any] = {}
+
+    def on_read(self, app: Any, key: Any, value: bytes) -> None:
+        pass
+
+    def on_write(self, app: Any, key: Any, value: bytes, created: bool) -> None:
+        pass
+
+    def on_delete(self, app: Any, key: Any, existed: bool) -> None:
+        pass
+
+    def __enter__(self) -> "BoxTracer":
+        ledger = self.ledger
+        self._shadowed = {name: vars(ledger)[name] for name in self._METHODS if name in vars(ledger)}
+        get_box, set_box, delete_box, box_exists = (
+            ledger.get_box,
+            ledger.set_box,
+            ledger.delete_box,
+            ledger.box_exists,
+        )
+
+        def traced_get_box(app: Any, key: Any) -> Any:
+            value = get_box(app, key)
+            self.on_read(app, key, value)
+            return value
+
+        def traced_set_box(app: Any, key: Any, value: Any) -> None:
+            created = not box_exists(app, key)
+            set_box(app, key, value)
+            self.on_write(app, key, value, created)
+
+        def traced_delete_box(app: Any, key: Any) -> Any:
+            existed = box_exists(app, key)
+            result = delete_box(app, key)
+            self.on_delete(app, key, existed)
+            return result
+
+        ledger.get_box = traced_get_box
+        ledger.set_box = traced_set_box
+        ledger.delete_box = traced_delete_box
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        for name in self._METHODS:
+            if name in self._shadowed:
+                setattr(self.ledger, name, self._shadowed[name])
+            else:
+                # Drop the instance attribute so the class method shows through again.
+                vars(self.ledger).pop(name, None)
+
+
+class _MetricsTracer(BoxTracer):
+    def __init__(self, ledger: Any, metrics: Metrics) -> None:
+        super().__init__(ledger)
+        self.metrics = metrics
+
+    def on_read(self, app: Any, key: Any, value: bytes) -> None:
+        self.metrics.box_reads += 1
+        self.metrics.box_read_bytes += len(value)
+
+    def on_write(self, app: Any, key: Any, value: bytes, created: bool) -> None:
+        self.metrics.box_writes += 1
+        self.metrics.box_write_bytes += len(value)
+        self.metrics.boxes_created += created
+
+    def on_delete(self, app: Any, key: Any, existed: bool) -> None:
+        self.metrics.boxes_deleted += existed
+
+
+def return_size(value: Any) -> int:
+    """Bytes of the ABI return log for a method result (0 for void methods)."""
+    if value is None:
+        return 0
+    if isinstance(value, tuple):
+        return ABI_RETURN_PREFIX_BYTES + sum(len(item.bytes) for item in value)
+    return ABI_RETURN_PREFIX_BYTES + len(value.bytes)
+
+
+@contextlib.contextmanager
+def measure(ctx: Any) -> Iterator[Measurement]:
+    """
+    Measures the contract call made inside the block.
+
+    The block must create the call's transaction group (ctx.txn.create_group),
+    so that the group's inner transactions are those of the measured call.
+    """
+    measurement = Measurement()
+    with _MetricsTracer(ctx.ledger, measurement.metrics):
+        yield measurement
+    measurement.metrics.inner_txns = sum(len(group) for group in ctx.txn.last_group.itxn_groups)
+    measurement.metrics.return_bytes = return_size(measurement.result)
+
+
+def abi_method_names(contract_path: Path) -> list[str]:
+    """Names of the @arc4.abimethod functions in a contract module, in source order."""
+    tree = ast.parse(contract_path.read_text())
+    names = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.FunctionDef):
+            continue
+        for decorator in node.decorator_list:
+            target = decorator.func if isinstance(decorator, ast.Call) else decorator
+            if ast.unparse(target) == "arc4.abimethod":
+                names.append(node.name)
+    return names
+
+
+def compare(
+    baseline: Mapping[str, Mapping[str, int]],
+    current: Mapping[str, Metrics],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> list[Regression]:
+    """Every metric that grew past `threshold` relative to the baseline."""
+    regressions = []
+    for method, metrics in current.items():
+        recorded = baseline.get(method)
+        if recorded is None:
+            continue
+        for metric, value in metrics.as_dict().items():
+            allowed = recorded.get(metric, 0) * (1 + threshold)
+            if value > allowed:
+                regressions.append(Regression(method, metric, recorded.get(metric, 0), value))
+    return regressions
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, dict[str, int]]:
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_baseline(results: Mapping[str, Metrics], path: Path = BASELINE_PATH) -> None:
+    data = {method: results[method].as_dict() for method in sorted(results)}
+    path.write_text(json.dumps(data, indent=2) + "\n")
@@ -0,0 +1,685 @@
+"""
+One benchmark scenario per ABI method of the three contracts.
+
+Each scenario gets a fresh Deployment (all three contracts created, an issuer
+and a business verified, the clock pinned to NOW), does whatever setup the
+method needs, and measures exactly one call. Batch methods are measured with
+BATCH_SIZE entries so their numbers stay comparable across runs.
+"""
+
+import hashlib
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import contextmanager
+from unittest import mock
+
+from algopy import Account, Asset, UInt64, arc4, op
+from algopy_testing import AlgopyTestContext, algopy_testing_context
+
+from benchmarks.harness import CONTRACT_SOURCES, Measurement, Metrics, abi_method_names, measure
+from smart_contracts.credit_issuance.contract import CreditIssuanceRegistry, CreditSpec, CreditTerms
+from smart_contracts.marketplace.contract import (
+    INDEX_PAGE_IDS,
+    INDEX_PREFIX,
+    LISTING_VERSION,
+    PROJECT_TYPE_BLUE_CARBON,
+    RECLAIM_TOMBSTONE,
+    STANDARD_VERRA,
+    STATUS_ACTIVE,
+    STATUS_SOLD,
+    TOMBSTONE_TTL,
+    CarbonMarketplace,
+    Listing,
+    MetadataDigest,
+)
+from smart_contracts.retirement.contract import RetirementRegistry, RetireItem
+
+NOW = 1_750_000_000
+ONE_YEAR = 31_536_000
+FEE_BPS = 250
+PRICE = 5_000_000
+BATCH_SIZE = 4
+IPFS_HASH = "bafybeigdyrzt5sfp7udm7hu76uh7y26nf3efuylqabf3oclgtqy55fbzdi"
+
+
+class Deployment:
+    """All three contracts deployed side by side in one emulator context."""
+
+    def __init__(self, ctx: AlgopyTestContext) -> None:
+        self.ctx = ctx
+        self.admin = ctx.default_sender
+        ctx.ledger.patch_global_fields(latest_timestamp=NOW)
+
+        self.issuance = CreditIssuanceRegistry()
+        self.marketplace = CarbonMarketplace()
+        self.retirement = RetirementRegistry()
+        self.issuance_app = ctx.ledger.get_app(self.issuance)
+        self.marketplace_app = ctx.ledger.get_app(self.marketplace)
+        self.retirement_app = ctx.ledger.get_app(self.retirement)
+
+        self.issuer = ctx.any.account(opted_apps=[self.issuance_app])
+        self.seller = ctx.any.account(opted_apps=[self.marketplace_app])
+        self.business = ctx.any.account(opted_apps=[self.marketplace_app])
+
+        with self.call(self.admin):
+            self.issuance.create_registry()
+        with self.call(self.admin):
+            self.marketplace.create_marketplace(arc4.UInt64(FEE_BPS), arc4.UInt64(self.issuance_app.id))
+        with self.call(self.admin):
+            self.retirement.create_registry()
+
+        with self.call(self.issuer):
+            self.issuance.register_issuer(arc4.String("Verra NGO"), arc4.String("IN"), arc4.String("VCS"))
+        with self.call(self.admin):
+            self.issuance.verify_issuer(arc4.Address(self.issuer))
+        with self.call(self.business):
+            self.marketplace.register_business(arc4.String("Acme"), arc4.String("DE"))
+        with self.call(self.admin):
+            self.marketplace.verify_business(arc4.Address(self.business))
+
+        self._next_project = 0
+
+    # ── transaction groups ─────────────────────────────────────
+
+    @contextmanager
+    def call(self, sender: Account, *gtxns: object) -> Iterator[None]:
+        """
+        A group whose last transaction is the app call made inside the block.
+        Calls paired with transactions (payments, transfers) are marketplace calls.
+        """
+        if not gtxns:
+            with self.ctx.txn.create_group(active_txn_overrides={"sender": sender}):
+                yield
+            return
+        app_call = self.ctx.any.txn.application_call(sender=sender, app_id=self.marketplace_app)
+        with self.ctx.txn.create_group(gtxns=[*gtxns, app_call], active_txn_index=len(gtxns)):
+            yield
+
+    @contextmanager
+    def registry_calls(self) -> Iterator[None]:
+        """
+        Answers the marketplace's get_credit_terms() inner call from the
+        registry's reverse index, since the emulator cannot run arc4.abi_call.
+        The inner call itself is not counted in the metrics.
+        """
+
+        def abi_call(_method: object, asset_id: arc4.UInt64, **_kwargs: object) -> tuple[CreditTerms, None]:
+            terms = self.ctx.ledger.get_box(self.issuance_app, b"a" + asset_id.bytes.value)
+            return CreditTerms.from_bytes(terms), None
+
+        with mock.patch.object(arc4, "abi_call", abi_call):
+            yield
+
+    @contextmanager
+    def measure(self, sender: Account, *gtxns: object) -> Iterator[Measurement]:
+        with measure(self.ctx) as measurement, self.call(sender, *gtxns):
+            yield measurement
+
+    def payment(self, sender: Account, amount: int) -> object:
+        return self.ctx.any.txn.payment(
+            sender=sender,
+            receiver=self.marketplace_app.address,
+            amount=UInt64(amount),
+        )
+
+    # ── fixtures ───────────────────────────────────────────────
+
+    def project_id(self) -> arc4.String:
+        self._next_project += 1
+        return arc4.String(f"VCS-{self._next_project:06d}")
+
+    def credit_spec(self) -> CreditSpec:
+        return CreditSpec(
+            project_id=self.project_id(),
+            project_name=arc4.String("Mangrove Restoration"),
+            co2_tonnes=arc4.UInt64(100),
+            vintage_year=arc4.UInt64(2024),
+            ipfs_hash=arc4.String(IPFS_HASH),
+            years_valid=arc4.UInt64(5),
+        )
+
+    def mint(self) -> arc4.String:
+        """Mints an NFT credit and returns its project ID."""
+        spec = self.credit_spec()
+        with self.call(self.issuer):
+            self.issuance.mint_carbon_credit(
+                spec.project_id,
+                spec.project_name,
+                arc4.String("Sundarbans"),
+                spec.co2_tonnes,
+                spec.vintage_year,
+                arc4.String("Blue Carbon"),
+                spec.ipfs_hash,
+                spec.years_valid,
+            )
+        return spec.project_id
+
+    def credit(self, total: int = 1) -> Asset:
+        """A registry-created credit ASA with its reverse index entry."""
+        asset = self.ctx.any.asset(creator=self.issuance_app.address, total=UInt64(total), decimals=UInt64(0))
+        self.ctx.ledger.set_box(
+            self.issuance_app,
+            b"a" + op.itob(asset.id).value,
+            op.itob(NOW + 5 * ONE_YEAR).value + op.itob(2024).value + op.itob(max(total, 100)).value,
+        )
+        return asset
+
+    def listing(
+        self,
+        total: int = 1,
+        status: int = STATUS_ACTIVE,
+        expiry: int = NOW + ONE_YEAR,
+        indexed: bool = True,
+        seller: Account | None = None,
+    ) -> Asset:
+        """
+        Writes a listing box directly, as list_credit() would have, and adds
+        active listings to their index bucket unless indexed is False.
+        """
+        asset = self.credit(total)
+        fungible = 0x80 if total > 1 else 0
+        listing = Listing(
+            version=arc4.UInt8(LISTING_VERSION),
+            flags=arc4.UInt8(status | fungible),
+            vintage_year=arc4.UInt16(2024),
+            seller=arc4.Address(seller or self.seller),
+            price=arc4.UInt64(PRICE),
+            co2_tonnes=arc4.UInt32(max(total, 100)),
+            min_qty=arc4.UInt32(1),
+            listed_at=arc4.UInt32(NOW - 60),
+            expiry=arc4.UInt32(expiry),
+            project_type=arc4.UInt8(PROJECT_TYPE_BLUE_CARBON),
+            standard=arc4.UInt8(STANDARD_VERRA),
+            metadata_digest=MetadataDigest.from_bytes(hashlib.sha256(IPFS_HASH.encode()).digest()),
+        )
+        self.ctx.ledger.set_box(self.marketplace_app, op.itob(asset.id).value, listing.bytes.value)
+        if status == STATUS_ACTIVE and indexed:
+            self.index(asset, listing)
+        return asset
+
+    def index_key(
+        self, asset_id: int, vintage_year: int = 2024, project_type: int = PROJECT_TYPE_BLUE_CARBON
+    ) -> bytes:
+        page = asset_id // INDEX_PAGE_IDS
+        return INDEX_PREFIX + vintage_year.to_bytes(2, "big") + bytes([project_type]) + page.to_bytes(8, "big")
+
+    def index(self, asset: Asset, listing: Listing) -> None:
+        key = self.index_key(
+            asset.id.value, listing.vintage_year.as_uint64().value, listing.project_type.as_uint64().value
+        )
+        bucket = b""
+        if self.ctx.ledger.box_exists(self.marketplace_app, key):
+            bucket = self.ctx.ledger.get_box(self.marketplace_app, key)
+        asset_ids = sorted({*(bucket[i : i + 8] for i in range(0, len(bucket), 8)), op.itob(asset.id).value})
+        self.ctx.ledger.set_box(self.marketplace_app, key, b"".join(asset_ids))
+
+    def asset_ids(self, assets: Sequence[Asset]) -> arc4.DynamicArray[arc4.UInt64]:
+        return arc4.DynamicArray[arc4.UInt64](*[arc4.UInt64(asset.id) for asset in assets])
+
+
+Scenario = Callable[[Deployment], Measurement]
+SCENARIOS: dict[str, Scenario] = {}
+
+
+def scenario(contract: str, method: str) -> Callable[[Scenario], Scenario]:
+    def register(fn: Scenario) -> Scenario:
+        SCENARIOS[f"{contract}.{method}"] = fn
+        return fn
+
+    return register
+
+
+def run_scenario(name: str) -> Metrics:
+    with algopy_testing_context() as ctx:
+        env = Deployment(ctx)
+        with env.registry_calls():
+            return SCENARIOS[name](env).metrics
+
+
+def run_all() -> dict[str, Metrics]:
+    return {name: run_scenario(name) for name in sorted(SCENARIOS)}
+
+
+def unbenchmarked_methods() -> list[str]:
+    """ABI methods that have no scenario yet."""
+    return [
+        f"{contract}.{method}"
+        for contract, source in CONTRACT_SOURCES.items()
+        for method in abi_method_names(source)
+        if f"{contract}.{method}" not in SCENARIOS
+    ]
+
+
+# ─────────────────────────────────────────
+#  CreditIssuanceRegistry
+# ─────────────────────────────────────────
+
+ISSUANCE = "CreditIssuanceRegistry"
+
+
+@scenario(ISSUANCE, "create_registry")
+def _issuance_create(env: Deployment) -> Measurement:
+    contract = CreditIssuanceRegistry()
+    with env.measure(env.admin) as m:
+        contract.create_registry()
+    return m
+
+
+@scenario(ISSUANCE, "register_issuer")
+def _register_issuer(env: Deployment) -> Measurement:
+    issuer = env.ctx.any.account(opted_apps=[env.issuance_app])
+    with env.measure(issuer) as m:
+        env.issuance.register_issuer(arc4.String("Gold Standard NGO"), arc4.String("KE"), arc4.String("GS"))
+    return m
+
+
+@scenario(ISSUANCE, "verify_issuer")
+def _verify_issuer(env: Deployment) -> Measurement:
+    with env.measure(env.admin) as m:
+        env.issuance.verify_issuer(arc4.Address(env.issuer))
+    return m
+
+
+def _mint_args(env: Deployment) -> tuple[arc4.String | arc4.UInt64, ...]:
+    spec = env.credit_spec()
+    return (
+        spec.project_id,
+        spec.project_name,
+        arc4.String("Sundarbans"),
+        spec.co2_tonnes,
+        spec.vintage_year,
+        arc4.String("Blue Carbon"),
+        spec.ipfs_hash,
+        spec.years_valid,
+    )
+
+
+@scenario(ISSUANCE, "mint_carbon_credit")
+def _mint_carbon_credit(env: Deployment) -> Measurement:
+    args = _mint_args(env)
+    with env.measure(env.issuer) as m:
+        m.result = env.issuance.mint_carbon_credit(*args)
+    return m
+
+
+@scenario(ISSUANCE, "mint_fungible_credit")
+def _mint_fungible_credit(env: Deployment) -> Measurement:
+    args = _mint_args(env)
+    with env.measure(env.issuer) as m:
+        m.result = env.issuance.mint_fungible_credit(*args)
+    return m
+
+
+@scenario(ISSUANCE, "mint_carbon_credits_batch")
+def _mint_batch(env: Deployment) -> Measurement:
+    credits = arc4.DynamicArray[CreditSpec](*[env.credit_spec() for _ in range(BATCH_SIZE)])
+    with env.measure(env.issuer) as m:
+        m.result = env.issuance.mint_carbon_credits_batch(credits)
+    return m
+
+
+@scenario(ISSUANCE, "index_credit")
+def _index_credit(env: Deployment) -> Measurement:
+    project_id = env.mint()
+    with env.measure(env.business) as m:
+        m.result = env.issuance.index_credit(project_id)
+    return m
+
+
+@scenario(ISSUANCE, "get_credit_terms")
+def _get_credit_terms(env: Deployment) -> Measurement:
+    asset = env.credit()
+    with env.measure(env.business) as m:
+        m.result = env.issuance.get_credit_terms(arc4.UInt64(asset.id))
+    return m
+
+
+@scenario(ISSUANCE, "is_credit_expired")
+def _is_credit_expired(env: Deployment) -> Measurement:
+    project_id = env.mint()
+    with env.measure(env.business) as m:
+        m.result = env.issuance.is_credit_expired(project_id)
+    return m
+
+
+@scenario(ISSUANCE, "get_credit_expiry")
+def _get_credit_expiry(env: Deployment) -> Measurement:
+    project_id = env.mint()
+    with env.measure(env.business) as m:
+        m.result = env.issuance.get_credit_expiry(project_id)
+    return m
+
+
+@scenario(ISSUANCE, "get_credit_asset_id")
+def _get_credit_asset_id(env: Deployment) -> Measurement:
+    project_id = env.mint()
+    with env.measure(env.business) as m:
+        m.result = env.issuance.get_credit_asset_id(project_id)
+    return m
+
+
+@scenario(ISSUANCE, "get_issuer_stats")
+def _get_issuer_stats(env: Deployment) -> Measurement:
+    with env.measure(env.business) as m:
+        m.result = env.issuance.get_issuer_stats(arc4.Address(env.issuer))
+    return m
+
+
+@scenario(ISSUANCE, "get_total_issued")
+def _get_total_issued(env: Deployment) -> Measurement:
+    with env.measure(env.business) as m:
+        m.result = env.issuance.get_total_issued()
+    return m
+
+
+# ─────────────────────────────────────────
+#  CarbonMarketplace
+# ─────────────────────────────────────────
+
+MARKETPLACE = "CarbonMarketplace"
+
+
+@scenario(MARKETPLACE, "create_marketplace")
+def _marketplace_create(env: Deployment) -> Measurement:
+    contract = CarbonMarketplace()
+    with env.measure(env.admin) as m:
+        contract.create_marketplace(arc4.UInt64(FEE_BPS), arc4.UInt64(env.issuance_app.id))
+    return m
+
+
+@scenario(MARKETPLACE, "register_business")
+def _register_business(env: Deployment) -> Measurement:
+    business = env.ctx.any.account(opted_apps=[env.marketplace_app])
+    with env.measure(business) as m:
+        env.marketplace.register_business(arc4.String("Globex"), arc4.String("US"))
+    return m
+
+
+@scenario(MARKETPLACE, "verify_business")
+def _verify_business(env: Deployment) -> Measurement:
+    with env.measure(env.admin) as m:
+        env.marketplace.verify_business(arc4.Address(env.business))
+    return m
+
+
+@scenario(MARKETPLACE, "reject_business")
+def _reject_business(env: Deployment) -> Measurement:
+    with env.measure(env.admin) as m:
+        env.marketplace.reject_business(arc4.Address(env.business))
+    return m
+
+
+@scenario(MARKETPLACE, "set_reclaim_mode")
+def _set_reclaim_mode(env: Deployment) -> Measurement:
+    with env.measure(env.admin) as m:
+        env.marketplace.set_reclaim_mode(arc4.UInt64(RECLAIM_TOMBSTONE))
+    return m
+
+
+@scenario(MARKETPLACE, "set_pull_payments")
+def _set_pull_payments(env: Deployment) -> Measurement:
+    with env.measure(env.admin) as m:
+        env.marketplace.set_pull_payments(arc4.Bool(True))
+    return m
+
+
+@scenario(MARKETPLACE, "list_credit")
+def _list_credit(env: Deployment) -> Measurement:
+    asset = env.credit()
+    transfer = env.ctx.any.txn.asset_transfer(
+        sender=env.seller,
+        asset_receiver=env.marketplace_app.address,
+        xfer_asset=asset,
+        asset_amount=UInt64(1),
+    )
+    with env.measure(env.seller, transfer) as m:
+        env.marketplace.list_credit(
+            arc4.UInt64(asset.id),
+            arc4.UInt64(PRICE),
+            arc4.String("Blue Carbon"),
+            arc4.String("VCS"),
+            arc4.UInt64(1),
+            arc4.String(IPFS_HASH),
+        )
+    return m
+
+
+@scenario(MARKETPLACE, "buy_credit")
+def _buy_credit(env: Deployment) -> Measurement:
+    asset = env.listing()
+    with env.measure(env.business, env.payment(env.business, PRICE)) as m:
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(1))
+    return m
+
+
+@scenario(MARKETPLACE, "buy_credits")
+def _buy_credits(env: Deployment) -> Measurement:
+    assets = [env.listing() for _ in range(BATCH_SIZE)]
+    with env.measure(env.business, env.payment(env.business, PRICE * BATCH_SIZE)) as m:
+        m.result = env.marketplace.buy_credits(env.asset_ids(assets))
+    return m
+
+
+@scenario(MARKETPLACE, "claim_proceeds")
+def _claim_proceeds(env: Deployment) -> Measurement:
+    env.ctx.ledger.set_box(env.marketplace_app, b"p" + env.seller.bytes.value, op.itob(PRICE).value)
+    with env.measure(env.seller) as m:
+        m.result = env.marketplace.claim_proceeds()
+    return m
+
+
+@scenario(MARKETPLACE, "withdraw_fees")
+def _withdraw_fees(env: Deployment) -> Measurement:
+    env.marketplace.accrued_fees.value = UInt64(PRICE)
+    with env.measure(env.admin) as m:
+        env.marketplace.withdraw_fees(arc4.UInt64(PRICE))
+    return m
+
+
+@scenario(MARKETPLACE, "cancel_listing")
+def _cancel_listing(env: Deployment) -> Measurement:
+    asset = env.listing()
+    with env.measure(env.seller) as m:
+        env.marketplace.cancel_listing(arc4.UInt64(asset.id))
+    return m
+
+
+@scenario(MARKETPLACE, "sweep_expired")
+def _sweep_expired(env: Deployment) -> Measurement:
+    assets = [env.listing(expiry=NOW - 1) for _ in range(BATCH_SIZE)]
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.sweep_expired(env.asset_ids(assets))
+    return m
+
+
+@scenario(MARKETPLACE, "compact_listings")
+def _compact_listings(env: Deployment) -> Measurement:
+    env.marketplace.reclaim_mode.value = UInt64(RECLAIM_TOMBSTONE)
+    assets = [env.listing(status=STATUS_SOLD) for _ in range(BATCH_SIZE)]
+    with env.measure(env.admin) as m:
+        m.result = env.marketplace.compact_listings(env.asset_ids(assets))
+    return m
+
+
+@scenario(MARKETPLACE, "prune_tombstones")
+def _prune_tombstones(env: Deployment) -> Measurement:
+    assets = [env.credit() for _ in range(BATCH_SIZE)]
+    closed_at = NOW - TOMBSTONE_TTL - 1
+    for asset in assets:
+        env.ctx.ledger.set_box(
+            env.marketplace_app,
+            b"t" + op.itob(asset.id).value,
+            bytes([STATUS_SOLD]) + op.itob(closed_at).value,
+        )
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.prune_tombstones(env.asset_ids(assets))
+    return m
+
+
+@scenario(MARKETPLACE, "migrate_listings")
+def _migrate_listings(env: Deployment) -> Measurement:
+    assets = [env.credit() for _ in range(BATCH_SIZE)]
+    for asset in assets:
+        legacy = (
+            op.itob(asset.id).value
+            + env.seller.bytes.value
+            + b"".join(
+                op.itob(value).value
+                for value in (PRICE, 100, 2024, 1, NOW - 60, NOW + ONE_YEAR, STATUS_ACTIVE)
+            )
+        )
+        env.ctx.ledger.set_box(env.marketplace_app, op.itob(asset.id).value, legacy)
+    with env.measure(env.admin) as m:
+        m.result = env.marketplace.migrate_listings(env.asset_ids(assets))
+    return m
+
+
+@scenario(MARKETPLACE, "index_listings")
+def _index_listings(env: Deployment) -> Measurement:
+    assets = [env.listing(indexed=False) for _ in range(BATCH_SIZE)]
+    with env.measure(env.admin) as m:
+        m.result = env.marketplace.index_listings(env.asset_ids(assets))
+    return m
+
+
+@scenario(MARKETPLACE, "get_listing")
+def _get_listing(env: Deployment) -> Measurement:
+    asset = env.listing()
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.get_listing(arc4.UInt64(asset.id))
+    return m
+
+
+@scenario(MARKETPLACE, "get_listings")
+def _get_listings(env: Deployment) -> Measurement:
+    assets = [env.listing() for _ in range(BATCH_SIZE)]
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.get_listings(env.asset_ids(assets))
+    return m
+
+
+@scenario(MARKETPLACE, "get_active_listings")
+def _get_active_listings(env: Deployment) -> Measurement:
+    assets = [env.listing() for _ in range(BATCH_SIZE)]
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.get_active_listings(
+            arc4.UInt16(2024), arc4.UInt8(PROJECT_TYPE_BLUE_CARBON), arc4.UInt64(assets[0].id.value // INDEX_PAGE_IDS)
+        )
+    return m
+
+
+@scenario(MARKETPLACE, "is_listing_expired")
+def _is_listing_expired(env: Deployment) -> Measurement:
+    asset = env.listing()
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.is_listing_expired(arc4.UInt64(asset.id))
+    return m
+
+
+@scenario(MARKETPLACE, "get_proceeds")
+def _get_proceeds(env: Deployment) -> Measurement:
+    with env.measure(env.seller) as m:
+        m.result = env.marketplace.get_proceeds(arc4.Address(env.seller))
+    return m
+
+
+@scenario(MARKETPLACE, "get_business_status")
+def _get_business_status(env: Deployment) -> Measurement:
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.get_business_status(arc4.Address(env.business))
+    return m
+
+
+@scenario(MARKETPLACE, "get_stats")
+def _get_stats(env: Deployment) -> Measurement:
+    with env.measure(env.business) as m:
+        m.result = env.marketplace.get_stats()
+    return m
+
+
+# ─────────────────────────────────────────
+#  RetirementRegistry
+# ─────────────────────────────────────────
+
+RETIREMENT = "RetirementRegistry"
+
+
+@scenario(RETIREMENT, "create_registry")
+def _retirement_create(env: Deployment) -> Measurement:
+    contract = RetirementRegistry()
+    with env.measure(env.admin) as m:
+        contract.create_registry()
+    return m
+
+
+def _retire(env: Deployment) -> Asset:
+    asset = env.credit()
+    with env.call(env.business):
+        env.retirement.retire_credit(
+            arc4.UInt64(asset.id), arc4.String("Acme"), arc4.UInt64(100), arc4.String("bafycert")
+        )
+    return asset
+
+
+@scenario(RETIREMENT, "retire_credit")
+def _retire_credit(env: Deployment) -> Measurement:
+    asset = env.credit()
+    with env.measure(env.business) as m:
+        m.result = env.retirement.retire_credit(
+            arc4.UInt64(asset.id), arc4.String("Acme"), arc4.UInt64(100), arc4.String("bafycert")
+        )
+    return m
+
+
+@scenario(RETIREMENT, "retire_credits")
+def _retire_credits(env: Deployment) -> Measurement:
+    credits = arc4.DynamicArray[RetireItem](
+        *[RetireItem(asset_id=arc4.UInt64(env.credit().id), co2_tonnes=arc4.UInt64(100)) for _ in range(BATCH_SIZE)]
+    )
+    with env.measure(env.business) as m:
+        m.result = env.retirement.retire_credits(credits, arc4.String("Acme"), arc4.String("bafycert"))
+    return m
+
+
+@scenario(RETIREMENT, "verify_retirement")
+def _verify_retirement(env: Deployment) -> Measurement:
+    asset = _retire(env)
+    with env.measure(env.admin) as m:
+        m.result = env.retirement.verify_retirement(arc4.UInt64(asset.id))
+    return m
+
+
+@scenario(RETIREMENT, "verify_fungible_retirement")
+def _verify_fungible_retirement(env: Deployment) -> Measurement:
+    asset = env.credit(total=500)
+    env.ctx.ledger.update_asset_holdings(asset, env.retirement_app.address, balance=100)
+    with env.call(env.business):
+        env.retirement.retire_credit(
+            arc4.UInt64(asset.id), arc4.String("Acme"), arc4.UInt64(100), arc4.String("bafycert")
+        )
+    with env.measure(env.admin) as m:
+        m.result = env.retirement.verify_fungible_retirement(arc4.UInt64(asset.id), arc4.Address(env.business))
+    return m
+
+
+@scenario(RETIREMENT, "get_company_totals")
+def _get_company_totals(env: Deployment) -> Measurement:
+    _retire(env)
+    with env.measure(env.admin) as m:
+        m.result = env.retirement.get_company_totals(arc4.Address(env.business))
+    return m
+
+
+@scenario(RETIREMENT, "get_company_retirements")
+def _get_company_retirements(env: Deployment) -> Measurement:
+    for _ in range(BATCH_SIZE):
+        _retire(env)
+    with env.measure(env.admin) as m:
+        m.result = env.retirement.get_company_retirements(arc4.Address(env.business), arc4.UInt64(0))
+    return m
+
+
+@scenario(RETIREMENT, "get_global_stats")
+def _get_global_stats(env: Deployment) -> Measurement:
+    with env.measure(env.admin) as m:
+        m.result = env.retirement.get_global_stats()
+    return m
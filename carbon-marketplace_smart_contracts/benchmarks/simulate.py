@@ -0,0 +1,481 @@
+"""
+Offline scale simulator: replays randomized credit lifecycles across all three
+contracts in the algorand-python-testing emulator.
+
+    python -m benchmarks.simulate --credits 100000 --seed 7 --checkpoints 20 --json sim.json
+
+A seeded RNG drives issuers minting credits, issuers listing them, businesses
+buying and retiring them, sellers cancelling, the clock advancing past
+expiries and anyone sweeping expired listings. Every operation is a real
+contract call. A Python model of the expected state is checked against the
+contracts' globals and boxes at every checkpoint, and each checkpoint records
+storage growth (boxes, bytes, minimum balance per app) and throughput.
+"""
+
+import argparse
+import dataclasses
+import itertools
+import json
+import random
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from collections.abc import Iterator
+from typing import Any
+
+from algopy import Account, Asset, UInt64, arc4
+from algopy_testing import algopy_testing_context
+
+from benchmarks.harness import BoxTracer, Metrics
+from benchmarks.scenarios import FEE_BPS, NOW, Deployment
+from smart_contracts.marketplace.contract import FLAG_STATUS_MASK, STATUS_ACTIVE, STATUS_SOLD
+
+DAY = 24 * 60 * 60
+SECONDS_PER_YEAR = 31_536_000
+BASE_2000_UNIX = 946_684_800
+
+# Minimum balance, in microAlgo
+ACCOUNT_MIN_BALANCE = 100_000
+ASSET_MIN_BALANCE = 100_000      # per ASA created or held
+BOX_FLAT_MIN_BALANCE = 2_500
+BOX_BYTE_MIN_BALANCE = 400       # per byte of key + value
+
+SWEEP_BATCH = 8
+# Random picks tried before an operation gives up, instead of scanning every credit.
+PICK_ATTEMPTS = 8
+
+# Relative frequency of each operation; ineligible picks fall back to "mint".
+WEIGHTS = {
+    "mint": 30,
+    "list": 25,
+    "buy": 20,
+    "retire": 12,
+    "cancel": 3,
+    "sweep": 5,
+    "advance_clock": 5,
+}
+
+
+class InvariantError(AssertionError):
+    pass
+
+
+@dataclasses.dataclass
+class Credit:
+    asset_id: int
+    tonnes: int
+    expiry: int
+    issuer: Account
+
+
+@dataclasses.dataclass
+class Checkpoint:
+    ops: int
+    credits_minted: int
+    elapsed_s: float
+    ops_per_s: float
+    boxes: dict[str, int]
+    box_bytes: dict[str, int]
+    min_balance: dict[str, int]
+    active_listings: int
+    total_trades: int
+    total_retirements: int
+
+
+class ListingPool:
+    """Listed credits by asset ID, with O(1) insert, remove and random pick."""
+
+    def __init__(self) -> None:
+        self._credits: list[Credit] = []
+        self._index: dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._credits)
+
+    def __iter__(self) -> Iterator[Credit]:
+        return iter(self._credits)
+
+    def add(self, credit: Credit) -> None:
+        self._index[credit.asset_id] = len(self._credits)
+        self._credits.append(credit)
+
+    def pop(self, asset_id: int) -> Credit:
+        index = self._index.pop(asset_id)
+        last = self._credits.pop()
+        if last.asset_id == asset_id:
+            return last
+        credit, self._credits[index] = self._credits[index], last
+        self._index[last.asset_id] = index
+        return credit
+
+    def as_list(self) -> list[Credit]:
+        return self._credits
+
+
+class StorageCensus(BoxTracer):
+    """Tracks every live box per app for the whole simulation."""
+
+    def __init__(self, ledger: Any) -> None:
+        super().__init__(ledger)
+        self.boxes: dict[int, dict[bytes, int]] = defaultdict(dict)
+
+    def on_write(self, app: Any, key: Any, value: bytes, created: bool) -> None:
+        self.boxes[_app_id(app)][_raw(key)] = len(value)
+
+    def on_delete(self, app: Any, key: Any, existed: bool) -> None:
+        self.boxes[_app_id(app)].pop(_raw(key), None)
+
+    def keys(self, app_id: int) -> list[bytes]:
+        return list(self.boxes[app_id])
+
+    def count(self, app_id: int) -> int:
+        return len(self.boxes[app_id])
+
+    def size(self, app_id: int) -> int:
+        return sum(len(key) + value for key, value in self.boxes[app_id].items())
+
+    def min_balance(self, app_id: int) -> int:
+        return self.count(app_id) * BOX_FLAT_MIN_BALANCE + self.size(app_id) * BOX_BYTE_MIN_BALANCE
+
+
+def _raw(value: Any) -> bytes:
+    return bytes(getattr(value, "value", value))
+
+
+def _app_id(app: Any) -> int:
+    app_id = getattr(app, "id", app)
+    return int(getattr(app_id, "value", app_id))
+
+
+class Simulation:
+    def __init__(self, env: Deployment, seed: int, issuers: int, businesses: int) -> None:
+        self.env = env
+        self.rng = random.Random(seed)
+        self.now = NOW
+        self.issuers = [env.issuer] + [self._new_issuer(i) for i in range(1, issuers)]
+        self.businesses = [env.business] + [self._new_business(i) for i in range(1, businesses)]
+
+        # Model of the expected contract state
+        self.unlisted: list[Credit] = []
+        self.listed = ListingPool()
+        self.owned: list[tuple[Credit, Account]] = []
+        self.minted = 0
+        self.sold = 0
+        self.volume = 0
+        self.fees = 0
+        self.retired = 0
+        self.retired_tonnes = 0
+        self.company_tonnes: Counter[bytes] = Counter()
+
+        self.op_counts: Counter[str] = Counter()
+        self.op_costs: dict[str, Metrics] = defaultdict(Metrics)
+
+    # ── actors ─────────────────────────────────────────────────
+
+    def _new_issuer(self, index: int) -> Account:
+        env = self.env
+        issuer = env.ctx.any.account(opted_apps=[env.issuance_app])
+        with env.call(issuer):
+            env.issuance.register_issuer(arc4.String(f"NGO {index}"), arc4.String("IN"), arc4.String("VCS"))
+        with env.call(env.admin):
+            env.issuance.verify_issuer(arc4.Address(issuer))
+        return issuer
+
+    def _new_business(self, index: int) -> Account:
+        env = self.env
+        business = env.ctx.any.account(opted_apps=[env.marketplace_app])
+        with env.call(business):
+            env.marketplace.register_business(arc4.String(f"Company {index}"), arc4.String("DE"))
+        with env.call(env.admin):
+            env.marketplace.verify_business(arc4.Address(business))
+        return business
+
+    # ── operations ─────────────────────────────────────────────
+
+    def step(self) -> None:
+        op_name = self.rng.choices(list(WEIGHTS), weights=list(WEIGHTS.values()))[0]
+        if not getattr(self, f"_{op_name}")():
+            self._mint()
+            op_name = "mint"
+        self.op_counts[op_name] += 1
+
+    def _record(self, op_name: str, metrics: Metrics) -> None:
+        total = self.op_costs[op_name]
+        for field, value in metrics.as_dict().items():
+            setattr(total, field, getattr(total, field) + value)
+
+    def _mint(self) -> bool:
+        env = self.env
+        issuer = self.rng.choice(self.issuers)
+        vintage = self.rng.randint(2016, 2025)
+        years_valid = self.rng.randint(1, 10)
+        tonnes = self.rng.randint(1, 500)
+        with env.measure(issuer) as m:
+            m.result = env.issuance.mint_carbon_credit(
+                env.project_id(),
+                arc4.String("Simulated Project"),
+                arc4.String("Earth"),
+                arc4.UInt64(tonnes),
+                arc4.UInt64(vintage),
+                arc4.String("REDD+"),
+                arc4.String("bafysim"),
+                arc4.UInt64(years_valid),
+            )
+        self._record("mint", m.metrics)
+        expiry = BASE_2000_UNIX + (vintage - 2000 + years_valid) * SECONDS_PER_YEAR
+        self.unlisted.append(Credit(m.result.native.value, tonnes, expiry, issuer))
+        self.minted += 1
+        return True
+
+    def _pick_unexpired(self, credits: list[Credit]) -> int | None:
+        """Index of a random credit that has not expired, or None."""
+        for _ in range(PICK_ATTEMPTS if credits else 0):
+            index = self.rng.randrange(len(credits))
+            if credits[index].expiry > self.now:
+                return index
+        return None
+
+    def _list(self) -> bool:
+        index = self._pick_unexpired(self.unlisted)
+        if index is None:
+            return False
+        env = self.env
+        # Swap-remove keeps picking O(1); order in the pool is irrelevant.
+        self.unlisted[index], self.unlisted[-1] = self.unlisted[-1], self.unlisted[index]
+        credit = self.unlisted.pop()
+        transfer = env.ctx.any.txn.asset_transfer(
+            sender=credit.issuer,
+            asset_receiver=env.marketplace_app.address,
+            xfer_asset=Asset(credit.asset_id),
+            asset_amount=UInt64(1),
+        )
+        with env.measure(credit.issuer, transfer) as m:
+            env.marketplace.list_credit(
+                arc4.UInt64(credit.asset_id),
+                arc4.UInt64(self._price(credit)),
+                arc4.String("REDD+"),
+                arc4.String("VCS"),
+                arc4.UInt64(1),
+                arc4.String("bafysim"),
+            )
+        self._record("list", m.metrics)
+        self.listed.add(credit)
+        return True
+
+    def _buy(self) -> bool:
+        index = self._pick_unexpired(self.listed.as_list())
+        if index is None:
+            return False
+        env = self.env
+        credit = self.listed.pop(self.listed.as_list()[index].asset_id)
+        business = self.rng.choice(self.businesses)
+        price = self._price(credit)
+        with env.measure(business, env.payment(business, price)) as m:
+            env.marketplace.buy_credit(arc4.UInt64(credit.asset_id), arc4.UInt64(1))
+        self._record("buy", m.metrics)
+        self.owned.append((credit, business))
+        self.sold += 1
+        self.volume += price
+        self.fees += price * FEE_BPS // 10_000
+        return True
+
+    def _retire(self) -> bool:
+        if not self.owned:
+            return False
+        env = self.env
+        credit, business = self.owned.pop(self.rng.randrange(len(self.owned)))
+        with env.measure(business) as m:
+            m.result = env.retirement.retire_credit(
+                arc4.UInt64(credit.asset_id),
+                arc4.String("Simulated Co"),
+                arc4.UInt64(credit.tonnes),
+                arc4.String("bafycert"),
+            )
+        self._record("retire", m.metrics)
+        self.retired += 1
+        self.retired_tonnes += credit.tonnes
+        self.company_tonnes[business.bytes.value] += credit.tonnes
+        return True
+
+    def _cancel(self) -> bool:
+        if not self.listed:
+            return False
+        env = self.env
+        credit = self.listed.pop(self.rng.choice(self.listed.as_list()).asset_id)
+        asset_id = credit.asset_id
+        with env.measure(credit.issuer) as m:
+            env.marketplace.cancel_listing(arc4.UInt64(asset_id))
+        self._record("cancel", m.metrics)
+        self.unlisted.append(credit)
+        return True
+
+    def _sweep(self) -> bool:
+        expired = (credit.asset_id for credit in self.listed if credit.expiry <= self.now)
+        batch = list(itertools.islice(expired, SWEEP_BATCH))
+        if not batch:
+            return False
+        env = self.env
+        with env.measure(self.rng.choice(self.businesses)) as m:
+            m.result = env.marketplace.sweep_expired(
+                arc4.DynamicArray[arc4.UInt64](*[arc4.UInt64(asset_id) for asset_id in batch])
+            )
+        self._record("sweep", m.metrics)
+        for asset_id in batch:
+            self.unlisted.append(self.listed.pop(asset_id))
+        return True
+
+    def _advance_clock(self) -> bool:
+        self.now += self.rng.randint(1, 30) * DAY
+        self.env.ctx.ledger.patch_global_fields(latest_timestamp=self.now)
+        return True
+
+    def _price(self, credit: Credit) -> int:
+        # Deterministic per credit, so buy() can recompute what list() asked.
+        return 1_000_000 + (credit.asset_id % 97) * 10_000
+
+    # ── invariants ─────────────────────────────────────────────
+
+    def check(self, census: StorageCensus) -> None:
+        env = self.env
+        issuance, marketplace, retirement = env.issuance, env.marketplace, env.retirement
+
+        listing_statuses = Counter(
+            env.ctx.ledger.get_box(env.marketplace_app, key)[1] & FLAG_STATUS_MASK
+            for key in census.keys(_app_id(env.marketplace_app))
+            if len(key) == 8
+        )
+        expectations = {
+            "total_credits_issued": (issuance.total_credits_issued.value, self.minted),
+            "total_trades": (marketplace.total_trades.value, self.sold),
+            "sold listing boxes": (listing_statuses[STATUS_SOLD], self.sold),
+            "active listing boxes": (listing_statuses[STATUS_ACTIVE], len(self.listed)),
+            "total_volume_microalgo": (marketplace.total_volume_microalgo.value, self.volume),
+            "accrued_fees": (marketplace.accrued_fees.value, self.fees),
+            "total_retirements": (retirement.total_retirements.value, self.retired),
+            "total_tonnes_retired": (retirement.total_tonnes_retired.value, self.retired_tonnes),
+        }
+        for company, tonnes in self.company_tonnes.items():
+            totals = env.ctx.ledger.get_box(env.retirement_app, b"c" + company)
+            expectations[f"company {company.hex()[:8]} tonnes"] = (int.from_bytes(totals[:8], "big"), tonnes)
+
+        failures = [
+            f"{name}: contract {actual}, expected {expected}"
+            for name, (actual, expected) in expectations.items()
+            if actual != expected
+        ]
+        if failures:
+            raise InvariantError("\n".join(failures))
+
+    def checkpoint(self, census: StorageCensus, ops: int, elapsed: float) -> Checkpoint:
+        env = self.env
+        apps = {
+            "issuance": env.issuance_app,
+            "marketplace": env.marketplace_app,
+            "retirement": env.retirement_app,
+        }
+        min_balance = {
+            name: ACCOUNT_MIN_BALANCE + census.min_balance(_app_id(app)) for name, app in apps.items()
+        }
+        # The registry creates (and so holds) every ASA; the marketplace holds the listed ones.
+        min_balance["issuance"] += (self.minted - self.retired) * ASSET_MIN_BALANCE
+        min_balance["marketplace"] += len(self.listed) * ASSET_MIN_BALANCE
+        return Checkpoint(
+            ops=ops,
+            credits_minted=self.minted,
+            elapsed_s=round(elapsed, 3),
+            ops_per_s=round(ops / elapsed, 1) if elapsed else 0.0,
+            boxes={name: census.count(_app_id(app)) for name, app in apps.items()},
+            box_bytes={name: census.size(_app_id(app)) for name, app in apps.items()},
+            min_balance=min_balance,
+            active_listings=len(self.listed),
+            total_trades=self.sold,
+            total_retirements=self.retired,
+        )
+
+    def average_costs(self) -> dict[str, dict[str, float]]:
+        return {
+            op_name: {
+                field: round(value / self.op_counts[op_name], 2)
+                for field, value in totals.as_dict().items()
+            }
+            for op_name, totals in sorted(self.op_costs.items())
+        }
+
+
+def run(
+    credits: int,
+    seed: int = 0,
+    checkpoints: int = 10,
+    issuers: int = 20,
+    businesses: int = 50,
+) -> dict[str, Any]:
+    """Simulates until `credits` credits are minted. Raises InvariantError on the first mismatch."""
+    with algopy_testing_context() as ctx:
+        env = Deployment(ctx)
+        with env.registry_calls(), StorageCensus(ctx.ledger) as census:
+            sim = Simulation(env, seed, issuers, businesses)
+            interval = max(1, credits // checkpoints)
+            next_checkpoint = interval
+            curve: list[Checkpoint] = []
+            ops = 0
+            started = time.perf_counter()
+
+            while sim.minted < credits:
+                sim.step()
+                ops += 1
+                if sim.minted >= next_checkpoint or sim.minted >= credits:
+                    sim.check(census)
+                    curve.append(sim.checkpoint(census, ops, time.perf_counter() - started))
+                    next_checkpoint += interval
+
+        return {
+            "seed": seed,
+            "credits": credits,
+            "operations": dict(sorted(sim.op_counts.items())),
+            "average_cost": sim.average_costs(),
+            "checkpoints": [dataclasses.asdict(point) for point in curve],
+        }
+
+
+def _print_report(report: dict[str, Any]) -> None:
+    print(f"seed={report['seed']} credits={report['credits']} operations={report['operations']}")
+    print()
+    print(f"{'credits':>9} {'ops':>9} {'ops/s':>8} {'boxes i/m/r':>21} {'box bytes i/m/r':>27} {'MBR ALGO i/m/r':>24}")
+    for point in report["checkpoints"]:
+        boxes = "/".join(str(v) for v in point["boxes"].values())
+        sizes = "/".join(str(v) for v in point["box_bytes"].values())
+        mbr = "/".join(f"{v / 1_000_000:.1f}" for v in point["min_balance"].values())
+        print(
+            f"{point['credits_minted']:>9} {point['ops']:>9} {point['ops_per_s']:>8} "
+            f"{boxes:>21} {sizes:>27} {mbr:>24}"
+        )
+    print()
+    for op_name, cost in report["average_cost"].items():
+        print(f"{op_name:>8}  " + " ".join(f"{field}={value}" for field, value in cost.items() if value))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.simulate")
+    parser.add_argument("--credits", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--checkpoints", type=int, default=10)
+    parser.add_argument("--issuers", type=int, default=20)
+    parser.add_argument("--businesses", type=int, default=50)
+    parser.add_argument("--json", type=Path, help="also write the report as JSON")
+    args = parser.parse_args()
+
+    try:
+        report = run(args.credits, args.seed, args.checkpoints, args.issuers, args.businesses)
+    except InvariantError as error:
+        print(f"INVARIANT VIOLATED\n{error}", file=sys.stderr)
+        return 1
+
+    _print_report(report)
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""
+CLI startup time of `python -m smart_contracts`.
+
+Measured as the median wall time of importing the entry point in a fresh
+interpreter, minus the median time of a bare interpreter start, so the number
+reflects what the module itself loads at import.
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _median_run(code: str, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def startup_ms(runs: int = 5) -> float:
+    """Milliseconds `import smart_contracts.__main__` adds to interpreter start-up."""
+    baseline = _median_run("pass", runs)
+    entry_point = _median_run("import smart_contracts.__main__", runs)
+    return max(0.0, (entry_point - baseline) * 1000)
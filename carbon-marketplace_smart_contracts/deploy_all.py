@@ -1,8 +1,14 @@
 import os
 import json
+import argparse
+import time
 import base64
+import dataclasses
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from dotenv import load_dotenv
-from algosdk import mnemonic, account, transaction, abi
+from algosdk import mnemonic, account, transaction, abi, logic
 from algosdk.v2client import algod
 from algosdk.atomic_transaction_composer import (
     AtomicTransactionComposer,
@@ -10,149 +16,385 @@ from algosdk.atomic_transaction_composer import (
     TransactionWithSigner,
 )
 
-load_dotenv()
+from smart_contracts._helpers import bytecode
+from smart_contracts._helpers.manifest import (
+    CREATE,
+    SKIP,
+    UPDATE,
+    AppRecord,
+    Manifest,
+    ReplacementRequired,
+    Schema,
+    plan_action,
+    program_hash,
+    top_up_amount,
+)
 
-# ── Connect to Testnet ─────────────────────────────────────────
+# ── Testnet ────────────────────────────────────────────────────
 ALGOD_ADDRESS = "https://testnet-api.algonode.cloud"
 ALGOD_TOKEN   = ""
-client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
 
-# ── Load wallet ────────────────────────────────────────────────
-raw_mnemonic = os.environ["DEPLOYER_MNEMONIC"]
-private_key  = mnemonic.to_private_key(raw_mnemonic)
-address      = account.address_from_private_key(private_key)
-signer       = AccountTransactionSigner(private_key)
+# App IDs, program hashes, schemas and funding of the deployed apps
+MANIFEST_PATH = Path("deployment.json")
+EXTRA_PAGES   = 1
+
+
+# ── Contracts ──────────────────────────────────────────────────
+@dataclasses.dataclass(frozen=True)
+class ContractSpec:
+    name:          str
+    folder:        str
+    global_schema: transaction.StateSchema
+    local_schema:  transaction.StateSchema
+    method_name:   str
+    # Create args, given the app IDs deployed so far
+    method_args:   Callable[[dict[str, int]], list] = lambda app_ids: []
+    depends_on:    tuple[str, ...] = ()
+    # Spendable balance (above MBR) kept for inner transaction fees, in microAlgo
+    min_spending:  int = 1_000_000
+
+    def path(self, suffix):
+        return f"smart_contracts/{self.folder}/{self.name}.{suffix}"
+
+    def schema(self):
+        return Schema(
+            global_uints = self.global_schema.num_uints,
+            global_bytes = self.global_schema.num_byte_slices,
+            local_uints  = self.local_schema.num_uints,
+            local_bytes  = self.local_schema.num_byte_slices,
+            extra_pages  = EXTRA_PAGES,
+        )
+
 
-print(f"Deployer : {address}")
-info    = client.account_info(address)
-balance = info["amount"] / 1_000_000
-print(f"Balance  : {balance:.4f} ALGO")
-print()
+CONTRACTS = [
+    ContractSpec(
+        name          = "CreditIssuanceRegistry",
+        folder        = "credit_issuance",
+        global_schema = transaction.StateSchema(num_uints=2, num_byte_slices=1),
+        local_schema  = transaction.StateSchema(num_uints=2, num_byte_slices=2),
+        method_name   = "create_registry",
+    ),
+    ContractSpec(
+        name          = "CarbonMarketplace",
+        folder        = "marketplace",
+        global_schema = transaction.StateSchema(num_uints=8, num_byte_slices=1),
+        local_schema  = transaction.StateSchema(num_uints=0, num_byte_slices=0),
+        method_name   = "create_marketplace",
+        # 250 bps = 2.5% fee; listings read credit terms from the issuance registry
+        method_args   = lambda app_ids: [250, app_ids["CreditIssuanceRegistry"]],
+        depends_on    = ("CreditIssuanceRegistry",),
+        min_spending  = 2_000_000,   # marketplace needs more for swaps
+    ),
+    ContractSpec(
+        name          = "RetirementRegistry",
+        folder        = "retirement",
+        global_schema = transaction.StateSchema(num_uints=3, num_byte_slices=1),
+        local_schema  = transaction.StateSchema(num_uints=0, num_byte_slices=0),
+        method_name   = "create_registry",
+    ),
+]
 
-if balance < 1:
-    print("Not enough ALGO! Go to https://bank.testnet.algorand.network/")
-    exit()
+
+@dataclasses.dataclass
+class Timings:
+    compile_wall:       float = 0.0
+    compile_sequential: float = 0.0   # sum of individual compile calls
+    cache_hits:         int   = 0
+    stages:             list = dataclasses.field(default_factory=list)
+    transactions:       int   = 0
+    total:              float = 0.0
 
 
 # ── Helper: compile TEAL ───────────────────────────────────────
-def compile_teal(path):
-    with open(path) as f:
-        result = client.compile(f.read())
-    return base64.b64decode(result["result"])
+def compile_teal(client, path):
+    """Bytecode from the local cache; algod compiles (once) only on a miss."""
+    def compile_remote(source):
+        return base64.b64decode(client.compile(source)["result"])
+
+    return bytecode.load_program(Path(path), compile_remote)
+
+
+def _timed_compile(client, path):
+    started = time.perf_counter()
+    program, hit = compile_teal(client, path)
+    return program, hit, time.perf_counter() - started
+
+
+def compile_all(client, specs, timings):
+    """Loads every approval and clear program, compiling cache misses concurrently."""
+    paths = [spec.path(kind) for spec in specs for kind in ("approval.teal", "clear.teal")]
 
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(paths)) as pool:
+        results = dict(zip(paths, pool.map(lambda path: _timed_compile(client, path), paths)))
+    timings.compile_wall       = time.perf_counter() - started
+    timings.compile_sequential = sum(seconds for _, _, seconds in results.values())
+    timings.cache_hits         = sum(hit for _, hit, _ in results.values())
 
-# ── Helper: deploy one contract via ABI ───────────────────────
-def deploy(name, approval_path, clear_path, arc56_path, global_schema, local_schema, method_name, method_args):
-    print(f"Deploying {name}...")
+    return {
+        spec.name: (results[spec.path("approval.teal")][0], results[spec.path("clear.teal")][0])
+        for spec in specs
+    }
 
-    approval = compile_teal(approval_path)
-    clear    = compile_teal(clear_path)
 
+# ── Helper: order contracts into stages ────────────────────────
+def plan_stages(specs, deployed=()):
+    """
+    Groups contracts into stages that can be created in one atomic group.
+    A contract whose create args need another app's ID goes in a later stage.
+    deployed: apps already in the manifest, which satisfy dependencies on
+    contracts that are not being deployed themselves.
+    """
+    stages = []
+    done   = set(deployed) - {spec.name for spec in specs}
+    pending = list(specs)
+    while pending:
+        stage = [spec for spec in pending if set(spec.depends_on) <= done]
+        if not stage:
+            raise ValueError(f"Unresolvable dependencies: {[spec.name for spec in pending]}")
+        stages.append(stage)
+        done.update(spec.name for spec in stage)
+        pending = [spec for spec in pending if spec.name not in done]
+    return stages
+
+
+def load_method(spec):
     # Load ABI from arc56 json
-    with open(arc56_path) as f:
+    with open(spec.path("arc56.json")) as f:
         arc56 = json.load(f)
 
     # Build ABI contract object
     abi_contract = abi.Contract.from_json(json.dumps({
-        "name": arc56.get("name", name),
+        "name": arc56.get("name", spec.name),
         "methods": arc56.get("methods", []),
     }))
+    return abi_contract.get_method_by_name(spec.method_name)
 
-    # Get the create method
-    method = abi_contract.get_method_by_name(method_name)
-
-    sp = client.suggested_params()
-
-    # Create the app transaction
-    create_txn = transaction.ApplicationCreateTxn(
-        sender            = address,
-        sp                = sp,
-        on_complete       = transaction.OnComplete.NoOpOC,
-        approval_program  = approval,
-        clear_program     = clear,
-        global_schema     = global_schema,
-        local_schema      = local_schema,
-        extra_pages       = 1,
-    )
 
-    # Use AtomicTransactionComposer for ABI method call
+# ── Helper: create or update one stage of apps in a single group ──
+def deploy_stage(client, address, signer, sp, actions, programs, manifest, app_ids):
+    """
+    actions: [(spec, CREATE | UPDATE)] — skipped contracts are not passed in.
+    Records the outcome of every action in the manifest.
+    """
     atc = AtomicTransactionComposer()
-    atc.add_method_call(
-        app_id          = 0,
-        method          = method,
-        sender          = address,
-        sp              = sp,
-        signer          = signer,
-        method_args     = method_args,
-        on_complete     = transaction.OnComplete.NoOpOC,
-        approval_program = approval,
-        clear_program   = clear,
-        global_schema   = global_schema,
-        local_schema    = local_schema,
-        extra_pages     = 1,
+    for spec, action in actions:
+        approval, clear = programs[spec.name]
+        if action == CREATE:
+            atc.add_method_call(
+                app_id           = 0,
+                method           = load_method(spec),
+                sender           = address,
+                sp               = sp,
+                signer           = signer,
+                method_args      = spec.method_args(app_ids),
+                on_complete      = transaction.OnComplete.NoOpOC,
+                approval_program = approval,
+                clear_program    = clear,
+                global_schema    = spec.global_schema,
+                local_schema     = spec.local_schema,
+                extra_pages      = EXTRA_PAGES,
+            )
+        else:
+            # Bare UpdateApplication call, admin only
+            atc.add_transaction(TransactionWithSigner(
+                transaction.ApplicationUpdateTxn(
+                    sender           = address,
+                    sp               = sp,
+                    index            = manifest.apps[spec.name].app_id,
+                    approval_program = approval,
+                    clear_program    = clear,
+                ),
+                signer,
+            ))
+
+    # One submission and one confirmation wait for the whole stage
+    result = atc.execute(client, 4)
+
+    for (spec, action), tx_id in zip(actions, result.tx_ids):
+        approval, clear = programs[spec.name]
+        previous = manifest.apps.get(spec.name)
+        if action == CREATE:
+            app_id = client.pending_transaction_info(tx_id)["application-index"]
+            manifest.apps[spec.name] = AppRecord(
+                app_id        = app_id,
+                app_address   = logic.get_application_address(app_id),
+                approval_hash = program_hash(approval),
+                clear_hash    = program_hash(clear),
+                schema        = spec.schema(),
+                create_args   = spec.method_args(app_ids),
+            )
+        else:
+            app_id = previous.app_id
+            previous.approval_hash = program_hash(approval)
+            previous.clear_hash    = program_hash(clear)
+
+        print(f"✅  {spec.name} ({'created' if action == CREATE else 'updated'})")
+        print(f"    App ID   : {app_id}")
+        if action == CREATE and previous is not None:
+            print(f"    Replaces : {previous.app_id} (schema or create args changed)")
+        print(f"    Tx ID    : {tx_id}")
+        print(f"    Explorer : https://testnet.explorer.perawallet.app/application/{app_id}/")
+        print()
+    return len(result.tx_ids)
+
+
+# ── Helper: top up app accounts below their required balance ──
+def fund_apps(client, address, signer, sp, specs, manifest):
+    atc = AtomicTransactionComposer()
+    for spec in specs:
+        record = manifest.apps[spec.name]
+        info   = client.account_info(record.app_address)
+        amount = top_up_amount(info["amount"], info["min-balance"], spec.min_spending)
+        if amount:
+            atc.add_transaction(TransactionWithSigner(
+                transaction.PaymentTxn(address, sp, record.app_address, amount),
+                signer,
+            ))
+            record.funded_microalgo = info["amount"] + amount
+            print(f"💰  Funding {spec.name} with {amount / 1_000_000:.4f} ALGO")
+
+    if atc.get_tx_count() == 0:
+        return 0
+    atc.execute(client, 4)
+    return atc.get_tx_count()
+
+
+def deploy_all(client, address, signer, specs=CONTRACTS, manifest_path=MANIFEST_PATH, replace=False):
+    """
+    Brings the apps in the manifest up to date with the local programs.
+    Programs are loaded concurrently and suggested params fetched once; each
+    stage's creates and updates go out as one atomic group, and unchanged
+    apps cost no transaction at all.
+
+    An app whose schema or create args changed is only replaced by a new app
+    when replace is True; otherwise ReplacementRequired is raised before any
+    transaction is sent.
+
+    Returns: (Manifest, Timings)
+    """
+    timings = Timings()
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        params   = pool.submit(client.suggested_params)
+        programs = compile_all(client, specs, timings)
+        sp       = params.result()
+
+    manifest = Manifest.load(manifest_path, sp.gen)
+    app_ids  = {name: record.app_id for name, record in manifest.apps.items()}
+    if not replace:
+        # Fail before the first stage goes out, not halfway through the deploy
+        for spec in specs:
+            if spec.name in manifest.apps:
+                _plan(spec, manifest, programs, app_ids, replace)
+    for stage in plan_stages(specs, deployed=manifest.apps):
+        actions = []
+        for spec in stage:
+            action = _plan(spec, manifest, programs, app_ids, replace)
+            if action == SKIP:
+                print(f"⏭️   {spec.name} unchanged (App ID {app_ids[spec.name]})")
+            else:
+                actions.append((spec, action))
+        if not actions:
+            continue
+
+        print(f"Deploying {', '.join(spec.name for spec, _ in actions)}...")
+        stage_started = time.perf_counter()
+        timings.transactions += deploy_stage(client, address, signer, sp, actions, programs, manifest, app_ids)
+        app_ids.update({spec.name: manifest.apps[spec.name].app_id for spec, _ in actions})
+        timings.stages.append(time.perf_counter() - stage_started)
+        # Persist after every stage so a failure later on doesn't orphan new apps
+        manifest.save(manifest_path)
+
+    timings.transactions += fund_apps(client, address, signer, sp, specs, manifest)
+    manifest.save(manifest_path)
+
+    timings.total = time.perf_counter() - started
+    return manifest, timings
+
+
+def deploy_contract(client, address, signer, name, manifest_path=MANIFEST_PATH, replace=False):
+    """
+    deploy_all() for a single contract, as `python -m smart_contracts deploy`
+    runs it. Create args that need other apps read their IDs from the
+    manifest, so those apps must have been deployed first. A schema or
+    create-args change raises ReplacementRequired unless replace is True.
+
+    Returns: the contract's AppRecord
+    """
+    spec = next(spec for spec in CONTRACTS if spec.name == name)
+    manifest, _ = deploy_all(client, address, signer, [spec], manifest_path, replace)
+    return manifest.apps[name]
+
+
+def _plan(spec, manifest, programs, app_ids, replace):
+    try:
+        return plan_action(
+            manifest.apps.get(spec.name),
+            *programs[spec.name],
+            spec.schema(),
+            spec.method_args(app_ids),
+            replace = replace,
+        )
+    except ReplacementRequired as err:
+        raise ReplacementRequired(f"{spec.name}: {err}") from None
+
+
+def report(specs, timings):
+    """Wall-clock summary, compared with deploying one contract at a time."""
+    print(f"Compile  : {timings.compile_wall:.2f}s for {2 * len(specs)} programs "
+          f"({timings.cache_hits} from bytecode cache, {timings.compile_sequential:.2f}s back to back)")
+    print(f"Sent     : {timings.transactions} transactions")
+    if not timings.stages:
+        print(f"Total    : {timings.total:.2f}s (nothing to create or update)")
+        return
+
+    per_stage = sum(timings.stages) / len(timings.stages)
+    # One contract at a time: compiles back to back, one group per contract
+    sequential = timings.compile_sequential + per_stage * len(specs)
+    print(f"Deploy   : {sum(timings.stages):.2f}s in {len(timings.stages)} groups")
+    print(f"Total    : {timings.total:.2f}s (≈{sequential:.2f}s one contract at a time, "
+          f"saved ≈{max(0.0, sequential - timings.total):.2f}s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deploy or update the carbon marketplace apps.")
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="create new apps for contracts whose schema or create args changed "
+             "(the old apps, their state and boxes are left behind)",
     )
+    args = parser.parse_args()
 
-    result  = atc.execute(client, 4)
-    tx_id   = result.tx_ids[0]
+    load_dotenv()
+    client = algod.AlgodClient(ALGOD_TOKEN, ALGOD_ADDRESS)
 
-    confirmed = transaction.wait_for_confirmation(client, tx_id, 4)
-    app_id    = confirmed["application-index"]
+    # ── Load wallet ────────────────────────────────────────────
+    raw_mnemonic = os.environ["DEPLOYER_MNEMONIC"]
+    private_key  = mnemonic.to_private_key(raw_mnemonic)
+    address      = account.address_from_private_key(private_key)
+    signer       = AccountTransactionSigner(private_key)
 
-    print(f"✅  {name}")
-    print(f"    App ID   : {app_id}")
-    print(f"    Tx ID    : {tx_id}")
-    print(f"    Explorer : https://testnet.explorer.perawallet.app/application/{app_id}/")
+    print(f"Deployer : {address}")
+    info    = client.account_info(address)
+    balance = info["amount"] / 1_000_000
+    print(f"Balance  : {balance:.4f} ALGO")
     print()
-    return app_id
-
-
-# ── Deploy Contract 1: CreditIssuanceRegistry ─────────────────
-id1 = deploy(
-    name          = "CreditIssuanceRegistry",
-    approval_path = "smart_contracts/credit_issuance/CreditIssuanceRegistry.approval.teal",
-    clear_path    = "smart_contracts/credit_issuance/CreditIssuanceRegistry.clear.teal",
-    arc56_path    = "smart_contracts/credit_issuance/CreditIssuanceRegistry.arc56.json",
-    global_schema = transaction.StateSchema(num_uints=2, num_byte_slices=1),
-    local_schema  = transaction.StateSchema(num_uints=2, num_byte_slices=2),
-    method_name   = "create_registry",
-    method_args   = [],
-)
 
-# ── Deploy Contract 2: CarbonMarketplace ──────────────────────
-id2 = deploy(
-    name          = "CarbonMarketplace",
-    approval_path = "smart_contracts/marketplace/CarbonMarketplace.approval.teal",
-    clear_path    = "smart_contracts/marketplace/CarbonMarketplace.clear.teal",
-    arc56_path    = "smart_contracts/marketplace/CarbonMarketplace.arc56.json",
-    global_schema = transaction.StateSchema(num_uints=4, num_byte_slices=1),
-    local_schema  = transaction.StateSchema(num_uints=0, num_byte_slices=0),
-    method_name   = "create_marketplace",
-    method_args   = [250],   # 250 bps = 2.5% fee
-)
+    if balance < 1:
+        print("Not enough ALGO! Go to https://bank.testnet.algorand.network/")
+        exit()
+
+    manifest, timings = deploy_all(client, address, signer, replace=args.replace)
+
+    print("=" * 50)
+    for spec in CONTRACTS:
+        print(f"{spec.name:<22} : {manifest.apps[spec.name].app_id}")
+    print(f"Manifest saved to {MANIFEST_PATH}")
+    report(CONTRACTS, timings)
 
-# ── Deploy Contract 3: RetirementRegistry ─────────────────────
-id3 = deploy(
-    name          = "RetirementRegistry",
-    approval_path = "smart_contracts/retirement/RetirementRegistry.approval.teal",
-    clear_path    = "smart_contracts/retirement/RetirementRegistry.clear.teal",
-    arc56_path    = "smart_contracts/retirement/RetirementRegistry.arc56.json",
-    global_schema = transaction.StateSchema(num_uints=3, num_byte_slices=1),
-    local_schema  = transaction.StateSchema(num_uints=0, num_byte_slices=0),
-    method_name   = "create_registry",
-    method_args   = [],
-)
 
-# ── Save App IDs ───────────────────────────────────────────────
-with open("app_ids.txt", "w") as f:
-    f.write(f"CreditIssuanceRegistry : {id1}\n")
-    f.write(f"CarbonMarketplace      : {id2}\n")
-    f.write(f"RetirementRegistry     : {id3}\n")
-    f.write(f"\nExplorer links:\n")
-    f.write(f"https://testnet.explorer.perawallet.app/application/{id1}/\n")
-    f.write(f"https://testnet.explorer.perawallet.app/application/{id2}/\n")
-    f.write(f"https://testnet.explorer.perawallet.app/application/{id3}/\n")
-
-print("=" * 50)
-print("All 3 contracts deployed!")
-print("App IDs saved to app_ids.txt")
-print("Submit these App IDs to RIFT!")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+"""
+Chain ingestion: materializes the three contracts' state into a local SQLite store.
+
+Transactions are consumed in round order from the indexer, or from recorded
+JSON-lines fixtures. App calls are decoded with each contract's arc56 spec and
+its ARC-28 events, and applied to listings, trades, issuers, credits and
+retirements tables. The store commits each round together with its checkpoint,
+so a restarted ingestor resumes after the last complete round, and queries
+read indexed tables instead of re-scanning the app history.
+"""
@@ -0,0 +1,79 @@
+"""
+python -m ingestion [--db ingestion.sqlite] [--manifest deployment.json]
+                    (--fixture FILE | --indexer URL [--record FILE] [--follow])
+
+Ingests the apps recorded in the deployment manifest into the SQLite store,
+resuming after its checkpoint. --fixture replays recorded transactions
+offline; --indexer catches up from the indexer (in --window round steps) and,
+with --follow, keeps polling for new rounds. --record also saves what was
+fetched as a fixture.
+"""
+
+import argparse
+import time
+from pathlib import Path
+
+from ingestion.decoder import Decoder
+from ingestion.service import Ingestor
+from ingestion.sources import IndexerSource, read_fixture, write_fixture
+from ingestion.store import Store
+from smart_contracts._helpers.manifest import app_ids
+
+
+def catch_up(ingestor: Ingestor, source: IndexerSource, window: int, recorded: list[dict] | None) -> int:
+    """Ingests up to the indexer's current round. Returns: rounds applied"""
+    applied = 0
+    tip = source.current_round()
+    while ingestor.store.checkpoint < tip:
+        after = ingestor.store.checkpoint
+        up_to = min(after + window, tip)
+        transactions = source.transactions(after, up_to)
+        if recorded is not None:
+            recorded.extend(transactions)
+        applied += ingestor.ingest(transactions, up_to=up_to)
+    return applied
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m ingestion")
+    parser.add_argument("--db", type=Path, default=Path("ingestion.sqlite"))
+    parser.add_argument("--manifest", type=Path, default=Path("deployment.json"))
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--fixture", type=Path, help="replay recorded transactions (JSON lines)")
+    source.add_argument("--indexer", help="indexer URL, e.g. https://testnet-idx.algonode.cloud")
+    parser.add_argument("--token", default="", help="indexer API token")
+    parser.add_argument("--window", type=int, default=10_000, help="rounds fetched per indexer query")
+    parser.add_argument("--record", type=Path, help="also save fetched transactions as a fixture")
+    parser.add_argument("--follow", action="store_true", help="keep polling for new rounds")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between polls with --follow")
+    args = parser.parse_args()
+
+    store = Store(args.db)
+    ingestor = Ingestor(store, Decoder(app_ids(args.manifest)))
+    started = time.perf_counter()
+
+    if args.fixture:
+        applied = ingestor.ingest(read_fixture(args.fixture))
+    else:
+        from algosdk.v2client.indexer import IndexerClient
+
+        source = IndexerSource(IndexerClient(args.token, args.indexer), ingestor.decoder.app_ids)
+        recorded: list[dict] | None = [] if args.record else None
+        applied = catch_up(ingestor, source, args.window, recorded)
+        try:
+            while args.follow:
+                time.sleep(args.interval)
+                applied += catch_up(ingestor, source, args.window, recorded)
+        except KeyboardInterrupt:
+            pass
+        if args.record:
+            write_fixture(args.record, recorded)
+
+    counts = ", ".join(f"{table}={count}" for table, count in store.counts().items())
+    print(f"Applied {applied} rounds in {time.perf_counter() - started:.2f}s; "
+          f"checkpoint {store.checkpoint}; {counts}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Decodes app call transactions (indexer JSON shape) into method calls and events.
+
+Method selectors and argument types come from each contract's arc56 spec, so
+the decoder follows the contracts as they are rebuilt; events are decoded by
+smart_contracts._helpers.events.
+"""
+
+import base64
+import dataclasses
+import json
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+from algosdk import abi
+
+from smart_contracts._helpers.events import Event, decode_events
+
+CONTRACTS_DIR = Path(__file__).parent.parent / "smart_contracts"
+
+# Contract name → folder holding its arc56 spec
+CONTRACT_FOLDERS = {
+    "CreditIssuanceRegistry": "credit_issuance",
+    "CarbonMarketplace":      "marketplace",
+    "RetirementRegistry":     "retirement",
+}
+
+# Reference arguments are encoded as an index into the transaction's foreign arrays
+_REFERENCE_TYPES = {"account", "asset", "application"}
+
+
+def spec_path(name: str) -> Path:
+    """The freshest arc56 spec for a contract: build artifacts first, then the committed copy."""
+    folder = CONTRACT_FOLDERS[name]
+    built = CONTRACTS_DIR / "artifacts" / folder / f"{name}.arc56.json"
+    return built if built.exists() else CONTRACTS_DIR / folder / f"{name}.arc56.json"
+
+
+@dataclasses.dataclass(frozen=True)
+class AppCall:
+    contract:   str
+    method:     str | None   # None for bare calls and unknown selectors
+    args:       dict
+    sender:     str
+    txn_id:     str
+    round:      int
+    round_time: int
+    events:     list[Event]
+    # Inner asset transfers sent by the app: (asset_id, receiver, amount)
+    asset_transfers: list[tuple[int, str, int]] = dataclasses.field(default_factory=list)
+
+
+class ContractDecoder:
+    """Method decoding for one contract, built from its arc56 spec."""
+
+    def __init__(self, name: str, spec: Mapping) -> None:
+        self.name = name
+        self._methods: dict[bytes, tuple[str, list[tuple[str, str]]]] = {}
+        for method in spec["methods"]:
+            signature = abi.Method.undictify(
+                {
+                    "name": method["name"],
+                    "args": [{"type": arg["type"], "name": arg.get("name")} for arg in method["args"]],
+                    "returns": {"type": method["returns"]["type"]},
+                }
+            )
+            self._methods[signature.get_selector()] = (
+                method["name"],
+                [(arg.get("name") or f"arg{i}", arg["type"]) for i, arg in enumerate(method["args"])],
+            )
+
+    @classmethod
+    def load(cls, name: str, path: Path | None = None) -> "ContractDecoder":
+        return cls(name, json.loads((path or spec_path(name)).read_text()))
+
+    def decode_args(self, app_args: list[bytes], txn: Mapping) -> tuple[str | None, dict]:
+        if not app_args or app_args[0] not in self._methods:
+            return None, {}
+        name, params = self._methods[app_args[0]]
+        values = {}
+        for (param, kind), raw in zip(params, app_args[1:]):
+            if kind in _REFERENCE_TYPES:
+                values[param] = _resolve_reference(kind, raw[0], txn)
+            else:
+                values[param] = abi.ABIType.from_string(kind).decode(raw)
+        return name, values
+
+
+def _resolve_reference(kind: str, index: int, txn: Mapping) -> object:
+    call = txn["application-transaction"]
+    if kind == "account":
+        return txn["sender"] if index == 0 else call["accounts"][index - 1]
+    if kind == "asset":
+        return call["foreign-assets"][index]
+    return call["application-id"] if index == 0 else call["foreign-apps"][index - 1]
+
+
+class Decoder:
+    """Routes app calls of the deployed apps (app ID → contract) to their decoders."""
+
+    def __init__(self, app_ids: Mapping[str, int], decoders: Mapping[str, ContractDecoder] | None = None) -> None:
+        decoders = decoders or {name: ContractDecoder.load(name) for name in app_ids}
+        self._by_app = {app_id: decoders[name] for name, app_id in app_ids.items()}
+
+    @property
+    def app_ids(self) -> list[int]:
+        return sorted(self._by_app)
+
+    def decode(self, txn: Mapping) -> Iterator[AppCall]:
+        """
+        App calls to the tracked apps in a transaction, inner calls included
+        (in execution order).
+        """
+        call = txn.get("application-transaction")
+        decoder = self._by_app.get(call["application-id"]) if call else None
+        if decoder is not None:
+            app_args = [base64.b64decode(arg) for arg in call.get("application-args", [])]
+            method, args = decoder.decode_args(app_args, txn)
+            yield AppCall(
+                contract   = decoder.name,
+                method     = method,
+                args       = args,
+                sender     = txn["sender"],
+                txn_id     = txn.get("id", ""),
+                round      = txn["confirmed-round"],
+                round_time = txn["round-time"],
+                events     = decode_events(base64.b64decode(log) for log in txn.get("logs", [])),
+                asset_transfers = [
+                    (
+                        inner["asset-transfer-transaction"]["asset-id"],
+                        inner["asset-transfer-transaction"]["receiver"],
+                        inner["asset-transfer-transaction"]["amount"],
+                    )
+                    for inner in txn.get("inner-txns", [])
+                    if inner.get("tx-type") == "axfer"
+                ],
+            )
+        for inner in txn.get("inner-txns", []):
+            # Inner transactions carry no ID or round of their own
+            yield from self.decode({
+                **inner,
+                "id":              txn.get("id", ""),
+                "confirmed-round": txn["confirmed-round"],
+                "round-time":      txn["round-time"],
+            })
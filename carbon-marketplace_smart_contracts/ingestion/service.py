@@ -0,0 +1,238 @@
+"""
+Applies decoded app calls to the store, one round at a time.
+
+State comes from the contracts' ARC-28 events wherever one exists. Calls that
+emit none (issuer registration and verification, sweeps) are applied from
+their decoded arguments and inner transactions.
+"""
+
+import itertools
+import sqlite3
+from collections.abc import Callable, Iterable, Mapping
+
+from ingestion.decoder import AppCall, Decoder
+from ingestion.store import Store
+
+REGISTRY    = "CreditIssuanceRegistry"
+MARKETPLACE = "CarbonMarketplace"
+
+MethodHandler = Callable[[sqlite3.Connection, AppCall], None]
+EventHandler  = Callable[[sqlite3.Connection, AppCall, dict], None]
+
+_METHOD_HANDLERS: dict[tuple[str, str], MethodHandler] = {}
+_EVENT_HANDLERS: dict[str, EventHandler] = {}
+
+
+def _method(contract: str, name: str) -> Callable[[MethodHandler], MethodHandler]:
+    def register(handler: MethodHandler) -> MethodHandler:
+        _METHOD_HANDLERS[(contract, name)] = handler
+        return handler
+
+    return register
+
+
+def _event(name: str) -> Callable[[EventHandler], EventHandler]:
+    def register(handler: EventHandler) -> EventHandler:
+        _EVENT_HANDLERS[name] = handler
+        return handler
+
+    return register
+
+
+def apply(db: sqlite3.Connection, call: AppCall) -> None:
+    handler = _METHOD_HANDLERS.get((call.contract, call.method or ""))
+    if handler is not None:
+        handler(db, call)
+    for event in call.events:
+        event_handler = _EVENT_HANDLERS.get(event.name)
+        if event_handler is not None:
+            event_handler(db, call, event.fields)
+
+
+# ── Issuance registry ─────────────────────────────────────────
+
+@_method(REGISTRY, "register_issuer")
+def _register_issuer(db: sqlite3.Connection, call: AppCall) -> None:
+    # Re-registering resets verification, as in the contract
+    db.execute(
+        "INSERT INTO issuers (address, name, country, verification_standard, verified) "
+        "VALUES (?, ?, ?, ?, 0) "
+        "ON CONFLICT (address) DO UPDATE SET name = excluded.name, country = excluded.country, "
+        "verification_standard = excluded.verification_standard, verified = 0",
+        (call.sender, call.args["name"], call.args["country"], call.args["verification_standard"]),
+    )
+
+
+@_method(REGISTRY, "verify_issuer")
+def _verify_issuer(db: sqlite3.Connection, call: AppCall) -> None:
+    db.execute("UPDATE issuers SET verified = 1 WHERE address = ?", (call.args["issuer"],))
+
+
+@_event("CreditMinted")
+def _credit_minted(db: sqlite3.Connection, call: AppCall, event: dict) -> None:
+    db.execute(
+        "INSERT OR REPLACE INTO credits "
+        "(asset_id, project_id, issuer, co2_tonnes, units, vintage_year, expiry, minted_round) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            event["asset_id"], event["project_id"], event["issuer"], event["co2_tonnes"],
+            event["units"], event["vintage_year"], event["expiry"], call.round,
+        ),
+    )
+    db.execute(
+        "INSERT INTO issuers (address, credits_issued) VALUES (?, 1) "
+        "ON CONFLICT (address) DO UPDATE SET credits_issued = credits_issued + 1",
+        (event["issuer"],),
+    )
+
+
+# ── Marketplace ───────────────────────────────────────────────
+
+@_event("CreditListed")
+def _credit_listed(db: sqlite3.Connection, call: AppCall, event: dict) -> None:
+    # A relisted credit reuses its box, and so its row.
+    # remaining counts escrowed units, like CreditSold.remaining: an NFT
+    # escrows one unit whatever its tonnes.
+    remaining = event["co2_tonnes"] if event["fungible"] else 1
+    db.execute(
+        "INSERT OR REPLACE INTO listings "
+        "(asset_id, seller, price, remaining, min_qty, vintage_year, expiry, fungible, status, "
+        " listed_round, updated_round) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, 'active', ?, ?)",
+        (
+            event["asset_id"], event["seller"], event["price"], remaining,
+            event["min_qty"], event["vintage_year"], event["expiry"], int(event["fungible"]),
+            call.round, call.round,
+        ),
+    )
+
+
+def _record_trade(
+    db: sqlite3.Connection,
+    call: AppCall,
+    asset_id: int,
+    seller: str,
+    buyer: str,
+    qty: int,
+    cost: int,
+    platform_fee: int | None,
+    remaining: int,
+) -> None:
+    db.execute(
+        "INSERT OR IGNORE INTO trades "
+        "(txn_id, asset_id, round, round_time, seller, buyer, qty, cost, platform_fee) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (call.txn_id, asset_id, call.round, call.round_time, seller, buyer, qty, cost, platform_fee),
+    )
+    db.execute(
+        "UPDATE listings SET remaining = ?, status = ?, updated_round = ? WHERE asset_id = ?",
+        (remaining, "active" if remaining else "sold", call.round, asset_id),
+    )
+
+
+@_event("CreditSold")
+def _credit_sold(db: sqlite3.Connection, call: AppCall, event: dict) -> None:
+    _record_trade(
+        db, call, event["asset_id"], event["seller"], event["buyer"], event["qty"],
+        event["cost"], event["platform_fee"], event["remaining"],
+    )
+
+
+@_event("CreditsBought")
+def _credits_bought(db: sqlite3.Connection, call: AppCall, event: dict) -> None:
+    # Baskets buy every listing out completely
+    for fill in event["fills"]:
+        _record_trade(
+            db, call, fill["asset_id"], fill["seller"], event["buyer"], fill["qty"],
+            fill["cost"], None, 0,
+        )
+
+
+@_event("ListingCancelled")
+def _listing_cancelled(db: sqlite3.Connection, call: AppCall, event: dict) -> None:
+    db.execute(
+        "UPDATE listings SET remaining = 0, status = 'cancelled', updated_round = ? WHERE asset_id = ?",
+        (call.round, event["asset_id"]),
+    )
+
+
+@_method(MARKETPLACE, "sweep_expired")
+def _sweep_expired(db: sqlite3.Connection, call: AppCall) -> None:
+    # Skipped candidates get no transfer back, so the inner transfers name the swept listings
+    for asset_id, _receiver, _amount in call.asset_transfers:
+        db.execute(
+            "UPDATE listings SET remaining = 0, status = 'expired', updated_round = ? "
+            "WHERE asset_id = ? AND status = 'active'",
+            (call.round, asset_id),
+        )
+
+
+# ── Retirement registry ───────────────────────────────────────
+
+def _record_retirement(
+    db: sqlite3.Connection,
+    call: AppCall,
+    asset_id: int,
+    company: str,
+    co2_tonnes: int,
+    retired_at: int,
+) -> None:
+    db.execute(
+        "INSERT OR REPLACE INTO retirements "
+        "(asset_id, company, company_name, certificate, co2_tonnes, retired_at, txn_id, round) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            asset_id, company, call.args.get("company_name"), call.args.get("ipfs_certificate"),
+            co2_tonnes, retired_at, call.txn_id, call.round,
+        ),
+    )
+    db.execute("UPDATE credits SET retired = 1 WHERE asset_id = ?", (asset_id,))
+
+
+@_event("CreditRetired")
+def _credit_retired(db: sqlite3.Connection, call: AppCall, event: dict) -> None:
+    _record_retirement(db, call, event["asset_id"], event["company"], event["co2_tonnes"], event["retired_at"])
+
+
+@_event("CreditsRetired")
+def _credits_retired(db: sqlite3.Connection, call: AppCall, event: dict) -> None:
+    for credit in event["credits"]:
+        _record_retirement(
+            db, call, credit["asset_id"], event["company"], credit["co2_tonnes"], event["retired_at"]
+        )
+
+
+# ── Ingestor ──────────────────────────────────────────────────
+
+class Ingestor:
+    def __init__(self, store: Store, decoder: Decoder) -> None:
+        self.store = store
+        self.decoder = decoder
+
+    def ingest(self, transactions: Iterable[Mapping], up_to: int | None = None) -> int:
+        """
+        Applies transactions, which must arrive in round order. Rounds at or
+        before the checkpoint are skipped, so replaying a source is harmless.
+        up_to: last round the source covered; the checkpoint advances to it
+        even if its final rounds had no app calls.
+
+        Returns: number of rounds applied
+        """
+        applied = 0
+        previous = 0
+        for round_, txns in itertools.groupby(transactions, key=lambda txn: txn["confirmed-round"]):
+            if round_ <= previous:
+                raise ValueError(f"Round {round_} arrived after round {previous}")
+            previous = round_
+            if round_ <= self.store.checkpoint:
+                continue
+            with self.store.round(round_) as db:
+                for txn in txns:
+                    for call in self.decoder.decode(txn):
+                        apply(db, call)
+            applied += 1
+
+        if up_to is not None and up_to > self.store.checkpoint:
+            with self.store.round(up_to):
+                pass
+        return applied
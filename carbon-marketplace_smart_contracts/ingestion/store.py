@@ -0,0 +1,156 @@
+"""
+SQLite store of the materialized contract state.
+
+Every round is applied inside one SQLite transaction that also advances the
+checkpoint, so the tables always reflect a whole number of rounds.
+"""
+
+import sqlite3
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoint (
+    id    INTEGER PRIMARY KEY CHECK (id = 1),
+    round INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS issuers (
+    address               TEXT PRIMARY KEY,
+    name                  TEXT,
+    country               TEXT,
+    verification_standard TEXT,
+    verified              INTEGER NOT NULL DEFAULT 0,
+    credits_issued        INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS credits (
+    asset_id     INTEGER PRIMARY KEY,
+    project_id   TEXT    NOT NULL,
+    issuer       TEXT    NOT NULL,
+    co2_tonnes   INTEGER NOT NULL,
+    units        INTEGER NOT NULL,
+    vintage_year INTEGER NOT NULL,
+    expiry       INTEGER NOT NULL,
+    minted_round INTEGER NOT NULL,
+    retired      INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS credits_issuer ON credits (issuer);
+
+CREATE TABLE IF NOT EXISTS listings (
+    asset_id      INTEGER PRIMARY KEY,
+    seller        TEXT    NOT NULL,
+    price         INTEGER NOT NULL,   -- microAlgo, per tonne when fungible
+    remaining     INTEGER NOT NULL,   -- units still for sale
+    min_qty       INTEGER NOT NULL,
+    vintage_year  INTEGER NOT NULL,
+    expiry        INTEGER NOT NULL,
+    fungible      INTEGER NOT NULL,
+    status        TEXT    NOT NULL,   -- active | sold | cancelled | expired
+    listed_round  INTEGER NOT NULL,
+    updated_round INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS listings_status ON listings (status, vintage_year, price);
+CREATE INDEX IF NOT EXISTS listings_seller ON listings (seller);
+
+CREATE TABLE IF NOT EXISTS trades (
+    txn_id       TEXT    NOT NULL,
+    asset_id     INTEGER NOT NULL,
+    round        INTEGER NOT NULL,
+    round_time   INTEGER NOT NULL,
+    seller       TEXT    NOT NULL,
+    buyer        TEXT    NOT NULL,
+    qty          INTEGER NOT NULL,
+    cost         INTEGER NOT NULL,
+    platform_fee INTEGER,             -- NULL for basket fills (buy_credits accrues one fee per basket)
+    PRIMARY KEY (txn_id, asset_id)
+);
+CREATE INDEX IF NOT EXISTS trades_round ON trades (round);
+CREATE INDEX IF NOT EXISTS trades_buyer ON trades (buyer);
+CREATE INDEX IF NOT EXISTS trades_seller ON trades (seller);
+
+CREATE TABLE IF NOT EXISTS retirements (
+    asset_id     INTEGER PRIMARY KEY,
+    company      TEXT    NOT NULL,
+    company_name TEXT,
+    certificate  TEXT,
+    co2_tonnes   INTEGER NOT NULL,
+    retired_at   INTEGER NOT NULL,
+    txn_id       TEXT    NOT NULL,
+    round        INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS retirements_company ON retirements (company);
+"""
+
+
+class Store:
+    def __init__(self, path: Path | str = ":memory:") -> None:
+        self.db = sqlite3.connect(str(path))
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.db.close()
+
+    # ── Checkpoint ────────────────────────────────────────────
+
+    @property
+    def checkpoint(self) -> int:
+        """Last round fully applied (0 before the first)."""
+        row = self.db.execute("SELECT round FROM checkpoint WHERE id = 1").fetchone()
+        return row["round"] if row else 0
+
+    @contextmanager
+    def round(self, round_: int) -> Iterator[sqlite3.Connection]:
+        """Applies one round atomically and advances the checkpoint to it."""
+        with self.db:
+            yield self.db
+            self.db.execute(
+                "INSERT INTO checkpoint (id, round) VALUES (1, ?) "
+                "ON CONFLICT (id) DO UPDATE SET round = excluded.round",
+                (round_,),
+            )
+
+    # ── Queries ───────────────────────────────────────────────
+
+    def active_listings(
+        self,
+        vintage_year: int | None = None,
+        max_price: int | None = None,
+        limit: int = 100,
+    ) -> list[sqlite3.Row]:
+        clauses, params = ["status = 'active'"], []
+        if vintage_year is not None:
+            clauses.append("vintage_year = ?")
+            params.append(vintage_year)
+        if max_price is not None:
+            clauses.append("price <= ?")
+            params.append(max_price)
+        return self.db.execute(
+            f"SELECT * FROM listings WHERE {' AND '.join(clauses)} ORDER BY price LIMIT ?",
+            (*params, limit),
+        ).fetchall()
+
+    def marketplace_activity(self, limit: int = 50, before_round: int | None = None) -> list[sqlite3.Row]:
+        """Most recent trades first (replaces a full scan of the marketplace app's history)."""
+        return self.db.execute(
+            "SELECT * FROM trades WHERE round < ? ORDER BY round DESC, txn_id LIMIT ?",
+            (before_round if before_round is not None else 2**63 - 1, limit),
+        ).fetchall()
+
+    def retirements(self, company: str | None = None) -> list[sqlite3.Row]:
+        if company is None:
+            return self.db.execute("SELECT * FROM retirements ORDER BY round, asset_id").fetchall()
+        return self.db.execute(
+            "SELECT * FROM retirements WHERE company = ? ORDER BY round, asset_id", (company,)
+        ).fetchall()
+
+    def issuer(self, address: str) -> sqlite3.Row | None:
+        return self.db.execute("SELECT * FROM issuers WHERE address = ?", (address,)).fetchone()
+
+    def counts(self) -> dict[str, int]:
+        return {
+            table: self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+            for table in ("issuers", "credits", "listings", "trades", "retirements")
+        }
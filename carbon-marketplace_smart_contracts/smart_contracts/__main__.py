@@ -1,31 +1,43 @@
+import ast
 import dataclasses
+import functools
+import hashlib
 import importlib
 import logging
 import subprocess
 import sys
+import time
 from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from shutil import rmtree
 
-from algokit_utils.config import config
-from dotenv import load_dotenv
+from smart_contracts._helpers import bytecode
 
-# Set trace_all to True to capture all transactions, defaults to capturing traces only on failure
-# Learn more about using AlgoKit AVM Debugger to debug your TEAL source codes and inspect various kinds of
-# Algorand transactions in atomic groups -> https://github.com/algorandfoundation/algokit-avm-vscode-debugger
-config.configure(debug=True, trace_all=False)
-
-# Set up logging and load environment variables.
+# Set up logging. Loading .env and the AlgoKit debug configuration are deferred
+# to the actions that need them, so discovery and builds start fast.
 logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s %(levelname)-10s: %(message)s"
+    level=logging.INFO, format="%(asctime)s %(levelname)-10s: %(message)s"
 )
 logger = logging.getLogger(__name__)
-logger.info("Loading .env")
-load_dotenv()
 
 # Determine the root path based on this file's location.
 root_path = Path(__file__).parent
 
+
+def enable_debug() -> None:
+    """
+    Opt-in (--debug): DEBUG logging and AVM debugger traces for failed transactions.
+    Set trace_all to True to capture all transactions.
+    Learn more about using AlgoKit AVM Debugger to debug your TEAL source codes and inspect various kinds of
+    Algorand transactions in atomic groups -> https://github.com/algorandfoundation/algokit-avm-vscode-debugger
+    """
+    from algokit_utils.config import config
+
+    config.configure(debug=True, trace_all=False)
+    logging.getLogger().setLevel(logging.DEBUG)
+
+
 # ----------------------- Contract Configuration ----------------------- #
 
 
@@ -33,7 +45,11 @@ root_path = Path(__file__).parent
 class SmartContract:
     path: Path
     name: str
-    deploy: Callable[[], None] | None = None
+
+    @functools.cached_property
+    def deploy(self) -> Callable[[bool], None] | None:
+        """The folder's deploy function, imported on first use."""
+        return import_deploy_if_exists(self.path.parent)
 
 
 def import_contract(folder: Path) -> Path:
@@ -45,7 +61,7 @@ def import_contract(folder: Path) -> Path:
         raise Exception(f"Contract not found in {folder}")
 
 
-def import_deploy_if_exists(folder: Path) -> Callable[[], None] | None:
+def import_deploy_if_exists(folder: Path) -> Callable[[bool], None] | None:
     """Imports the deploy function from a folder if it exists."""
     try:
         module_name = f"{folder.parent.name}.{folder.name}.deploy_config"
@@ -60,17 +76,18 @@ def has_contract_file(directory: Path) -> bool:
     return (directory / "contract.py").exists()
 
 
-# Use the current directory (root_path) as the base for contract folders and exclude
-# folders that start with '_' (internal helpers).
-contracts: list[SmartContract] = [
-    SmartContract(
-        path=import_contract(folder),
-        name=folder.name,
-        deploy=import_deploy_if_exists(folder),
-    )
-    for folder in root_path.iterdir()
-    if folder.is_dir() and has_contract_file(folder) and not folder.name.startswith("_")
-]
+def discover_contracts() -> list[SmartContract]:
+    """
+    Contract folders under root_path, by name (so dependencies such as the
+    issuance registry deploy before the marketplace). Folders starting with
+    '_' are internal helpers. This is a filesystem scan only; nothing is imported.
+    """
+    return [
+        SmartContract(path=import_contract(folder), name=folder.name)
+        for folder in sorted(root_path.iterdir())
+        if folder.is_dir() and has_contract_file(folder) and not folder.name.startswith("_")
+    ]
+
 
 # -------------------------- Build Logic -------------------------- #
 
@@ -89,7 +106,8 @@ def _get_output_path(output_dir: Path, deployment_extension: str) -> Path:
 def build(output_dir: Path, contract_path: Path) -> Path:
     """
     Builds the contract by exporting (compiling) its source and generating a client.
-    If the output directory already exists, it is cleared.
+    If the output directory already exists, it is cleared. The assembled
+    bytecode is added to the local bytecode cache.
     """
     output_dir = output_dir.resolve()
     if output_dir.exists():
@@ -106,6 +124,7 @@ def build(output_dir: Path, contract_path: Path) -> Path:
             str(contract_path.resolve()),
             f"--out-dir={output_dir}",
             "--output-source-map",
+            "--output-bytecode",
         ],
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
@@ -118,6 +137,10 @@ def build(output_dir: Path, contract_path: Path) -> Path:
     if build_result.returncode:
         raise Exception(f"Could not build contract:\n{build_result.stdout}")
 
+    # Deploys load these programs from the cache instead of asking algod to compile them.
+    indexed = bytecode.index_build_output(output_dir)
+    logger.info(f"Cached bytecode for {indexed} programs")
+
     # Look for arc56.json files and generate the client based on them.
     app_spec_file_names: list[str] = [
         file.name for file in output_dir.glob("*.arc56.json")
@@ -163,24 +186,150 @@ def build(output_dir: Path, contract_path: Path) -> Path:
     return output_dir
 
 
+# ------------------------- Build Cache Logic ------------------------- #
+
+# Written into each artifact folder after a successful build.
+BUILD_HASH_FILE = ".build_hash"
+
+
+@dataclasses.dataclass
+class BuildResult:
+    name: str
+    cached: bool
+    seconds: float
+
+
+def _toolchain_version() -> str:
+    """
+    Compiler and client generator versions; a toolchain upgrade invalidates
+    every cache entry. Starts two algokit processes, so build_all() asks once.
+    """
+    versions = []
+    for command in (["algokit", "--version"], ["algokit", "compile", "python", "--version"]):
+        result = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        versions.append(result.stdout.strip())
+    return "\n".join(versions)
+
+
+def _local_imports(source_path: Path) -> list[Path]:
+    """Modules of this package imported by a source file (contracts may import each other)."""
+    package = root_path.name
+    paths = []
+    for node in ast.walk(ast.parse(source_path.read_text())):
+        if isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            modules = [node.module]
+        elif isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        else:
+            continue
+        for module in modules:
+            parts = module.split(".")
+            if parts[0] != package:
+                continue
+            module_path = root_path.joinpath(*parts[1:])
+            for candidate in (module_path.with_suffix(".py"), module_path / "__init__.py"):
+                if candidate.exists():
+                    paths.append(candidate)
+    return paths
+
+
+def source_hash(contract_path: Path, toolchain: str) -> str:
+    """Hash of a contract, every package module it transitively imports, and the toolchain version."""
+    digest = hashlib.sha256(toolchain.encode())
+    seen: set[Path] = set()
+    pending = [contract_path.resolve()]
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        pending.extend(candidate.resolve() for candidate in _local_imports(path))
+    for path in sorted(seen):
+        digest.update(str(path.relative_to(root_path.resolve())).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def is_cached(output_dir: Path, digest: str) -> bool:
+    hash_file = output_dir / BUILD_HASH_FILE
+    return (
+        hash_file.exists()
+        and hash_file.read_text() == digest
+        and any(output_dir.glob("*.arc56.json"))
+        # Artifacts from before bytecode output was enabled need a rebuild.
+        and any(output_dir.glob("*.bin"))
+    )
+
+
+def _timed_build(name: str, output_dir: Path, contract_path: Path, digest: str) -> BuildResult:
+    started = time.perf_counter()
+    build(output_dir, contract_path)
+    (output_dir.resolve() / BUILD_HASH_FILE).write_text(digest)
+    return BuildResult(name, cached=False, seconds=time.perf_counter() - started)
+
+
+def build_all(
+    artifact_path: Path,
+    to_build: list["SmartContract"],
+    force: bool = False,
+) -> list[BuildResult]:
+    """
+    Builds contracts whose sources (or the toolchain) changed since their last
+    build, concurrently in a process pool; unchanged ones reuse their artifacts.
+    """
+    results: list[BuildResult] = []
+    jobs = []
+    toolchain = _toolchain_version() if to_build else ""
+    for contract in to_build:
+        output_dir = artifact_path / contract.name
+        started = time.perf_counter()
+        digest = source_hash(contract.path, toolchain)
+        if not force and is_cached(output_dir, digest):
+            bytecode.index_build_output(output_dir)
+            results.append(BuildResult(contract.name, cached=True, seconds=time.perf_counter() - started))
+        else:
+            jobs.append((contract.name, output_dir, contract.path, digest))
+
+    if jobs:
+        with ProcessPoolExecutor(max_workers=len(jobs)) as pool:
+            futures = [pool.submit(_timed_build, *job) for job in jobs]
+            results.extend(future.result() for future in futures)
+
+    for result in results:
+        status = "cached" if result.cached else "compiled"
+        logger.info(f"{result.name:<20} {status:<9} {result.seconds:6.2f}s")
+    return results
+
+
 # --------------------------- Main Logic --------------------------- #
 
 
-def main(action: str, contract_name: str | None = None) -> None:
-    """Main entry point to build and/or deploy smart contracts."""
+def main(action: str, contract_name: str | None = None, force: bool = False, replace: bool = False) -> None:
+    """
+    Main entry point to build and/or deploy smart contracts.
+    force: rebuild every selected contract even if its cached artifacts are current.
+    replace: create a new app for a contract whose schema or create args
+    changed (deploys go through deployment.json, as deploy_all.py does).
+    Deploy modules (and with them algokit_utils and the generated clients) are
+    imported only for the contracts actually deployed.
+    """
     artifact_path = root_path / "artifacts"
     # Filter contracts based on an optional specific contract name.
     filtered_contracts = [
         contract
-        for contract in contracts
+        for contract in discover_contracts()
         if contract_name is None or contract.name == contract_name
     ]
 
+    if action in ("deploy", "all"):
+        from dotenv import load_dotenv
+
+        logger.info("Loading .env")
+        load_dotenv()
+
     match action:
         case "build":
-            for contract in filtered_contracts:
-                logger.info(f"Building app at {contract.path}")
-                build(artifact_path / contract.name, contract.path)
+            build_all(artifact_path, filtered_contracts, force)
         case "deploy":
             for contract in filtered_contracts:
                 output_dir = artifact_path / contract.name
@@ -196,22 +345,27 @@ def main(action: str, contract_name: str | None = None) -> None:
                     raise Exception("Could not deploy app, .arc56.json file not found")
                 if contract.deploy:
                     logger.info(f"Deploying app {contract.name}")
-                    contract.deploy()
+                    contract.deploy(replace)
         case "all":
+            build_all(artifact_path, filtered_contracts, force)
             for contract in filtered_contracts:
-                logger.info(f"Building app at {contract.path}")
-                build(artifact_path / contract.name, contract.path)
                 if contract.deploy:
                     logger.info(f"Deploying {contract.name}")
-                    contract.deploy()
+                    contract.deploy(replace)
         case _:
             logger.error(f"Unknown action: {action}")
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        main(sys.argv[1], sys.argv[2])
-    elif len(sys.argv) > 1:
-        main(sys.argv[1])
+    flags = {arg for arg in sys.argv[1:] if arg.startswith("--")}
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    force = "--force" in flags
+    replace = "--replace" in flags
+    if "--debug" in flags:
+        enable_debug()
+    if len(args) > 1:
+        main(args[0], args[1], force, replace)
+    elif len(args) > 0:
+        main(args[0], force=force, replace=replace)
     else:
-        main("all")
+        main("all", force=force, replace=replace)
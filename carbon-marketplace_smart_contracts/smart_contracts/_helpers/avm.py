@@ -0,0 +1,156 @@
+"""
+AVM protocol limits and a small packer for fitting bulk contract calls into them.
+
+Several contract methods take arrays (batch mint, batch retire, multi-listing
+checkout, ...). Each array entry consumes references, argument bytes and inner
+transactions, so large client-side workloads have to be split into calls —
+and calls into groups — that stay inside these limits.
+"""
+
+import dataclasses
+from collections.abc import Callable, Iterable, Sequence
+from typing import TypeVar
+
+T = TypeVar("T")
+
+MIN_TXN_FEE = 1_000                # microAlgo
+MAX_GROUP_SIZE = 16                # top-level transactions per group
+MAX_TXN_REFERENCES = 8             # accounts + assets + apps + boxes per transaction
+MAX_TXN_ACCOUNT_REFERENCES = 4     # of which accounts
+MAX_APP_ARGS_BYTES = 2048          # total size of all application arguments
+MAX_INNER_TXNS_PER_CALL = 16       # pooled across the group: 16 per app call
+MAX_INNER_TXNS_PER_GROUP = 256
+BOX_IO_BYTES_PER_REF = 1024        # box read/write budget granted by each box reference
+MAX_LOG_BYTES = 1024               # per app call: ABI return value + ARC-28 events
+ABI_SELECTOR_BYTES = 4
+OPCODE_BUDGET_PER_CALL = 700       # pooled: every app call, inner op-up calls included
+PROGRAM_PAGE_BYTES = 2048          # approval + clear program bytes, per page (1 + extra pages)
+# Puya's ensure_budget(n) issues inner op-up calls while the budget is below
+# n + ENSURE_BUDGET_BUFFER; each loop iteration itself costs _OPUP_LOOP_OPCODES.
+ENSURE_BUDGET_BUFFER = 10
+_OPUP_LOOP_OPCODES = 17
+
+
+def opup_calls(required_budget: int, available: int = 0) -> int:
+    """
+    Inner op-up calls ensure_budget(required_budget) issues when `available`
+    budget is left at that point; 0 available gives the upper bound. Op-up
+    calls are sent with fee 0 (OpUpFeeSource.GroupCredit), so the outer
+    transaction pays MIN_TXN_FEE for each.
+    """
+    missing = required_budget + ENSURE_BUDGET_BUFFER - available
+    if missing <= 0:
+        return 0
+    return -(-missing // (OPCODE_BUDGET_PER_CALL - _OPUP_LOOP_OPCODES))
+
+
+def abi_string_size(value: str) -> int:
+    """Size of an ARC-4 string tail: 2-byte length prefix + UTF-8 bytes."""
+    return 2 + len(value.encode())
+
+
+def abi_string_bytes(value: str) -> bytes:
+    """ARC-4 encoding of a string, as produced by `arc4.String.bytes` on-chain."""
+    encoded = value.encode()
+    return len(encoded).to_bytes(2, "big") + encoded
+
+
+def pack(
+    items: Iterable[T],
+    cost: Callable[[T], Sequence[int]],
+    capacity: Sequence[int],
+    overhead: Sequence[int] | None = None,
+) -> list[list[T]]:
+    """
+    Greedily packs items, in order, into the fewest consecutive bins.
+
+    `cost(item)` returns the item's usage of each resource dimension and
+    `capacity` the per-bin limit for the same dimensions. `overhead` is the
+    fixed usage of an empty bin (e.g. the method selector). Order is preserved
+    so callers can map results back to their inputs.
+    """
+    base = list(overhead) if overhead is not None else [0] * len(capacity)
+    bins: list[list[T]] = []
+    current: list[T] = []
+    used = list(base)
+
+    for item in items:
+        item_cost = cost(item)
+        if any(b + c > cap for b, c, cap in zip(base, item_cost, capacity)):
+            raise ValueError(f"Item does not fit in an empty batch: {item!r}")
+        if current and any(u + c > cap for u, c, cap in zip(used, item_cost, capacity)):
+            bins.append(current)
+            current, used = [], list(base)
+        current.append(item)
+        used = [u + c for u, c in zip(used, item_cost)]
+
+    if current:
+        bins.append(current)
+    return bins
+
+
+def chunked(items: Sequence[T], size: int) -> list[list[T]]:
+    """Splits a sequence into consecutive chunks of at most `size` items."""
+    if size < 1:
+        raise ValueError("Chunk size must be >= 1")
+    return [list(items[i : i + size]) for i in range(0, len(items), size)]
+
+
+@dataclasses.dataclass
+class References:
+    """Resources carried by one transaction of a group."""
+
+    boxes: list[bytes] = dataclasses.field(default_factory=list)
+    assets: list[int] = dataclasses.field(default_factory=list)
+    accounts: list[str] = dataclasses.field(default_factory=list)
+
+    def __len__(self) -> int:
+        return len(self.boxes) + len(self.assets) + len(self.accounts)
+
+
+def distribute_references(
+    boxes: Sequence[bytes] = (),
+    assets: Sequence[int] = (),
+    accounts: Sequence[str] = (),
+) -> list[References]:
+    """
+    Spreads references over as few transactions as possible.
+
+    Resources are shared across a group, so a method touching more boxes,
+    assets or accounts than fit one transaction can borrow slots from other
+    app calls in the same group. Duplicates are dropped and every transaction
+    respects MAX_TXN_REFERENCES and MAX_TXN_ACCOUNT_REFERENCES.
+    """
+    unique_accounts = list(dict.fromkeys(accounts))
+    others: list[tuple[str, bytes | int]] = [("box", b) for b in dict.fromkeys(boxes)]
+    others += [("asset", a) for a in dict.fromkeys(assets)]
+
+    txns: list[References] = []
+    for start in range(0, len(unique_accounts), MAX_TXN_ACCOUNT_REFERENCES):
+        txns.append(References(accounts=unique_accounts[start : start + MAX_TXN_ACCOUNT_REFERENCES]))
+
+    pending = iter(others)
+    for refs in txns:
+        while len(refs) < MAX_TXN_REFERENCES:
+            item = next(pending, None)
+            if item is None:
+                return txns
+            _add(refs, item)
+
+    refs = References()
+    for item in pending:
+        if len(refs) == MAX_TXN_REFERENCES:
+            txns.append(refs)
+            refs = References()
+        _add(refs, item)
+    if len(refs) or not txns:
+        txns.append(refs)
+    return txns
+
+
+def _add(refs: References, item: tuple[str, bytes | int]) -> None:
+    kind, value = item
+    if kind == "box":
+        refs.boxes.append(value)  # type: ignore[arg-type]
+    else:
+        refs.assets.append(value)  # type: ignore[arg-type]
@@ -0,0 +1,100 @@
+"""
+Local cache of compiled TEAL, keyed by the SHA-256 of the TEAL source with
+comments and blank lines stripped.
+
+Puya assembles bytecode itself (`--output-bytecode`), so a build leaves a
+`.bin` next to every `.teal`. Indexing those pairs at build time lets deploys
+load programs from disk instead of sending the source to algod's
+/v2/teal/compile. Anything compiled by algod on a cache miss is stored too, so
+each distinct program goes over the network at most once.
+
+Comments are left out of the key because they do not change the bytecode but
+do change between builds: Puya's source-line comments carry the path the
+compiler was invoked with (`smart_contracts/<app>/contract.py` from the build
+CLI, `contract.py` from inside the app folder).
+"""
+
+import hashlib
+import tempfile
+from collections.abc import Callable
+from pathlib import Path
+
+CACHE_DIR = Path(__file__).parent.parent / ".bytecode"
+
+
+def _strip_comment(line: bytes) -> bytes:
+    """A TEAL line without its `//` comment; `//` inside a string literal is kept."""
+    in_string = escaped = False
+    for i, char in enumerate(line):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == ord("\\"):
+                escaped = True
+            elif char == ord('"'):
+                in_string = False
+        elif char == ord('"'):
+            in_string = True
+        elif line[i : i + 2] == b"//":
+            return line[:i]
+    return line
+
+
+def teal_hash(source: str | bytes) -> str:
+    """SHA-256 of a TEAL program's code: comments, indentation and blank lines are ignored."""
+    if isinstance(source, str):
+        source = source.encode()
+    lines = (_strip_comment(line).strip() for line in source.splitlines())
+    return hashlib.sha256(b"\n".join(line for line in lines if line)).hexdigest()
+
+
+def _entry(digest: str, cache_dir: Path | None) -> Path:
+    return (cache_dir or CACHE_DIR) / f"{digest}.bin"
+
+
+def store(source: str | bytes, program: bytes, cache_dir: Path | None = None) -> Path:
+    """Records the bytecode of a TEAL source."""
+    path = _entry(teal_hash(source), cache_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Write then rename, so concurrent deploys never read a partial entry.
+    with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as partial:
+        partial.write(program)
+    Path(partial.name).replace(path)
+    return path
+
+
+def lookup(source: str | bytes, cache_dir: Path | None = None) -> bytes | None:
+    path = _entry(teal_hash(source), cache_dir)
+    return path.read_bytes() if path.exists() else None
+
+
+def index_build_output(output_dir: Path, cache_dir: Path | None = None) -> int:
+    """
+    Caches every `<name>.teal` / `<name>.bin` pair Puya wrote to output_dir.
+    Returns: number of programs indexed
+    """
+    indexed = 0
+    for teal_path in output_dir.glob("*.teal"):
+        bin_path = teal_path.with_suffix(".bin")
+        if bin_path.exists():
+            store(teal_path.read_bytes(), bin_path.read_bytes(), cache_dir)
+            indexed += 1
+    return indexed
+
+
+def load_program(
+    teal_path: Path,
+    compile_remote: Callable[[str], bytes],
+    cache_dir: Path | None = None,
+) -> tuple[bytes, bool]:
+    """
+    Bytecode for a TEAL file, from the cache when possible.
+    Returns: (program, cache hit)
+    """
+    source = teal_path.read_bytes()
+    program = lookup(source, cache_dir)
+    if program is not None:
+        return program, True
+    program = compile_remote(source.decode())
+    store(source, program, cache_dir)
+    return program, False
@@ -0,0 +1,129 @@
+"""
+Off-chain decoder for the ARC-28 events the three contracts log.
+
+An event log is selector(4) | ARC-4 encoded struct, where the selector is the
+first 4 bytes of SHA-512/256 over the event signature, e.g.
+"CreditListed(uint64,address,uint64,uint64,uint64,uint64,uint64,bool)".
+The specs below mirror the event structs in each contract.py; arc56 specs
+built from the contracts declare the same signatures.
+"""
+
+import dataclasses
+import hashlib
+import struct
+from collections.abc import Iterable
+
+from algosdk.encoding import encode_address
+
+# Field types: "uint64", "address", "bool", "string", or a list of
+# (name, type) pairs for a dynamic array of static structs.
+FieldSpec = tuple[str, "str | list[tuple[str, str]]"]
+
+_STATIC_SIZES = {"uint64": 8, "address": 32, "bool": 1}
+
+EVENT_SPECS: dict[str, list[FieldSpec]] = {
+    # CarbonMarketplace
+    "CreditListed": [
+        ("asset_id", "uint64"), ("seller", "address"), ("price", "uint64"),
+        ("co2_tonnes", "uint64"), ("min_qty", "uint64"), ("vintage_year", "uint64"),
+        ("expiry", "uint64"), ("fungible", "bool"),
+    ],
+    "CreditSold": [
+        ("asset_id", "uint64"), ("seller", "address"), ("buyer", "address"),
+        ("qty", "uint64"), ("price", "uint64"), ("cost", "uint64"),
+        ("platform_fee", "uint64"), ("expiry", "uint64"), ("remaining", "uint64"),
+    ],
+    "CreditsBought": [
+        ("buyer", "address"), ("total", "uint64"), ("platform_fee", "uint64"),
+        ("fills", [
+            ("asset_id", "uint64"), ("seller", "address"), ("qty", "uint64"),
+            ("cost", "uint64"), ("expiry", "uint64"),
+        ]),
+    ],
+    "ListingCancelled": [
+        ("asset_id", "uint64"), ("seller", "address"), ("qty", "uint64"),
+    ],
+    # CreditIssuanceRegistry
+    "CreditMinted": [
+        ("asset_id", "uint64"), ("issuer", "address"), ("project_id", "string"),
+        ("co2_tonnes", "uint64"), ("units", "uint64"), ("vintage_year", "uint64"),
+        ("expiry", "uint64"),
+    ],
+    # RetirementRegistry
+    "CreditRetired": [
+        ("asset_id", "uint64"), ("company", "address"), ("co2_tonnes", "uint64"),
+        ("retired_at", "uint64"),
+    ],
+    "CreditsRetired": [
+        ("company", "address"), ("retired_at", "uint64"), ("total_tonnes", "uint64"),
+        ("credits", [("asset_id", "uint64"), ("co2_tonnes", "uint64")]),
+    ],
+}
+
+
+@dataclasses.dataclass(frozen=True)
+class Event:
+    name: str
+    fields: dict
+
+
+def _type_signature(kind: "str | list[tuple[str, str]]") -> str:
+    if isinstance(kind, list):
+        return "(" + ",".join(element for _, element in kind) + ")[]"
+    return kind
+
+
+def event_signature(name: str) -> str:
+    return f"{name}({','.join(_type_signature(kind) for _, kind in EVENT_SPECS[name])})"
+
+
+def event_selector(name: str) -> bytes:
+    return hashlib.new("sha512_256", event_signature(name).encode()).digest()[:4]
+
+
+_BY_SELECTOR = {event_selector(name): name for name in EVENT_SPECS}
+
+
+def _decode_static(kind: str, data: bytes, offset: int) -> object:
+    if kind == "uint64":
+        return struct.unpack_from(">Q", data, offset)[0]
+    if kind == "address":
+        return encode_address(data[offset:offset + 32])
+    return data[offset] & 0x80 != 0   # bool
+
+
+def _decode_struct(fields: list[FieldSpec], data: bytes) -> dict:
+    values: dict = {}
+    head = 0
+    for name, kind in fields:
+        if isinstance(kind, str) and kind in _STATIC_SIZES:
+            values[name] = _decode_static(kind, data, head)
+            head += _STATIC_SIZES[kind]
+            continue
+
+        # Dynamic field: the head holds the offset of its tail
+        (tail,) = struct.unpack_from(">H", data, head)
+        head += 2
+        (length,) = struct.unpack_from(">H", data, tail)
+        if kind == "string":
+            values[name] = data[tail + 2:tail + 2 + length].decode()
+            continue
+        size = sum(_STATIC_SIZES[element] for _, element in kind)
+        values[name] = [
+            _decode_struct(kind, data[start:start + size])
+            for start in range(tail + 2, tail + 2 + length * size, size)
+        ]
+    return values
+
+
+def decode_event(log: bytes) -> Event | None:
+    """The event in a log entry, or None if the log is not one of these events."""
+    name = _BY_SELECTOR.get(log[:4])
+    if name is None:
+        return None
+    return Event(name, _decode_struct(EVENT_SPECS[name], log[4:]))
+
+
+def decode_events(logs: Iterable[bytes]) -> list[Event]:
+    """Events among a transaction's logs, in log order (ABI return values are skipped)."""
+    return [event for event in map(decode_event, logs) if event is not None]
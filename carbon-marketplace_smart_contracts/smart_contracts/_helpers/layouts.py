@@ -0,0 +1,139 @@
+"""
+NumPy structured dtypes for the contracts' fixed-width box values.
+
+Each layout is declared once, big-endian as the AVM writes it, so a buffer of
+N concatenated box values decodes with a single zero-copy np.frombuffer() into
+a record array with one column per field. Addresses and transaction IDs are
+raw 32-byte void fields; use addresses() to render a column as strings.
+
+    CarbonMarketplace      listing (v2)      94 bytes   key = asset_id(8)
+                           listing (v1)      60 bytes   key = asset_id(8)
+                           listing (legacy)  96 bytes   key = asset_id(8)
+    CreditIssuanceRegistry project           40 bytes   key = project_id (ARC-4 string)
+                           credit terms      24 bytes   key = b"a" + asset_id(8)
+    RetirementRegistry     retirement        88 bytes   key = asset_id(8)
+                           partial retirement 88 bytes  key = asset_id(8) + company(32)
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+
+from smart_contracts.marketplace.listing import (
+    FLAG_FUNGIBLE,
+    FLAG_STATUS_MASK,
+    LEGACY_LISTING_BOX_BYTES,
+    LISTING_BOX_BYTES,
+    V1_LISTING_BOX_BYTES,
+)
+
+_U8 = ">u8"
+_ADDRESS = "V32"
+
+LISTING = np.dtype([
+    ("version",         "u1"),
+    ("flags",           "u1"),   # status in the low nibble, FLAG_FUNGIBLE in bit 7
+    ("vintage_year",    ">u2"),
+    ("seller",          _ADDRESS),
+    ("price",           _U8),
+    ("co2_tonnes",      ">u4"),
+    ("min_qty",         ">u4"),
+    ("listed_at",       ">u4"),
+    ("expiry",          ">u4"),
+    ("project_type",    "u1"),   # listing.PROJECT_TYPES code
+    ("standard",        "u1"),   # listing.STANDARDS code
+    ("metadata_digest", "V32"),
+])
+
+LISTING_V1 = np.dtype([
+    ("version",      "u1"),
+    ("flags",        "u1"),   # status in the low nibble, FLAG_FUNGIBLE in bit 7
+    ("vintage_year", ">u2"),
+    ("seller",       _ADDRESS),
+    ("price",        _U8),
+    ("co2_tonnes",   ">u4"),
+    ("min_qty",      ">u4"),
+    ("listed_at",    ">u4"),
+    ("expiry",       ">u4"),
+])
+
+LISTING_LEGACY = np.dtype([
+    ("asset_id",     _U8),
+    ("seller",       _ADDRESS),
+    ("price",        _U8),
+    ("co2_tonnes",   _U8),
+    ("vintage_year", _U8),
+    ("min_qty",      _U8),
+    ("listed_at",    _U8),
+    ("expiry",       _U8),
+    ("status",       _U8),
+])
+
+PROJECT = np.dtype([
+    ("asset_id",     _U8),
+    ("co2_tonnes",   _U8),
+    ("vintage_year", _U8),
+    ("minted_at",    _U8),
+    ("expiry",       _U8),
+])
+
+CREDIT_TERMS = np.dtype([
+    ("expiry",       _U8),
+    ("vintage_year", _U8),
+    ("co2_tonnes",   _U8),
+])
+
+RETIREMENT = np.dtype([
+    ("asset_id",     _U8),
+    ("company",      _ADDRESS),
+    ("co2_tonnes",   _U8),
+    ("retired_at",   _U8),
+    ("txn_id",       _ADDRESS),
+])
+
+# Box value size → listing layout; the listing versions differ in size only
+LISTING_LAYOUTS = {
+    LISTING_BOX_BYTES:        LISTING,
+    V1_LISTING_BOX_BYTES:     LISTING_V1,
+    LEGACY_LISTING_BOX_BYTES: LISTING_LEGACY,
+}
+
+UINT64_KEY = np.dtype(_U8)
+
+
+def frombuffer(buffer: bytes | memoryview, layout: np.dtype) -> np.ndarray:
+    """
+    Decodes concatenated box values without copying; the array is a read-only
+    view of buffer.
+    """
+    if len(buffer) % layout.itemsize:
+        raise ValueError(f"{len(buffer)} bytes is not a whole number of {layout.itemsize}-byte records")
+    return np.frombuffer(buffer, dtype=layout)
+
+
+def decode(values: Sequence[bytes], layout: np.dtype) -> np.ndarray:
+    """Decodes separately fetched box values: one join, then frombuffer()."""
+    return frombuffer(b"".join(values), layout)
+
+
+def decode_keys(names: Sequence[bytes]) -> np.ndarray:
+    """Asset IDs from 8-byte box names (listing and retirement boxes)."""
+    return frombuffer(b"".join(names), UINT64_KEY)
+
+
+def listing_status(records: np.ndarray) -> np.ndarray:
+    if "flags" in records.dtype.names:
+        return records["flags"] & FLAG_STATUS_MASK
+    return records["status"]
+
+
+def listing_fungible(records: np.ndarray) -> np.ndarray:
+    """Fungible flags of v1 and v2 listings; legacy listings do not record it."""
+    return (records["flags"] & FLAG_FUNGIBLE).astype(bool)
+
+
+def addresses(column: np.ndarray) -> list[str]:
+    """Renders a 32-byte address column as Algorand address strings."""
+    from algosdk.encoding import encode_address
+
+    return [encode_address(raw.tobytes()) for raw in column]
@@ -0,0 +1,132 @@
+"""
+Machine-readable record of what is deployed, used to make redeploys incremental.
+
+For every app the manifest keeps its ID, the hashes of the programs it runs,
+the schema and create arguments it was created with and the balance it was
+last funded to. A redeploy compares each contract against its record:
+
+    unchanged                      → skip (no transaction)
+    programs changed               → UpdateApplication, same app ID and state
+    schema or create args changed  → ReplacementRequired, unless replace=True:
+                                     then create a replacement app
+
+Schema cannot change after creation, and create arguments (such as the
+marketplace's registry app ID) are only read by the create call, so either
+change needs a new app. A new app starts with empty state and boxes and a new
+ID, so it is never created without being asked for (deploy_all.py --replace).
+"""
+
+import dataclasses
+import hashlib
+import json
+from pathlib import Path
+
+MANIFEST_VERSION = 1
+
+SKIP   = "skip"
+UPDATE = "update"
+CREATE = "create"
+
+
+@dataclasses.dataclass(frozen=True)
+class Schema:
+    global_uints: int
+    global_bytes: int
+    local_uints:  int
+    local_bytes:  int
+    extra_pages:  int
+
+
+@dataclasses.dataclass
+class AppRecord:
+    app_id:           int
+    app_address:      str
+    approval_hash:    str
+    clear_hash:       str
+    schema:           Schema
+    create_args:      list
+    funded_microalgo: int = 0   # balance after the last top-up
+
+    @classmethod
+    def from_json(cls, data: dict) -> "AppRecord":
+        return cls(**{**data, "schema": Schema(**data["schema"])})
+
+
+@dataclasses.dataclass
+class Manifest:
+    network: str
+    apps:    dict[str, AppRecord] = dataclasses.field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path, network: str) -> "Manifest":
+        """The manifest at path, or an empty one for network if there is none yet."""
+        if not path.exists():
+            return cls(network)
+        data = json.loads(path.read_text())
+        if data["version"] != MANIFEST_VERSION:
+            raise ValueError(f"Unsupported manifest version {data['version']} in {path}")
+        if data["network"] != network:
+            raise ValueError(f"{path} records apps on {data['network']}, not {network}")
+        return cls(network, {name: AppRecord.from_json(app) for name, app in data["apps"].items()})
+
+    def save(self, path: Path) -> None:
+        data = {
+            "version": MANIFEST_VERSION,
+            "network": self.network,
+            "apps":    {name: dataclasses.asdict(app) for name, app in self.apps.items()},
+        }
+        path.write_text(json.dumps(data, indent=2) + "\n")
+
+
+class ReplacementRequired(ValueError):
+    """A contract can only be redeployed as a new app, and replace was not requested."""
+
+
+def app_ids(path: Path) -> dict[str, int]:
+    """Contract name → app ID, for tools that only read the manifest."""
+    return {name: app["app_id"] for name, app in json.loads(path.read_text())["apps"].items()}
+
+
+def program_hash(program: bytes) -> str:
+    return hashlib.sha256(program).hexdigest()
+
+
+def plan_action(
+    record:      AppRecord | None,
+    approval:    bytes,
+    clear:       bytes,
+    schema:      Schema,
+    create_args: list,
+    replace:     bool = False,
+) -> str:
+    """
+    What a redeploy has to do for one contract: SKIP, UPDATE or CREATE.
+    Raises ReplacementRequired when an existing app would have to be replaced
+    and replace is False.
+    """
+    if record is None:
+        return CREATE
+    changed = []
+    if record.schema != schema:
+        changed.append("schema")
+    if record.create_args != create_args:
+        changed.append("create args")
+    if changed:
+        if not replace:
+            raise ReplacementRequired(
+                f"{' and '.join(changed)} changed since app {record.app_id} was created; "
+                "rerun with --replace to create a new app (its state and boxes are not carried over)"
+            )
+        return CREATE
+    if (record.approval_hash, record.clear_hash) != (program_hash(approval), program_hash(clear)):
+        return UPDATE
+    return SKIP
+
+
+def top_up_amount(balance: int, min_balance: int, min_spending: int) -> int:
+    """
+    microAlgo to send so an app holds its MBR plus min_spending for inner
+    transaction fees; 0 while it still does.
+    """
+    required = min_balance + min_spending
+    return max(0, required - balance)
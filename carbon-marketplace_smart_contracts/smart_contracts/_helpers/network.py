@@ -0,0 +1,26 @@
+"""
+Network client and deployer account shared by the per-contract deploy_config modules.
+
+`python -m smart_contracts deploy` runs every contract's deploy() in one
+process; they reuse one AlgorandClient (and its cached suggested params)
+instead of each building its own.
+"""
+
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from algokit_utils import AlgorandClient, SigningAccount
+
+
+@functools.cache
+def algorand() -> "AlgorandClient":
+    from algokit_utils import AlgorandClient
+
+    return AlgorandClient.testnet()
+
+
+@functools.cache
+def deployer() -> "SigningAccount":
+    return algorand().account.from_environment("DEPLOYER")
+
@@ -0,0 +1,218 @@
+"""
+Client-side driver for CreditIssuanceRegistry.mint_carbon_credits_batch().
+
+A single batch call is bounded by the box references it can carry (a project
+box and a reverse index box per credit) and by the total size of its
+application arguments. The driver splits a portfolio into the fewest calls that fit, then submits up to
+MAX_GROUP_SIZE calls per atomic group so a portfolio of hundreds of credits
+takes a handful of round-trips instead of one per credit.
+
+Reverse index boxes are keyed by ASA IDs that do not exist yet. Each group is
+simulated first to learn the IDs it would create, then sent with every box
+referenced explicitly. If other transactions take those IDs in between, the
+send fails and the group is predicted again.
+"""
+
+import dataclasses
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from smart_contracts._helpers.avm import (
+    ABI_SELECTOR_BYTES,
+    MAX_APP_ARGS_BYTES,
+    MAX_GROUP_SIZE,
+    MAX_INNER_TXNS_PER_CALL,
+    MAX_LOG_BYTES,
+    MAX_TXN_REFERENCES,
+    MIN_TXN_FEE,
+    abi_string_bytes,
+    abi_string_size,
+    chunked,
+    opup_calls,
+    pack,
+)
+
+if TYPE_CHECKING:
+    from algokit_utils import TransactionComposer
+
+    from smart_contracts.artifacts.credit_issuance.credit_issuance_registry_client import (
+        CreditIssuanceRegistryClient,
+    )
+
+# Project box + reverse index box (b"a" + asset_id, see credit_index_box_name).
+REFS_PER_CREDIT = 2
+CREDIT_INDEX_PREFIX = b"a"
+
+# As in contract.py: ensure_budget() asks for MINT_OPCODE_COST per credit.
+MINT_OPCODE_COST = 200
+# Inner transactions a call keeps free for its op-ups (those of a full call).
+MINT_OPUP_HEADROOM = opup_calls(MAX_INNER_TXNS_PER_CALL * MINT_OPCODE_COST)
+
+# Sends per group before giving up when other transactions keep taking the
+# predicted ASA IDs.
+MINT_ATTEMPTS = 3
+
+# Static head of an encoded CreditSpec: three string offsets + three uint64s.
+_SPEC_HEAD_BYTES = 3 * 2 + 3 * 8
+# Each element of a dynamic array of dynamic structs also costs a 2-byte offset.
+_ARRAY_OFFSET_BYTES = 2
+_ARRAY_LENGTH_BYTES = 2
+
+# Every credit logs a CreditMinted event:
+# selector(4) | asset_id(8) | issuer(32) | project_id offset(2) | 4 x uint64 + project_id
+_EVENT_HEAD_BYTES = 4 + 8 + 32 + 2 + 4 * 8
+# The ABI return (one uint64 per credit) is logged too.
+_RETURN_HEAD_BYTES = 4 + _ARRAY_LENGTH_BYTES
+
+
+@dataclasses.dataclass(frozen=True)
+class CreditSpec:
+    """Off-chain mirror of the contract's CreditSpec struct."""
+
+    project_id: str
+    project_name: str
+    co2_tonnes: int
+    vintage_year: int
+    ipfs_hash: str
+    years_valid: int
+
+    def as_tuple(self) -> tuple[str, str, int, int, str, int]:
+        return (
+            self.project_id,
+            self.project_name,
+            self.co2_tonnes,
+            self.vintage_year,
+            self.ipfs_hash,
+            self.years_valid,
+        )
+
+
+def project_box_name(project_id: str) -> bytes:
+    """Project boxes are keyed by the ARC-4 encoded project ID (length prefix included)."""
+    return abi_string_bytes(project_id)
+
+
+def credit_index_box_name(asset_id: int) -> bytes:
+    """Reverse index box the mint of `asset_id` writes (read by get_credit_terms)."""
+    return CREDIT_INDEX_PREFIX + asset_id.to_bytes(8, "big")
+
+
+def mint_call_fee(batch_size: int) -> int:
+    """
+    Fee of one batch call: its own fee plus one per op-up call ensure_budget()
+    issues in the worst case (nothing left of the pooled budget). The ASA
+    creations pay their own fees from the app account.
+    """
+    return MIN_TXN_FEE * (1 + opup_calls(batch_size * MINT_OPCODE_COST))
+
+
+def encoded_size(spec: CreditSpec) -> int:
+    """Bytes a spec adds to the encoded `credits` argument."""
+    return (
+        _ARRAY_OFFSET_BYTES
+        + _SPEC_HEAD_BYTES
+        + abi_string_size(spec.project_id)
+        + abi_string_size(spec.project_name)
+        + abi_string_size(spec.ipfs_hash)
+    )
+
+
+def log_size(spec: CreditSpec) -> int:
+    """Bytes a spec adds to the call's logs: its CreditMinted event and its returned ASA ID."""
+    return _EVENT_HEAD_BYTES + abi_string_size(spec.project_id) + 8
+
+
+def plan_mint_batches(
+    credits: Sequence[CreditSpec],
+    max_per_call: int = MAX_TXN_REFERENCES // REFS_PER_CREDIT,
+) -> list[list[CreditSpec]]:
+    """
+    Splits a portfolio into batches that each fit a single app call.
+
+    Every credit costs two box references, one inner AssetConfig, its
+    encoded size in application arguments and its share of the call's logs.
+    MINT_OPUP_HEADROOM inner transactions stay free for ensure_budget().
+    """
+    seen: set[str] = set()
+    for spec in credits:
+        if spec.project_id in seen:
+            raise ValueError(f"Duplicate project ID in portfolio: {spec.project_id}")
+        seen.add(spec.project_id)
+
+    return pack(
+        credits,
+        cost=lambda spec: (REFS_PER_CREDIT, encoded_size(spec), 1, log_size(spec)),
+        capacity=(
+            min(max_per_call * REFS_PER_CREDIT, MAX_TXN_REFERENCES),
+            MAX_APP_ARGS_BYTES,
+            MAX_INNER_TXNS_PER_CALL,
+            MAX_LOG_BYTES,
+        ),
+        overhead=(0, ABI_SELECTOR_BYTES + _ARRAY_LENGTH_BYTES, MINT_OPUP_HEADROOM, _RETURN_HEAD_BYTES),
+    )
+
+
+def mint_portfolio(
+    client: "CreditIssuanceRegistryClient",
+    credits: Sequence[CreditSpec],
+) -> list[int]:
+    """
+    Mints a whole portfolio and returns the new ASA IDs in input order.
+
+    Batches are grouped MAX_GROUP_SIZE at a time; each group is atomic, so a
+    failure (e.g. a project ID that already exists on-chain) rejects only the
+    credits of that group.
+    """
+    from algokit_utils import LogicError, SendParams
+
+    asset_ids: list[int] = []
+    for group in chunked(plan_mint_batches(credits), MAX_GROUP_SIZE):
+        predicted = _predict_asset_ids(client, group)
+        for attempt in range(1, MINT_ATTEMPTS + 1):
+            try:
+                result = _mint_group(client, group, predicted).send(
+                    SendParams(cover_app_call_inner_transaction_fees=True)
+                )
+                break
+            except LogicError:
+                # Retry only if the IDs moved; any other failure is the group's own
+                fresh = _predict_asset_ids(client, group)
+                if fresh == predicted or attempt == MINT_ATTEMPTS:
+                    raise
+                predicted = fresh
+        for abi_return in result.returns:
+            asset_ids.extend(abi_return.value)
+    return asset_ids
+
+
+def _mint_group(
+    client: "CreditIssuanceRegistryClient",
+    group: Sequence[Sequence[CreditSpec]],
+    asset_ids: Sequence[Sequence[int]],
+) -> "TransactionComposer":
+    """One mint_carbon_credits_batch() call per batch, every box referenced."""
+    from algokit_utils import AlgoAmount, CommonAppCallParams
+
+    composer = client.new_group()
+    for batch, batch_asset_ids in zip(group, asset_ids, strict=True):
+        composer.mint_carbon_credits_batch(
+            args=([spec.as_tuple() for spec in batch],),
+            params=CommonAppCallParams(
+                box_references=[project_box_name(spec.project_id) for spec in batch]
+                + [credit_index_box_name(asset_id) for asset_id in batch_asset_ids],
+                max_fee=AlgoAmount.from_micro_algo(mint_call_fee(len(batch))),
+            ),
+        )
+    return composer
+
+
+def _predict_asset_ids(
+    client: "CreditIssuanceRegistryClient",
+    group: Sequence[Sequence[CreditSpec]],
+) -> list[list[int]]:
+    """ASA IDs each batch of the group would create if it were sent now."""
+    result = _mint_group(client, group, [[] for _ in group]).simulate(
+        allow_unnamed_resources=True,
+        skip_signatures=True,
+    )
+    return [list(abi_return.value) for abi_return in result.returns]
@@ -8,12 +8,54 @@ from algopy import (
     Account,
     Txn,
     Global,
+    OpUpFeeSource,
     arc4,
+    ensure_budget,
     itxn,
     op,
+    subroutine,
+    urange,
 )
 
 
+# Approximate opcode cost of minting a single credit (checks + AssetConfig + box write).
+# Used to top up the budget in batch mints.
+MINT_OPCODE_COST = 200
+
+# Reverse index: key = b"a" + asset_id(8), value = expiry(8) | vintage(8) | co2(8).
+# Project boxes are keyed by an ARC-4 string, so a 9-byte key starting with
+# b"a" (a 24k+ length prefix) can never collide with one.
+CREDIT_INDEX_PREFIX = b"a"
+
+
+class CreditSpec(arc4.Struct):
+    """One credit in a batch mint — mirrors the arguments of mint_carbon_credit()."""
+    project_id:   arc4.String
+    project_name: arc4.String
+    co2_tonnes:   arc4.UInt64
+    vintage_year: arc4.UInt64
+    ipfs_hash:    arc4.String
+    years_valid:  arc4.UInt64
+
+
+class CreditTerms(arc4.Struct):
+    """The terms other contracts need to trade a credit, looked up by ASA ID."""
+    expiry:       arc4.UInt64
+    vintage_year: arc4.UInt64
+    co2_tonnes:   arc4.UInt64
+
+
+class CreditMinted(arc4.Struct):
+    """ARC-28 event, emitted for every credit minted. units: ASA total (1 for an NFT credit)."""
+    asset_id:     arc4.UInt64
+    issuer:       arc4.Address
+    project_id:   arc4.String
+    co2_tonnes:   arc4.UInt64
+    units:        arc4.UInt64
+    vintage_year: arc4.UInt64
+    expiry:       arc4.UInt64
+
+
 class CreditIssuanceRegistry(ARC4Contract):
     """
     Contract 1 — Credit Issuance Registry (with Expiry Dates)
@@ -46,6 +88,12 @@ class CreditIssuanceRegistry(ARC4Contract):
         self.total_credits_issued.value = UInt64(0)
 
 
+    @arc4.baremethod(allow_actions=["UpdateApplication"])
+    def update(self) -> None:
+        """Admin replaces the programs; the app ID, state and boxes are kept."""
+        assert Txn.sender == self.admin.value, "Admin only"
+
+
     # ─────────────────────────────────────────
     #  NGO REGISTRATION
     # ─────────────────────────────────────────
@@ -100,6 +148,115 @@ class CreditIssuanceRegistry(ARC4Contract):
         Returns: ASA ID of the new NFT
         """
         assert self.issuer_verified[Txn.sender] == UInt64(1), "Issuer not verified"
+
+        asset_id = self._mint(
+            project_id, project_name, co2_tonnes, vintage_year, ipfs_hash, years_valid, UInt64(1)
+        )
+
+        self.issuer_credits[Txn.sender]  = self.issuer_credits[Txn.sender] + UInt64(1)
+        self.total_credits_issued.value  = self.total_credits_issued.value  + UInt64(1)
+
+        return arc4.UInt64(asset_id)
+
+
+    @arc4.abimethod
+    def mint_fungible_credit(
+        self,
+        project_id:      arc4.String,
+        project_name:    arc4.String,
+        location:        arc4.String,
+        co2_tonnes:      arc4.UInt64,
+        vintage_year:    arc4.UInt64,
+        project_type:    arc4.String,
+        ipfs_hash:       arc4.String,
+        years_valid:     arc4.UInt64,
+    ) -> arc4.UInt64:
+        """
+        Verified NGO mints a fungible carbon credit: one ASA unit per tonne.
+
+        Same arguments, checks and project box as mint_carbon_credit(), but the
+        ASA total is co2_tonnes instead of 1. The marketplace sells such credits
+        in partial lots, so a 10,000-tonne project needs one ASA and one listing
+        instead of thousands.
+
+        Returns: ASA ID of the new credit
+        """
+        assert self.issuer_verified[Txn.sender] == UInt64(1), "Issuer not verified"
+
+        asset_id = self._mint(
+            project_id, project_name, co2_tonnes, vintage_year, ipfs_hash, years_valid,
+            co2_tonnes.native,
+        )
+
+        self.issuer_credits[Txn.sender]  = self.issuer_credits[Txn.sender] + UInt64(1)
+        self.total_credits_issued.value  = self.total_credits_issued.value  + UInt64(1)
+
+        return arc4.UInt64(asset_id)
+
+
+    # ─────────────────────────────────────────
+    #  BATCH MINT
+    # ─────────────────────────────────────────
+
+    @arc4.abimethod
+    def mint_carbon_credits_batch(
+        self,
+        credits: arc4.DynamicArray[CreditSpec],
+    ) -> arc4.DynamicArray[arc4.UInt64]:
+        """
+        Verified NGO mints a whole portfolio of credits in one app call.
+
+        Each entry gets its own ASA and project box, exactly as if
+        mint_carbon_credit() had been called for it. Duplicate project IDs
+        (already on-chain or repeated inside the batch) reject the whole call.
+
+        Every entry needs a box reference for its project ID, so a single call
+        is bounded by the reference limit — use credit_issuance.batching to
+        split large portfolios.
+
+        Returns: ASA IDs of the new NFTs, in the same order as `credits`
+        """
+        assert self.issuer_verified[Txn.sender] == UInt64(1), "Issuer not verified"
+        assert credits.length > UInt64(0),                     "Empty batch"
+
+        ensure_budget(credits.length * UInt64(MINT_OPCODE_COST), OpUpFeeSource.GroupCredit)
+
+        asset_ids = arc4.DynamicArray[arc4.UInt64]()
+        for i in urange(credits.length):
+            spec = credits[i].copy()
+            asset_id = self._mint(
+                spec.project_id,
+                spec.project_name,
+                spec.co2_tonnes,
+                spec.vintage_year,
+                spec.ipfs_hash,
+                spec.years_valid,
+                UInt64(1),
+            )
+            asset_ids.append(arc4.UInt64(asset_id))
+
+        self.issuer_credits[Txn.sender]  = self.issuer_credits[Txn.sender] + credits.length
+        self.total_credits_issued.value  = self.total_credits_issued.value  + credits.length
+
+        return asset_ids
+
+
+    @subroutine
+    def _mint(
+        self,
+        project_id:   arc4.String,
+        project_name: arc4.String,
+        co2_tonnes:   arc4.UInt64,
+        vintage_year: arc4.UInt64,
+        ipfs_hash:    arc4.String,
+        years_valid:  arc4.UInt64,
+        total:        UInt64,
+    ) -> UInt64:
+        """
+        Validates one credit, creates its ASA, writes its project box and
+        reverse index entry and emits CreditMinted.
+        total: 1 for an NFT credit, co2_tonnes for a fungible one.
+        """
         assert co2_tonnes.native > UInt64(0),                  "Must represent CO2"
         assert vintage_year.native >= UInt64(2000),            "Invalid vintage year"
         assert years_valid.native >= UInt64(1),                "Min 1 year validity"
@@ -120,9 +277,9 @@ class CreditIssuanceRegistry(ARC4Contract):
         vintage_timestamp = BASE_2000_UNIX + (years_since_2000 * SECONDS_PER_YEAR)
         expiry_timestamp  = vintage_timestamp + (years_valid.native * SECONDS_PER_YEAR)
 
-        # Create the NFT
+        # Create the credit ASA
         asset_txn = itxn.AssetConfig(
-            total          = 1,
+            total          = total,
             decimals       = 0,
             unit_name      = b"CCT",
             asset_name     = project_name.bytes,
@@ -148,13 +305,57 @@ class CreditIssuanceRegistry(ARC4Contract):
             op.itob(Global.latest_timestamp)   +   # offset 24 — 8 bytes (mint time)
             op.itob(expiry_timestamp),             # offset 32 — 8 bytes (expiry ← NEW)
         )
+        _put_credit_terms(asset_id, expiry_timestamp, vintage_year.native, co2_tonnes.native)
 
-        self.issuer_credits[Txn.sender]  = self.issuer_credits[Txn.sender] + UInt64(1)
-        self.total_credits_issued.value  = self.total_credits_issued.value  + UInt64(1)
+        arc4.emit(CreditMinted(
+            asset_id     = arc4.UInt64(asset_id),
+            issuer       = arc4.Address(Txn.sender),
+            project_id   = project_id,
+            co2_tonnes   = co2_tonnes,
+            units        = arc4.UInt64(total),
+            vintage_year = vintage_year,
+            expiry       = arc4.UInt64(expiry_timestamp),
+        ))
+        return asset_id
+
+
+    # ─────────────────────────────────────────
+    #  ASSET ID REVERSE INDEX
+    # ─────────────────────────────────────────
+
+    @arc4.abimethod
+    def index_credit(self, project_id: arc4.String) -> arc4.UInt64:
+        """
+        Backfills the reverse index for a credit minted before it existed.
+        Anyone can call this; it only copies data already in the project box.
+
+        Returns: ASA ID of the indexed credit
+        """
+        box_value, box_exists = op.Box.get(project_id.bytes)
+        assert box_exists, "Project not found"
 
+        asset_id = op.btoi(op.extract(box_value, 0, 8))
+        _put_credit_terms(
+            asset_id,
+            op.btoi(op.extract(box_value, 32, 8)),
+            op.btoi(op.extract(box_value, 16, 8)),
+            op.btoi(op.extract(box_value, 8, 8)),
+        )
         return arc4.UInt64(asset_id)
 
 
+    @arc4.abimethod(readonly=True)
+    def get_credit_terms(self, asset_id: arc4.UInt64) -> CreditTerms:
+        """
+        Returns (expiry, vintage_year, co2_tonnes) of a credit by ASA ID.
+        The marketplace reads this when a credit is listed, so sellers cannot
+        supply their own expiry.
+        """
+        box_value, box_exists = op.Box.get(_credit_index_key(asset_id.native))
+        assert box_exists, "Credit not indexed"
+        return CreditTerms.from_bytes(box_value)
+
+
     # ─────────────────────────────────────────
     #  CHECK EXPIRY (NEW)
     # ─────────────────────────────────────────
@@ -211,4 +412,17 @@ class CreditIssuanceRegistry(ARC4Contract):
     @arc4.abimethod(readonly=True)
     def get_total_issued(self) -> arc4.UInt64:
         """Returns total credits ever minted."""
-        return arc4.UInt64(self.total_credits_issued.value)
\ No newline at end of file
+        return arc4.UInt64(self.total_credits_issued.value)
+
+
+@subroutine
+def _credit_index_key(asset_id: UInt64) -> Bytes:
+    return Bytes(CREDIT_INDEX_PREFIX) + op.itob(asset_id)
+
+
+@subroutine
+def _put_credit_terms(asset_id: UInt64, expiry: UInt64, vintage_year: UInt64, co2_tonnes: UInt64) -> None:
+    op.Box.put(
+        _credit_index_key(asset_id),
+        op.itob(expiry) + op.itob(vintage_year) + op.itob(co2_tonnes),
+    )
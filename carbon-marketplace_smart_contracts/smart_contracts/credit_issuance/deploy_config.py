@@ -1,45 +1,21 @@
 import logging
-from algokit_utils import (
-    AlgorandClient,
-    AlgoAmount,
-)
 
-logger = logging.getLogger(__name__)
+from smart_contracts._helpers import network
 
+logger = logging.getLogger(__name__)
 
-def deploy() -> None:
-    algorand = AlgorandClient.testnet()
-    deployer = algorand.account.from_environment("DEPLOYER")
 
-    from smart_contracts.artifacts.credit_issuance.credit_issuance_registry_client import (
-        CreditIssuanceRegistryFactory,
-    )
+def deploy(replace: bool = False) -> None:
+    from deploy_all import deploy_contract
 
-    factory = CreditIssuanceRegistryFactory(
-        algorand,
-        default_sender=deployer.address,
-        default_signer=deployer.signer,
-    )
+    algorand = network.algorand()
+    deployer = network.deployer()
 
-    result, is_new = factory.deploy(
-        on_schema_break="replace",
-        on_update="update",
-        create_args={"args": ()},  # create_registry takes no args
+    record = deploy_contract(
+        algorand.client.algod, deployer.address, deployer.signer, "CreditIssuanceRegistry", replace=replace
     )
 
-    app_id = result.app_id
-    app_address = result.app_address
-
     logger.info(f"✅ CreditIssuanceRegistry deployed!")
-    logger.info(f"   App ID      : {app_id}")
-    logger.info(f"   App Address : {app_address}")
-    logger.info(f"   Explorer    : https://testnet.explorer.perawallet.app/application/{app_id}/")
-
-    # Fund the contract so it can do inner transactions
-    algorand.send.payment(
-        sender=deployer.address,
-        signer=deployer.signer,
-        receiver=app_address,
-        amount=AlgoAmount.from_algo(1),
-    )
-    logger.info("   Funded with 1 ALGO for inner transactions")
\ No newline at end of file
+    logger.info(f"   App ID      : {record.app_id}")
+    logger.info(f"   App Address : {record.app_address}")
+    logger.info(f"   Explorer    : https://testnet.explorer.perawallet.app/application/{record.app_id}/")
@@ -0,0 +1,155 @@
+"""
+Client-side driver for CarbonMarketplace.buy_credits().
+
+One basket call settles up to MAX_BASKET_SIZE listings, but a single app call
+can neither carry its references nor issue its inner transactions:
+
+- references: listing box, index page box, asset and seller account per
+  listing (plus the seller's proceeds box in pull-payment mode), against
+  MAX_TXN_REFERENCES per transaction;
+- inner transactions: one transfer per listing, one payment per seller (none
+  in pull-payment mode) and the ensure_budget() op-ups, against
+  MAX_INNER_TXNS_PER_CALL per app call.
+
+Both are pooled across the app calls of a group, so the driver adds readonly
+"carrier" calls (get_stats) until the basket fits: a full basket from 14
+distinct sellers in one index page needs 34 inner transactions and 43
+references, i.e. six app calls after the buyer's payment.
+"""
+
+import dataclasses
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from smart_contracts._helpers.avm import (
+    MAX_GROUP_SIZE,
+    MAX_INNER_TXNS_PER_CALL,
+    MIN_TXN_FEE,
+    References,
+    distribute_references,
+    opup_calls,
+)
+from smart_contracts.marketplace.listing import (
+    Listing,
+    index_box_name,
+    listing_box_name,
+    proceeds_box_name,
+)
+
+if TYPE_CHECKING:
+    from smart_contracts.artifacts.marketplace.carbon_marketplace_client import (
+        CarbonMarketplaceClient,
+    )
+
+# As in contract.py: buy_credits() accepts at most 14 listings and
+# ensure_budget() asks for FILL_OPCODE_COST per listing.
+MAX_BASKET_SIZE = 14
+FILL_OPCODE_COST = 250
+
+
+@dataclasses.dataclass(frozen=True)
+class BasketPlan:
+    """How one buy_credits() group is laid out."""
+
+    listings: list[Listing]
+    # [0] rides on buy_credits(), the rest on carrier calls
+    references: list[References]
+    inner_txns: int
+    # Fee ceiling of the buy_credits() call: itself plus its op-ups
+    max_fee: int
+
+    @property
+    def app_calls(self) -> int:
+        return len(self.references)
+
+    @property
+    def total(self) -> int:
+        """microAlgo the buyer pays: every listing bought out at its price."""
+        return sum(listing.price_microalgo * _units(listing) for listing in self.listings)
+
+
+def _units(listing: Listing) -> int:
+    """Units still in escrow, as the contract's _units_in_escrow()."""
+    return listing.co2_tonnes if listing.fungible else 1
+
+
+def plan_basket(listings: Sequence[Listing], pull_payments: bool = False) -> BasketPlan:
+    """
+    Lays out a basket: the references of every listing, the inner
+    transactions the call issues and how many app calls must pool them.
+    """
+    if not listings:
+        raise ValueError("Empty basket")
+    if len(listings) > MAX_BASKET_SIZE:
+        raise ValueError(f"A basket holds at most {MAX_BASKET_SIZE} listings, got {len(listings)}")
+    if len({listing.asset_id for listing in listings}) != len(listings):
+        raise ValueError("Duplicate asset ID in basket")
+
+    sellers = list(dict.fromkeys(listing.seller for listing in listings))
+    opups = opup_calls(len(listings) * FILL_OPCODE_COST)
+    inner_txns = len(listings) + (0 if pull_payments else len(sellers)) + opups
+
+    references = distribute_references(
+        boxes=[listing_box_name(listing.asset_id) for listing in listings]
+        + [index_box_name(listing.vintage_year, listing.project_type, listing.asset_id) for listing in listings]
+        + ([proceeds_box_name(seller) for seller in sellers] if pull_payments else []),
+        assets=[listing.asset_id for listing in listings],
+        accounts=[] if pull_payments else sellers,
+    )
+    # Empty carriers add nothing but their share of the inner-transaction pool.
+    pooled = -(-inner_txns // MAX_INNER_TXNS_PER_CALL)
+    references += [References() for _ in range(pooled - len(references))]
+    # The buyer's payment takes one slot of the group.
+    if 1 + len(references) > MAX_GROUP_SIZE:
+        raise ValueError(f"Basket needs {1 + len(references)} transactions, a group holds {MAX_GROUP_SIZE}")
+
+    return BasketPlan(
+        listings=list(listings),
+        references=references,
+        inner_txns=inner_txns,
+        max_fee=MIN_TXN_FEE * (1 + opups),
+    )
+
+
+def buy_basket(
+    client: "CarbonMarketplaceClient",
+    buyer: str,
+    listings: Sequence[Listing],
+    pull_payments: bool = False,
+) -> int:
+    """
+    Buys every listing in `listings` out from the `buyer` account (the
+    client's sender) in one group and returns the total paid in microAlgo.
+    """
+    from algokit_utils import AlgoAmount, CommonAppCallParams, PaymentParams, SendParams
+
+    plan = plan_basket(listings, pull_payments)
+    calls = plan.references
+
+    # buy_credits() checks the payment right before it in the group
+    composer = client.new_group()
+    composer.add_transaction(client.algorand.create_transaction.payment(PaymentParams(
+        sender=buyer,
+        receiver=client.app_address,
+        amount=AlgoAmount.from_micro_algo(plan.total),
+    )))
+    composer.buy_credits(
+        args=([listing.asset_id for listing in plan.listings],),
+        params=CommonAppCallParams(
+            box_references=calls[0].boxes,
+            asset_references=calls[0].assets,
+            account_references=calls[0].accounts,
+            max_fee=AlgoAmount.from_micro_algo(plan.max_fee),
+        ),
+    )
+    for index, carrier in enumerate(calls[1:], start=1):
+        composer.get_stats(
+            params=CommonAppCallParams(
+                box_references=carrier.boxes,
+                asset_references=carrier.assets,
+                account_references=carrier.accounts,
+                note=f"buy_credits-refs:{index}".encode(),
+            ),
+        )
+    result = composer.send(SendParams(cover_app_call_inner_transaction_fees=True))
+    return result.returns[0].value
@@ -1,10 +1,14 @@
+import typing
+
 from algopy import (
     ARC4Contract,
+    Application,
     Asset,
     GlobalState,
     LocalState,
     UInt64,
     Bytes,
+    String,
     Account,
     Txn,
     Global,
@@ -12,8 +16,184 @@ from algopy import (
     itxn,
     op,
     gtxn,
+    urange,
+    subroutine,
+    ensure_budget,
+    OpUpFeeSource,
 )
 
+from smart_contracts.credit_issuance.contract import CreditIssuanceRegistry
+
+
+# Approximate opcode cost of settling one listing in buy_credits().
+FILL_OPCODE_COST = 250
+# Approximate opcode cost of sweeping one expired listing.
+SWEEP_OPCODE_COST = 150
+
+# Listing status (low nibble of the listing flags)
+STATUS_CLOSED    = 0   # settled before statuses were recorded
+STATUS_ACTIVE    = 1
+STATUS_SOLD      = 2
+STATUS_CANCELLED = 3
+STATUS_EXPIRED   = 4
+
+# Listing flags
+FLAG_STATUS_MASK = 0x0F
+FLAG_FUNGIBLE    = 0x80   # one ASA unit per tonne, co2_tonnes = tonnes still for sale
+
+# Listing box layouts
+LISTING_VERSION      = 2
+LISTING_BYTES        = 94
+V1_LISTING_BYTES     = 60   # version 1: no project type, standard or metadata digest
+LEGACY_LISTING_BYTES = 96   # version 0: asset_id | seller | 7 x uint64
+MAX_UINT16           = 0xFFFF
+MAX_UINT32           = 0xFFFF_FFFF
+
+# Project type codes stored in listings (list_credit's project_type)
+PROJECT_TYPE_OTHER              = 0   # any name not listed below
+PROJECT_TYPE_REDD               = 1   # "REDD+"
+PROJECT_TYPE_REFORESTATION      = 2   # "Reforestation"
+PROJECT_TYPE_SOLAR              = 3   # "Solar"
+PROJECT_TYPE_WIND               = 4   # "Wind"
+PROJECT_TYPE_BIOGAS             = 5   # "Biogas"
+PROJECT_TYPE_METHANE_CAPTURE    = 6   # "Methane Capture"
+PROJECT_TYPE_OCEAN_CONSERVATION = 7   # "Ocean Conservation"
+PROJECT_TYPE_BLUE_CARBON        = 8   # "Blue Carbon"
+
+# Verification standard codes stored in listings (list_credit's verification_standard)
+STANDARD_OTHER         = 0   # any name not listed below
+STANDARD_VERRA         = 1   # "Verra", "VCS", "Verra VCS"
+STANDARD_GOLD_STANDARD = 2   # "Gold Standard", "GS"
+STANDARD_ACR           = 3   # "ACR"
+STANDARD_CAR           = 4   # "CAR"
+STANDARD_BEE_INDIA     = 5   # "BEE India"
+
+# get_listings() returns a single log entry: 4-byte prefix + 2-byte length + 103 bytes per view
+MAX_LISTINGS_PER_READ = 9
+
+# buy_credits() logs one CreditsBought event (68 bytes + 64 per fill, with the
+# 12-byte ABI return) and an app call may log at most 1024 bytes in total
+MAX_BASKET_SIZE = 14
+
+# What happens to a listing box once it is settled (sold out / cancelled)
+RECLAIM_KEEP      = 0   # rewrite the box with its final status
+RECLAIM_DELETE    = 1   # delete the box
+RECLAIM_TOMBSTONE = 2   # delete the box, keep a 9-byte tombstone
+
+# Tombstone: key = b"t" + asset_id(8), value = status(1) | closed_at(8)
+TOMBSTONE_PREFIX = b"t"
+TOMBSTONE_TTL    = 90 * 24 * 60 * 60   # prunable after 90 days
+
+# Pull payments: key = b"p" + seller(32), value = unclaimed proceeds(8)
+PROCEEDS_PREFIX = b"p"
+
+# Active-listing index: each (vintage year, project type) bucket is split into
+# pages of INDEX_PAGE_IDS consecutive asset IDs.
+# key = b"i" + vintage_year(2) + project_type(1) + page(8), page = asset_id // INDEX_PAGE_IDS,
+# value = asset IDs (8 bytes each) of the page's active listings, ascending.
+# A page holds at most 512 bytes, so it never fills up, one box reference
+# covers its I/O and get_active_listings() returns it in one log entry.
+INDEX_PREFIX   = b"i"
+INDEX_PAGE_IDS = 64
+
+
+# SHA-256 of a listing's IPFS metadata hash
+MetadataDigest = arc4.StaticArray[arc4.Byte, typing.Literal[32]]
+
+
+class Listing(arc4.Struct):
+    """
+    Listing box value, version 2 (94 bytes). The box key is the asset ID.
+
+    version(1) | flags(1) | vintage_year(2) | seller(32) | price(8) |
+    co2_tonnes(4) | min_qty(4) | listed_at(4) | expiry(4) |
+    project_type(1) | standard(1) | metadata_digest(32)
+
+    flags: status in the low nibble (STATUS_*), FLAG_FUNGIBLE in bit 7.
+    project_type and standard hold PROJECT_TYPE_* and STANDARD_* codes, so
+    listings can be filtered on box data alone.
+    Always decode through _read_listing(), which also accepts the version 1
+    (60-byte) and legacy (96-byte) layouts.
+    """
+    version:         arc4.UInt8
+    flags:           arc4.UInt8
+    vintage_year:    arc4.UInt16
+    seller:          arc4.Address
+    price:           arc4.UInt64
+    co2_tonnes:      arc4.UInt32
+    min_qty:         arc4.UInt32
+    listed_at:       arc4.UInt32
+    expiry:          arc4.UInt32
+    project_type:    arc4.UInt8
+    standard:        arc4.UInt8
+    metadata_digest: MetadataDigest
+
+
+class ListingView(arc4.Struct):
+    """
+    One get_listings() entry (103 bytes). found = False marks a missing listing,
+    with every other listing field zero. Settled listings whose box was
+    reclaimed are found with only the status in listing.flags set.
+    """
+    asset_id: arc4.UInt64
+    found:    arc4.Bool
+    listing:  Listing
+
+
+# ── ARC-28 events ─────────────────────────────────────────────
+# Prices and costs are in microAlgo; price is per tonne for fungible credits.
+
+class CreditListed(arc4.Struct):
+    """Emitted by list_credit()."""
+    asset_id:     arc4.UInt64
+    seller:       arc4.Address
+    price:        arc4.UInt64
+    co2_tonnes:   arc4.UInt64
+    min_qty:      arc4.UInt64
+    vintage_year: arc4.UInt64
+    expiry:       arc4.UInt64
+    fungible:     arc4.Bool
+
+
+class CreditSold(arc4.Struct):
+    """Emitted by buy_credit(). remaining: units of the listing still for sale."""
+    asset_id:     arc4.UInt64
+    seller:       arc4.Address
+    buyer:        arc4.Address
+    qty:          arc4.UInt64
+    price:        arc4.UInt64
+    cost:         arc4.UInt64
+    platform_fee: arc4.UInt64
+    expiry:       arc4.UInt64
+    remaining:    arc4.UInt64
+
+
+class BasketFill(arc4.Struct):
+    """One listing bought out by buy_credits()."""
+    asset_id: arc4.UInt64
+    seller:   arc4.Address
+    qty:      arc4.UInt64
+    cost:     arc4.UInt64
+    expiry:   arc4.UInt64
+
+
+class CreditsBought(arc4.Struct):
+    """
+    Emitted once by buy_credits(). platform_fee is what the basket accrued;
+    payouts are merged per seller, so it can exceed the per-fill fees by rounding.
+    """
+    buyer:        arc4.Address
+    total:        arc4.UInt64
+    platform_fee: arc4.UInt64
+    fills:        arc4.DynamicArray[BasketFill]
+
+
+class ListingCancelled(arc4.Struct):
+    """Emitted by cancel_listing(). qty: units returned to the seller."""
+    asset_id: arc4.UInt64
+    seller:   arc4.Address
+    qty:      arc4.UInt64
+
 
 class CarbonMarketplace(ARC4Contract):
     """
@@ -24,6 +204,13 @@ class CarbonMarketplace(ARC4Contract):
     - buy_credit() rejects expired credits on-chain
     - get_listing() returns expiry so frontend can show countdown
     - Expired listings can be cleaned up by anyone
+
+    Fungible credits (ASA total = co2_tonnes) are sold in partial lots:
+    the listing price is per tonne and one listing serves many buyers.
+
+    Active listings are indexed by (vintage year, project type) in paged
+    bucket boxes, so discovery reads only the listings that match
+    (get_active_listings).
     """
 
     def __init__(self) -> None:
@@ -31,6 +218,10 @@ class CarbonMarketplace(ARC4Contract):
         self.platform_fee_bps       = GlobalState(UInt64)
         self.total_volume_microalgo = GlobalState(UInt64)
         self.total_trades           = GlobalState(UInt64)
+        self.reclaim_mode           = GlobalState(UInt64)
+        self.registry_app           = GlobalState(UInt64)
+        self.accrued_fees           = GlobalState(UInt64)
+        self.pull_payments          = GlobalState(UInt64)
 
         # Business local state
         self.business_verified     = LocalState(UInt64)
@@ -44,12 +235,26 @@ class CarbonMarketplace(ARC4Contract):
     # ─────────────────────────────────────────
 
     @arc4.abimethod(allow_actions=["NoOp"], create="require")
-    def create_marketplace(self, fee_bps: arc4.UInt64) -> None:
-        """Deploy marketplace. fee_bps: 250 = 2.5%"""
+    def create_marketplace(self, fee_bps: arc4.UInt64, registry_app: arc4.UInt64) -> None:
+        """
+        Deploy marketplace. fee_bps: 250 = 2.5%
+        registry_app: CreditIssuanceRegistry app ID — source of credit expiry,
+        vintage and tonnes for every listing.
+        """
         self.admin.value                  = Txn.sender
         self.platform_fee_bps.value       = fee_bps.native
         self.total_volume_microalgo.value = UInt64(0)
         self.total_trades.value           = UInt64(0)
+        self.reclaim_mode.value           = UInt64(RECLAIM_KEEP)
+        self.registry_app.value           = registry_app.native
+        self.accrued_fees.value           = UInt64(0)
+        self.pull_payments.value          = UInt64(0)
+
+
+    @arc4.baremethod(allow_actions=["UpdateApplication"])
+    def update(self) -> None:
+        """Admin replaces the programs; the app ID, state and boxes are kept."""
+        assert Txn.sender == self.admin.value, "Admin only"
 
 
     # ─────────────────────────────────────────
@@ -83,6 +288,30 @@ class CarbonMarketplace(ARC4Contract):
         self.business_verified[business.native] = UInt64(2)
 
 
+    @arc4.abimethod
+    def set_reclaim_mode(self, mode: arc4.UInt64) -> None:
+        """
+        Admin chooses what happens to settled listing boxes.
+        0 = keep (final status rewritten), 1 = delete, 2 = delete + tombstone.
+        Deleting returns the box's minimum balance to the app account.
+        """
+        assert Txn.sender == self.admin.value,           "Admin only"
+        assert mode.native <= UInt64(RECLAIM_TOMBSTONE), "Unknown reclaim mode"
+        self.reclaim_mode.value = mode.native
+
+
+    @arc4.abimethod
+    def set_pull_payments(self, enabled: arc4.Bool) -> None:
+        """
+        Admin switches seller payouts between push and pull.
+        Push (default): every sale pays the seller with an inner payment.
+        Pull: sales credit the seller's proceeds box; sellers withdraw with
+        claim_proceeds(). Balances stay claimable after switching back.
+        """
+        assert Txn.sender == self.admin.value, "Admin only"
+        self.pull_payments.value = UInt64(1) if enabled.native else UInt64(0)
+
+
     # ─────────────────────────────────────────
     #  LIST CREDIT FOR SALE
     # ─────────────────────────────────────────
@@ -92,66 +321,106 @@ class CarbonMarketplace(ARC4Contract):
         self,
         asset_id:              arc4.UInt64,
         price_microalgo:       arc4.UInt64,
-        co2_tonnes:            arc4.UInt64,
-        vintage_year:          arc4.UInt64,
         project_type:          arc4.String,
         verification_standard: arc4.String,
         min_purchase_qty:      arc4.UInt64,
         ipfs_metadata_hash:    arc4.String,
-        expiry_timestamp:      arc4.UInt64,   # ← NEW: Unix expiry from issuance contract
     ) -> None:
         """
-        NGO lists a carbon credit NFT for sale.
+        NGO lists a carbon credit for sale.
+
+        Expiry, vintage year and tonnes are read from the issuance registry
+        (get_credit_terms) with an inner app call, so sellers cannot supply
+        their own and no read is needed before listing.
 
-        expiry_timestamp: pass in the value from get_credit_expiry()
-        Contract stores it so buy_credit() can enforce it on-chain.
+        NFT credits (ASA total = 1): price_microalgo is the price of the whole
+        credit and exactly 1 unit is escrowed.
+        Fungible credits (ASA total > 1): price_microalgo is the price per
+        tonne and every unit sent is escrowed and listed. The co2 field of the
+        box then tracks the tonnes still for sale.
 
         Call as atomic group:
-            [0] AssetTransfer — seller sends NFT to contract
+            [0] AssetTransfer — seller sends the credit to contract
             [1] AppCall       — this method
+                                (references the registry app and its
+                                 b"a" + asset_id box, and the listing's
+                                 index page)
 
-        Box layout (total 96 bytes):
-        asset_id(8) | seller(32) | price(8) | co2(8) |
-        vintage(8)  | min_qty(8) | timestamp(8) | expiry(8) | active(8)
+        The listing is stored as a Listing struct (94 bytes, see Listing).
+        project_type and verification_standard are stored as codes (names
+        outside the PROJECT_TYPE_* / STANDARD_* tables become OTHER) and
+        ipfs_metadata_hash as its SHA-256 digest.
+
+        The listing is added to its index page.
         """
         assert price_microalgo.native > UInt64(0),                    "Price must be > 0"
         assert min_purchase_qty.native > UInt64(0),                   "Min qty must be > 0"
-        assert min_purchase_qty.native <= co2_tonnes.native,          "Min qty exceeds total"
         assert Txn.group_index > UInt64(0),                           "Must be in atomic group"
 
-        # ── Check credit is not already expired ───────────────────
-        assert Global.latest_timestamp < expiry_timestamp.native, "Cannot list an expired credit"
+        existing, existing_found = _read_listing(asset_id.native)
+        if existing_found:
+            assert _status(existing) != UInt64(STATUS_ACTIVE),        "Already listed"
 
         # ── Verify NFT was sent to contract ───────────────────────
         prev = gtxn.AssetTransferTransaction(Txn.group_index - UInt64(1))
         assert prev.asset_receiver == Global.current_application_address, "NFT must go to contract"
         assert prev.xfer_asset.id  == asset_id.native,                    "Wrong asset ID"
-        assert prev.asset_amount   == UInt64(1),                          "Must send exactly 1"
         assert prev.sender         == Txn.sender,                         "Sender mismatch"
 
-        # Box layout:
-        # offset 0  — asset_id        8 bytes
-        # offset 8  — seller          32 bytes
-        # offset 40 — price           8 bytes
-        # offset 48 — co2_tonnes      8 bytes
-        # offset 56 — vintage_year    8 bytes
-        # offset 64 — min_purchase    8 bytes
-        # offset 72 — listed_at       8 bytes
-        # offset 80 — expiry          8 bytes  ← NEW
-        # offset 88 — active          8 bytes
-        # Total: 96 bytes
-        op.Box.put(
-            op.itob(asset_id.native),
-            op.itob(asset_id.native)          +   # 0:8
-            Txn.sender.bytes                  +   # 8:40
-            op.itob(price_microalgo.native)   +   # 40:48
-            op.itob(co2_tonnes.native)        +   # 48:56
-            op.itob(vintage_year.native)      +   # 56:64
-            op.itob(min_purchase_qty.native)  +   # 64:72
-            op.itob(Global.latest_timestamp)  +   # 72:80
-            op.itob(expiry_timestamp.native)  +   # 80:88  ← expiry
-            op.itob(UInt64(1)),                   # 88:96  active=1
+        # ── Read the credit's terms from the issuance registry ────
+        registry = Application(self.registry_app.value)
+        assert prev.xfer_asset.creator == registry.address,               "Not a registry credit"
+        terms, _call = arc4.abi_call(
+            CreditIssuanceRegistry.get_credit_terms,
+            asset_id,
+            app_id = registry,
+            fee    = Global.min_txn_fee,
         )
+        expiry       = terms.expiry.native
+        vintage_year = terms.vintage_year.native
+        co2_tonnes   = terms.co2_tonnes.native
+
+        flags = UInt64(STATUS_ACTIVE)
+        if prev.xfer_asset.total > UInt64(1):
+            co2_tonnes = prev.asset_amount
+            flags |= UInt64(FLAG_FUNGIBLE)
+        else:
+            assert prev.asset_amount == UInt64(1),                        "Must send exactly 1"
+
+        assert min_purchase_qty.native <= co2_tonnes,                 "Min qty exceeds total"
+        assert co2_tonnes <= UInt64(MAX_UINT32),                      "CO2 tonnes too large"
+        assert vintage_year <= UInt64(MAX_UINT16),                    "Invalid vintage year"
+        assert expiry <= UInt64(MAX_UINT32),                          "Invalid expiry"
+
+        # ── Check credit is not already expired ───────────────────
+        assert Global.latest_timestamp < expiry, "Cannot list an expired credit"
+
+        listing = Listing(
+            version         = arc4.UInt8(LISTING_VERSION),
+            flags           = arc4.UInt8(flags),
+            vintage_year    = arc4.UInt16(vintage_year),
+            seller          = arc4.Address(Txn.sender),
+            price           = price_microalgo,
+            co2_tonnes      = arc4.UInt32(co2_tonnes),
+            min_qty         = arc4.UInt32(min_purchase_qty.native),
+            listed_at       = arc4.UInt32(Global.latest_timestamp),
+            expiry          = arc4.UInt32(expiry),
+            project_type    = arc4.UInt8(_project_type_code(project_type.native)),
+            standard        = arc4.UInt8(_standard_code(verification_standard.native)),
+            metadata_digest = MetadataDigest.from_bytes(op.sha256(ipfs_metadata_hash.native.bytes)),
+        )
+        _write_listing(asset_id.native, listing)
+        _index_update(asset_id.native, listing.bytes, True)
+        arc4.emit(CreditListed(
+            asset_id     = asset_id,
+            seller       = arc4.Address(Txn.sender),
+            price        = price_microalgo,
+            co2_tonnes   = arc4.UInt64(co2_tonnes),
+            min_qty      = min_purchase_qty,
+            vintage_year = arc4.UInt64(vintage_year),
+            expiry       = arc4.UInt64(expiry),
+            fungible     = arc4.Bool(flags & UInt64(FLAG_FUNGIBLE) != UInt64(0)),
+        ))
 
 
     # ─────────────────────────────────────────
@@ -159,81 +428,279 @@ class CarbonMarketplace(ARC4Contract):
     # ─────────────────────────────────────────
 
     @arc4.abimethod
-    def buy_credit(self, asset_id: arc4.UInt64) -> None:
+    def buy_credit(self, asset_id: arc4.UInt64, qty: arc4.UInt64) -> None:
         """
         Verified business buys a listed carbon credit.
 
+        qty: units to buy. NFT listings sell whole, so qty must be 1.
+        Fungible listings sell qty tonnes at the per-tonne price; qty must be
+        at least min_purchase_qty unless it buys out the remaining tonnes.
+        The listing stays active until every tonne has been sold.
+
         ✅ Checks:
         - Buyer is a verified business
         - Listing is active
         - Credit has NOT expired (enforced on-chain by blockchain time)
-        - Payment matches listing price
+        - qty is within the listing's remaining quantity and minimum lot
+        - Payment matches qty * listing price
 
         Call as atomic group:
-            [0] Payment  — buyer pays exact price to contract
+            [0] Payment  — buyer pays qty * price to contract
             [1] AppCall  — this method
+                           (in pull-payment mode also the seller's b"p" box;
+                            the listing's index page when it sells out)
         """
         assert Txn.group_index > UInt64(0),                              "Must be in atomic group"
         assert self.business_verified[Txn.sender] == UInt64(1),          "Business not verified"
+        assert qty.native > UInt64(0),                                   "Qty must be > 0"
 
-        # Load listing
-        box_value, box_exists = op.Box.get(op.itob(asset_id.native))
-        assert box_exists, "Listing not found"
+        listing, cost = self._fill(asset_id.native, qty.native)
 
-        seller          = Account(op.extract(box_value, 8,  32))
-        price           = op.btoi(op.extract(box_value, 40, 8))
-        expiry          = op.btoi(op.extract(box_value, 80, 8))   # ← NEW
-        active          = op.btoi(op.extract(box_value, 88, 8))
+        # Verify payment
+        pay = gtxn.PaymentTransaction(Txn.group_index - UInt64(1))
+        assert pay.sender   == Txn.sender,                           "Payment sender mismatch"
+        assert pay.receiver == Global.current_application_address,   "Wrong receiver"
+        assert pay.amount   == cost,                                 "Wrong payment amount"
 
-        assert active == UInt64(1), "Listing is not active"
+        # Fee split — the platform fee stays in the contract until withdrawn
+        platform_fee  = (cost * self.platform_fee_bps.value) // UInt64(10000)
+        seller_payout = cost - platform_fee
+        self.accrued_fees.value = self.accrued_fees.value + platform_fee
+
+        # Pay seller
+        self._pay_seller(listing.seller.native, seller_payout)
+
+        arc4.emit(CreditSold(
+            asset_id     = asset_id,
+            seller       = listing.seller,
+            buyer        = arc4.Address(Txn.sender),
+            qty          = qty,
+            price        = listing.price,
+            cost         = arc4.UInt64(cost),
+            platform_fee = arc4.UInt64(platform_fee),
+            expiry       = arc4.UInt64(listing.expiry.native),
+            remaining    = arc4.UInt64(_units_in_escrow(listing) - qty.native),
+        ))
 
-        # ── EXPIRY CHECK (enforced on-chain) ──────────────────────
-        # Global.latest_timestamp = current block time (cannot be faked)
-        assert Global.latest_timestamp < expiry, "This carbon credit has expired and cannot be sold"
+
+    # ─────────────────────────────────────────
+    #  MULTI-LISTING CHECKOUT
+    # ─────────────────────────────────────────
+
+    @arc4.abimethod
+    def buy_credits(self, asset_ids: arc4.DynamicArray[arc4.UInt64]) -> arc4.UInt64:
+        """
+        Verified business buys a whole basket of listings in one app call.
+
+        Every listing is bought out completely (NFT: the credit, fungible:
+        all remaining tonnes) under the same checks as buy_credit(). If any
+        listing is inactive or expired the whole basket is rejected.
+
+        Payouts are merged per unique seller and the platform fee accrues in
+        the contract. A basket therefore fires one NFT transfer per listing
+        and one payment per seller (none in pull-payment mode).
+
+        Call as atomic group:
+            [0] Payment  — buyer pays the sum of all listing prices to contract
+            [1] AppCall  — this method
+
+        Every listing needs its box, asset, seller account and index page
+        available (its seller's proceeds box instead of the account in
+        pull-payment mode): up to 4 references per listing against 8 per
+        transaction.
+        The call issues one transfer per listing, one payment per seller and
+        up to 6 op-ups (ensure_budget, fee 0): 34 inner transactions for a
+        full basket from 14 sellers, against 16 per app call. Both limits
+        are pooled over the group, so large baskets add readonly carrier
+        calls, and this call's fee must cover its op-ups.
+        marketplace.basket plans the references, carriers and fee.
+        A basket holds at most MAX_BASKET_SIZE listings, so its CreditsBought
+        event fits the log limit.
+
+        Returns: total paid in microAlgo
+        """
+        assert Txn.group_index > UInt64(0),                              "Must be in atomic group"
+        assert self.business_verified[Txn.sender] == UInt64(1),          "Business not verified"
+        assert asset_ids.length > UInt64(0),                             "Empty basket"
+        assert asset_ids.length <= UInt64(MAX_BASKET_SIZE),              "Basket too large"
+
+        ensure_budget(asset_ids.length * UInt64(FILL_OPCODE_COST), OpUpFeeSource.GroupCredit)
+
+        sellers = arc4.DynamicArray[arc4.Address]()
+        amounts = arc4.DynamicArray[arc4.UInt64]()
+        fills   = arc4.DynamicArray[BasketFill]()
+        total   = UInt64(0)
+
+        for asset_id in asset_ids:
+            listing, cost = self._fill(asset_id.native, UInt64(0))
+            seller = listing.seller.native
+            total += cost
+            fills.append(BasketFill(
+                asset_id = asset_id,
+                seller   = listing.seller,
+                qty      = arc4.UInt64(_units_in_escrow(listing)),
+                cost     = arc4.UInt64(cost),
+                expiry   = arc4.UInt64(listing.expiry.native),
+            ))
+
+            # Merge into the seller's running amount
+            merged = False
+            for i in urange(sellers.length):
+                if sellers[i] == arc4.Address(seller):
+                    amounts[i] = arc4.UInt64(amounts[i].native + cost)
+                    merged = True
+                    break
+            if not merged:
+                sellers.append(arc4.Address(seller))
+                amounts.append(arc4.UInt64(cost))
 
         # Verify payment
         pay = gtxn.PaymentTransaction(Txn.group_index - UInt64(1))
         assert pay.sender   == Txn.sender,                           "Payment sender mismatch"
         assert pay.receiver == Global.current_application_address,   "Wrong receiver"
-        assert pay.amount   == price,                                "Wrong payment amount"
+        assert pay.amount   == total,                                "Wrong payment amount"
 
-        # Fee split
-        platform_fee  = (price * self.platform_fee_bps.value) // UInt64(10000)
-        seller_payout = price - platform_fee
+        # Pay each seller once; the platform keeps the rounding remainder.
+        paid_out = UInt64(0)
+        for i in urange(sellers.length):
+            gross  = amounts[i].native
+            payout = gross - (gross * self.platform_fee_bps.value) // UInt64(10000)
+            paid_out += payout
+            self._pay_seller(sellers[i].native, payout)
 
-        # Pay seller
-        itxn.Payment(
-            receiver = seller,
-            amount   = seller_payout,
-            fee      = Global.min_txn_fee,
-        ).submit()
+        # Accrue the platform fee once for the whole basket
+        self.accrued_fees.value = self.accrued_fees.value + (total - paid_out)
+
+        arc4.emit(CreditsBought(
+            buyer        = arc4.Address(Txn.sender),
+            total        = arc4.UInt64(total),
+            platform_fee = arc4.UInt64(total - paid_out),
+            fills        = fills.copy(),
+        ))
+        return arc4.UInt64(total)
 
-        # Pay platform fee
-        if platform_fee > UInt64(0):
-            itxn.Payment(
-                receiver = self.admin.value,
-                amount   = platform_fee,
-                fee      = Global.min_txn_fee,
-            ).submit()
 
-        # Transfer NFT to buyer
+    @subroutine
+    def _fill(self, asset_id: UInt64, qty: UInt64) -> tuple[Listing, UInt64]:
+        """
+        Sells qty units of a listing to Txn.sender and updates the listing box
+        and trade stats. qty = 0 buys everything still for sale.
+        Payment and payouts are left to the caller.
+
+        Returns: (listing as it was before the sale, cost in microAlgo)
+        """
+        # Load listing
+        listing, listing_found = _read_listing(asset_id)
+        assert listing_found, "Listing not found"
+
+        assert _status(listing) == UInt64(STATUS_ACTIVE), "Listing is not active"
+
+        # ── EXPIRY CHECK (enforced on-chain) ──────────────────────
+        # Global.latest_timestamp = current block time (cannot be faked)
+        assert Global.latest_timestamp < listing.expiry.native, "This carbon credit has expired and cannot be sold"
+
+        # ── QUANTITY CHECK ────────────────────────────────────────
+        available = _units_in_escrow(listing)
+        if qty == UInt64(0):
+            qty = available
+        assert qty <= available,                                      "Not enough credits left"
+        assert qty >= listing.min_qty.native or qty == available,     "Below minimum purchase qty"
+
+        cost = qty * listing.price.native
+        sold = listing.copy()
+
+        # Transfer credit to buyer
         itxn.AssetTransfer(
-            xfer_asset     = Asset(asset_id.native),
+            xfer_asset     = Asset(asset_id),
             asset_receiver = Txn.sender,
-            asset_amount   = 1,
+            asset_amount   = qty,
             fee            = Global.min_txn_fee,
         ).submit()
 
-        # Mark listing as sold (active = 0)
-        op.Box.put(
-            op.itob(asset_id.native),
-            op.extract(box_value, 0, 88) + op.itob(UInt64(0)),
-        )
+        # Fungible: decrement the tonnes still for sale.
+        # Close the listing as sold once nothing is left.
+        left = available - qty
+        if _is_fungible(listing):
+            listing.co2_tonnes = arc4.UInt32(left)
+        if left > UInt64(0):
+            _write_listing(asset_id, listing)
+        else:
+            self._close_listing(asset_id, listing, UInt64(STATUS_SOLD))
 
-        self.total_credits_bought[Txn.sender]     = self.total_credits_bought[Txn.sender] + UInt64(1)
-        self.total_volume_microalgo.value          = self.total_volume_microalgo.value + price
+        self.total_credits_bought[Txn.sender]     = self.total_credits_bought[Txn.sender] + qty
+        self.total_volume_microalgo.value          = self.total_volume_microalgo.value + cost
         self.total_trades.value                    = self.total_trades.value + UInt64(1)
 
+        return sold.copy(), cost
+
+
+    @subroutine
+    def _pay_seller(self, seller: Account, amount: UInt64) -> None:
+        """Pays a seller now, or credits their proceeds box in pull-payment mode."""
+        if self.pull_payments.value == UInt64(1):
+            key = _proceeds_key(seller)
+            balance, exists = op.Box.get(key)
+            owed = amount
+            if exists:
+                owed += op.btoi(balance)
+            op.Box.put(key, op.itob(owed))
+        else:
+            itxn.Payment(
+                receiver = seller,
+                amount   = amount,
+                fee      = Global.min_txn_fee,
+            ).submit()
+
+
+    # ─────────────────────────────────────────
+    #  SELLER PROCEEDS (pull payments)
+    # ─────────────────────────────────────────
+
+    @arc4.abimethod
+    def claim_proceeds(self) -> arc4.UInt64:
+        """
+        Seller withdraws all accumulated proceeds in one payment.
+        The proceeds box is deleted, returning its minimum balance to the app.
+
+        Returns: amount paid in microAlgo
+        """
+        key = _proceeds_key(Txn.sender)
+        balance, exists = op.Box.get(key)
+        assert exists, "No proceeds"
+
+        amount = op.btoi(balance)
+        op.Box.delete(key)
+
+        itxn.Payment(
+            receiver = Txn.sender,
+            amount   = amount,
+            fee      = Global.min_txn_fee,
+        ).submit()
+        return arc4.UInt64(amount)
+
+
+    # ─────────────────────────────────────────
+    #  PLATFORM FEES
+    # ─────────────────────────────────────────
+
+    @arc4.abimethod
+    def withdraw_fees(self, amount: arc4.UInt64) -> None:
+        """
+        Admin withdraws accrued platform fees in a single payment.
+        Trades only add to accrued_fees; nothing is paid out per trade.
+        """
+        assert Txn.sender == self.admin.value,              "Admin only"
+        assert amount.native > UInt64(0),                   "Amount must be > 0"
+        assert amount.native <= self.accrued_fees.value,    "Exceeds accrued fees"
+
+        self.accrued_fees.value = self.accrued_fees.value - amount.native
+
+        itxn.Payment(
+            receiver = self.admin.value,
+            amount   = amount.native,
+            fee      = Global.min_txn_fee,
+        ).submit()
+
 
     # ─────────────────────────────────────────
     #  CANCEL LISTING
@@ -241,27 +708,204 @@ class CarbonMarketplace(ARC4Contract):
 
     @arc4.abimethod
     def cancel_listing(self, asset_id: arc4.UInt64) -> None:
-        """Seller cancels listing and gets NFT back."""
-        box_value, box_exists = op.Box.get(op.itob(asset_id.native))
-        assert box_exists, "Listing not found"
+        """
+        Seller cancels listing and gets the escrowed credit back.
+        References the listing box and its index page.
+        """
+        listing, listing_found = _read_listing(asset_id.native)
+        assert listing_found, "Listing not found"
 
-        seller = Account(op.extract(box_value, 8,  32))
-        active = op.btoi(op.extract(box_value, 88, 8))
+        seller = listing.seller.native
 
-        assert Txn.sender == seller, "Only seller can cancel"
-        assert active == UInt64(1),  "Listing not active"
+        assert Txn.sender == seller,                          "Only seller can cancel"
+        assert _status(listing) == UInt64(STATUS_ACTIVE),     "Listing not active"
 
+        qty = _units_in_escrow(listing)
         itxn.AssetTransfer(
             xfer_asset     = Asset(asset_id.native),
             asset_receiver = seller,
-            asset_amount   = 1,
+            asset_amount   = qty,
             fee            = Global.min_txn_fee,
         ).submit()
 
-        op.Box.put(
-            op.itob(asset_id.native),
-            op.extract(box_value, 0, 88) + op.itob(UInt64(0)),
-        )
+        self._close_listing(asset_id.native, listing, UInt64(STATUS_CANCELLED))
+        arc4.emit(ListingCancelled(asset_id=asset_id, seller=listing.seller, qty=arc4.UInt64(qty)))
+
+
+    # ─────────────────────────────────────────
+    #  SWEEP EXPIRED LISTINGS
+    # ─────────────────────────────────────────
+
+    @arc4.abimethod
+    def sweep_expired(self, asset_ids: arc4.DynamicArray[arc4.UInt64]) -> arc4.UInt64:
+        """
+        Anyone can clean up expired listings.
+
+        For every active listing whose expiry has passed, the escrowed credit
+        goes back to the seller and the listing box is deleted, releasing its
+        minimum-balance requirement. Entries that are missing, inactive or not
+        yet expired are skipped, so a stale candidate list never fails the call.
+
+        Each entry needs its listing box, asset, seller account and index
+        page available.
+
+        Returns: number of listings swept
+        """
+        ensure_budget(asset_ids.length * UInt64(SWEEP_OPCODE_COST), OpUpFeeSource.GroupCredit)
+
+        swept = UInt64(0)
+        for asset_id in asset_ids:
+            listing, listing_found = _read_listing(asset_id.native)
+            if not listing_found:
+                continue
+            if _status(listing) != UInt64(STATUS_ACTIVE):
+                continue
+            if Global.latest_timestamp < listing.expiry.native:
+                continue
+
+            itxn.AssetTransfer(
+                xfer_asset     = Asset(asset_id.native),
+                asset_receiver = listing.seller.native,
+                asset_amount   = _units_in_escrow(listing),
+                fee            = Global.min_txn_fee,
+            ).submit()
+
+            _index_update(asset_id.native, listing.bytes, False)
+            key = op.itob(asset_id.native)
+            op.Box.delete(key)
+            if self.reclaim_mode.value == UInt64(RECLAIM_TOMBSTONE):
+                _put_tombstone(key, UInt64(STATUS_EXPIRED))
+            swept += UInt64(1)
+
+        return arc4.UInt64(swept)
+
+
+    # ─────────────────────────────────────────
+    #  STORAGE RECLAIM
+    # ─────────────────────────────────────────
+
+    @arc4.abimethod
+    def compact_listings(self, asset_ids: arc4.DynamicArray[arc4.UInt64]) -> arc4.UInt64:
+        """
+        Admin migration: applies the current reclaim mode to listings that
+        were settled before it was enabled. Active and missing listings are
+        skipped. Each entry needs its listing box and tombstone box available.
+
+        Returns: number of listing boxes deleted
+        """
+        assert Txn.sender == self.admin.value,                          "Admin only"
+        assert self.reclaim_mode.value != UInt64(RECLAIM_KEEP),         "Reclaim mode is keep"
+
+        compacted = UInt64(0)
+        for asset_id in asset_ids:
+            listing, listing_found = _read_listing(asset_id.native)
+            if not listing_found:
+                continue
+
+            status = _status(listing)
+            if status == UInt64(STATUS_ACTIVE):
+                continue
+
+            key = op.itob(asset_id.native)
+            op.Box.delete(key)
+            if self.reclaim_mode.value == UInt64(RECLAIM_TOMBSTONE):
+                _put_tombstone(key, status)
+            compacted += UInt64(1)
+
+        return arc4.UInt64(compacted)
+
+
+    @arc4.abimethod
+    def prune_tombstones(self, asset_ids: arc4.DynamicArray[arc4.UInt64]) -> arc4.UInt64:
+        """
+        Anyone can delete tombstones older than TOMBSTONE_TTL.
+        Younger or missing tombstones are skipped.
+
+        Returns: number of tombstones deleted
+        """
+        pruned = UInt64(0)
+        for asset_id in asset_ids:
+            key = TOMBSTONE_PREFIX + op.itob(asset_id.native)
+            tombstone, exists = op.Box.get(key)
+            if not exists:
+                continue
+
+            closed_at = op.btoi(op.extract(tombstone, 1, 8))
+            if Global.latest_timestamp < closed_at + UInt64(TOMBSTONE_TTL):
+                continue
+
+            op.Box.delete(key)
+            pruned += UInt64(1)
+
+        return arc4.UInt64(pruned)
+
+
+    @arc4.abimethod
+    def migrate_listings(self, asset_ids: arc4.DynamicArray[arc4.UInt64]) -> arc4.UInt64:
+        """
+        Admin migration: rewrites version 1 (60-byte) and legacy (96-byte)
+        listing boxes in the current layout. Missing and already-migrated
+        listings are skipped. Active legacy listings also need their asset
+        available (to detect fungible credits). Migrated listings keep project
+        type and standard OTHER: the older layouts never stored them.
+
+        Listings are migrated lazily on their next write as well.
+
+        Returns: number of listings migrated
+        """
+        assert Txn.sender == self.admin.value, "Admin only"
+
+        migrated = UInt64(0)
+        for asset_id in asset_ids:
+            length, exists = op.Box.length(op.itob(asset_id.native))
+            if not exists or length == UInt64(LISTING_BYTES):
+                continue
+
+            listing, listing_found = _read_listing(asset_id.native)
+            _write_listing(asset_id.native, listing)
+            migrated += UInt64(1)
+
+        return arc4.UInt64(migrated)
+
+
+    @arc4.abimethod
+    def index_listings(self, asset_ids: arc4.DynamicArray[arc4.UInt64]) -> arc4.UInt64:
+        """
+        Anyone can add active listings that were created before the index
+        existed to their (vintage year, project type) index page. Missing,
+        inactive and already indexed listings are skipped. Each entry needs
+        its listing box and index page available; run migrate_listings()
+        first so older layouts keep the page they were indexed under.
+
+        Returns: number of listings indexed
+        """
+        indexed = UInt64(0)
+        for asset_id in asset_ids:
+            listing, listing_found = _read_listing(asset_id.native)
+            if not listing_found:
+                continue
+            if _status(listing) != UInt64(STATUS_ACTIVE):
+                continue
+            if _index_update(asset_id.native, listing.bytes, True):
+                indexed += UInt64(1)
+
+        return arc4.UInt64(indexed)
+
+
+    @subroutine
+    def _close_listing(self, asset_id: UInt64, listing: Listing, status: UInt64) -> None:
+        """Settles a listing according to the reclaim mode and drops it from the index."""
+        _index_update(asset_id, listing.bytes, False)
+        mode = self.reclaim_mode.value
+        if mode == UInt64(RECLAIM_KEEP):
+            closed = listing.copy()
+            closed.flags = _flags_with_status(listing.flags, status)
+            _write_listing(asset_id, closed)
+        else:
+            key = op.itob(asset_id)
+            op.Box.delete(key)
+            if mode == UInt64(RECLAIM_TOMBSTONE):
+                _put_tombstone(key, status)
 
 
     # ─────────────────────────────────────────
@@ -272,38 +916,111 @@ class CarbonMarketplace(ARC4Contract):
     def get_listing(
         self,
         asset_id: arc4.UInt64,
-    ) -> tuple[arc4.Address, arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.UInt64]:
+    ) -> tuple[
+        arc4.Address, arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.UInt64,
+        arc4.UInt8, arc4.UInt8, MetadataDigest,
+    ]:
         """
         Get full listing details.
-        Returns: (seller, price_microalgo, co2_tonnes, min_purchase_qty, expiry_timestamp, active)
+        Returns: (seller, price_microalgo, co2_tonnes, min_purchase_qty, expiry_timestamp, status,
+                  project_type, verification_standard, metadata_digest)
+        status: 0 = closed, 1 = active, 2 = sold, 3 = cancelled, 4 = expired
+        project_type / verification_standard: PROJECT_TYPE_* / STANDARD_* codes
+        metadata_digest: SHA-256 of the ipfs_metadata_hash the credit was listed with
+
+        Settled listings whose box was reclaimed answer from their tombstone:
+        only the status is known, every other field is zero.
+
+        Fungible listings: price_microalgo is per tonne and co2_tonnes is the
+        quantity still for sale.
 
         Frontend: use expiry_timestamp to show countdown timer
         If current time > expiry_timestamp → show EXPIRED badge
         """
-        box_value, box_exists = op.Box.get(op.itob(asset_id.native))
-        assert box_exists, "Listing not found"
+        listing, listing_found = _lookup_listing(asset_id.native)
+        assert listing_found, "Listing not found"
 
         return (
-            arc4.Address(op.extract(box_value, 8,  32)),
-            arc4.UInt64(op.btoi(op.extract(box_value, 40, 8))),
-            arc4.UInt64(op.btoi(op.extract(box_value, 48, 8))),
-            arc4.UInt64(op.btoi(op.extract(box_value, 64, 8))),
-            arc4.UInt64(op.btoi(op.extract(box_value, 80, 8))),
-            arc4.UInt64(op.btoi(op.extract(box_value, 88, 8))),
+            listing.seller,
+            listing.price,
+            arc4.UInt64(listing.co2_tonnes.native),
+            arc4.UInt64(listing.min_qty.native),
+            arc4.UInt64(listing.expiry.native),
+            arc4.UInt64(_status(listing)),
+            listing.project_type,
+            listing.standard,
+            listing.metadata_digest.copy(),
         )
 
 
+    @arc4.abimethod(readonly=True)
+    def get_listings(
+        self,
+        asset_ids: arc4.DynamicArray[arc4.UInt64],
+    ) -> arc4.DynamicArray[ListingView]:
+        """
+        Bulk read of up to MAX_LISTINGS_PER_READ listings in one call.
+        Missing listings come back with found = False instead of failing.
+
+        Each entry needs its listing box available (and its tombstone box for
+        reclaimed listings); marketplace.reader builds the references and
+        spreads large pages over the calls of one simulate request.
+        """
+        assert asset_ids.length <= UInt64(MAX_LISTINGS_PER_READ), "Too many listings"
+
+        views = arc4.DynamicArray[ListingView]()
+        for asset_id in asset_ids:
+            listing, listing_found = _lookup_listing(asset_id.native)
+            views.append(ListingView(
+                asset_id = asset_id,
+                found    = arc4.Bool(listing_found),
+                listing  = listing.copy(),
+            ))
+        return views
+
+
+    @arc4.abimethod(readonly=True)
+    def get_active_listings(
+        self,
+        vintage_year: arc4.UInt16,
+        project_type: arc4.UInt8,
+        page:         arc4.UInt64,
+    ) -> arc4.DynamicArray[arc4.UInt64]:
+        """
+        Active listings of one (vintage_year, project_type) bucket whose asset
+        IDs fall in one page (asset_id // INDEX_PAGE_IDS). Only the page box
+        is read, so the cost follows the number of matching listings, not
+        every listing the app has stored. marketplace.reader finds a bucket's
+        pages from the app's box names.
+
+        Returns: asset IDs of the page, ascending (empty if it has none)
+
+        Expired listings stay in their page until sweep_expired() removes
+        them; filter on price and expiry with get_listings().
+        """
+        ids = op.Box.get(_index_key(vintage_year, project_type) + op.itob(page.native))[0]
+        return arc4.DynamicArray[arc4.UInt64].from_bytes(op.extract(op.itob(ids.length // UInt64(8)), 6, 2) + ids)
+
+
     @arc4.abimethod(readonly=True)
     def is_listing_expired(self, asset_id: arc4.UInt64) -> arc4.Bool:
         """
         Check if a listing has expired.
         Returns True if expired, False if still valid.
         """
-        box_value, box_exists = op.Box.get(op.itob(asset_id.native))
-        assert box_exists, "Listing not found"
+        listing, listing_found = _read_listing(asset_id.native)
+        assert listing_found, "Listing not found"
+
+        return arc4.Bool(Global.latest_timestamp > listing.expiry.native)
 
-        expiry = op.btoi(op.extract(box_value, 80, 8))
-        return arc4.Bool(Global.latest_timestamp > expiry)
+
+    @arc4.abimethod(readonly=True)
+    def get_proceeds(self, seller: arc4.Address) -> arc4.UInt64:
+        """Returns a seller's unclaimed proceeds in microAlgo (pull-payment mode)."""
+        balance, exists = op.Box.get(_proceeds_key(seller.native))
+        if not exists:
+            return arc4.UInt64(0)
+        return arc4.UInt64(op.btoi(balance))
 
 
     @arc4.abimethod(readonly=True)
@@ -319,9 +1036,215 @@ class CarbonMarketplace(ARC4Contract):
 
 
     @arc4.abimethod(readonly=True)
-    def get_stats(self) -> tuple[arc4.UInt64, arc4.UInt64]:
-        """Returns (total_volume_algo, total_trades)."""
+    def get_stats(self) -> tuple[arc4.UInt64, arc4.UInt64, arc4.UInt64, arc4.UInt64]:
+        """Returns (total_volume_algo, total_trades, total_volume_microalgo, accrued_fees)."""
         return (
             arc4.UInt64(self.total_volume_microalgo.value // UInt64(1_000_000)),
             arc4.UInt64(self.total_trades.value),
-        )
\ No newline at end of file
+            arc4.UInt64(self.total_volume_microalgo.value),
+            arc4.UInt64(self.accrued_fees.value),
+        )
+
+
+@subroutine
+def _read_listing(asset_id: UInt64) -> tuple[Listing, bool]:
+    """
+    The one decoder for listing boxes. Returns (listing, exists).
+
+    Version 1 and legacy 96-byte boxes are normalised to the current layout,
+    with project type and standard OTHER and a zero metadata digest; for
+    active legacy listings the fungible flag is recovered from the ASA total.
+    """
+    box_value, box_exists = op.Box.get(op.itob(asset_id))
+    if not box_exists:
+        return Listing.from_bytes(op.bzero(LISTING_BYTES)), False
+
+    if box_value.length == UInt64(V1_LISTING_BYTES):
+        listing = Listing.from_bytes(box_value + op.bzero(LISTING_BYTES - V1_LISTING_BYTES))
+        listing.version = arc4.UInt8(LISTING_VERSION)
+        return listing.copy(), True
+
+    if box_value.length == UInt64(LEGACY_LISTING_BYTES):
+        # asset_id(8) | seller(32) | price(8) | co2(8) | vintage(8) |
+        # min_qty(8)  | listed_at(8) | expiry(8) | status(8)
+        flags = op.btoi(op.extract(box_value, 88, 8))
+        if flags == UInt64(STATUS_ACTIVE) and Asset(asset_id).total > UInt64(1):
+            flags |= UInt64(FLAG_FUNGIBLE)
+        return Listing(
+            version         = arc4.UInt8(LISTING_VERSION),
+            flags           = arc4.UInt8(flags),
+            vintage_year    = arc4.UInt16(op.btoi(op.extract(box_value, 56, 8))),
+            seller          = arc4.Address(op.extract(box_value, 8, 32)),
+            price           = arc4.UInt64(op.btoi(op.extract(box_value, 40, 8))),
+            co2_tonnes      = arc4.UInt32(op.btoi(op.extract(box_value, 48, 8))),
+            min_qty         = arc4.UInt32(op.btoi(op.extract(box_value, 64, 8))),
+            listed_at       = arc4.UInt32(op.btoi(op.extract(box_value, 72, 8))),
+            expiry          = arc4.UInt32(op.btoi(op.extract(box_value, 80, 8))),
+            project_type    = arc4.UInt8(PROJECT_TYPE_OTHER),
+            standard        = arc4.UInt8(STANDARD_OTHER),
+            metadata_digest = MetadataDigest.from_bytes(op.bzero(32)),
+        ), True
+
+    return Listing.from_bytes(box_value), True
+
+
+@subroutine
+def _lookup_listing(asset_id: UInt64) -> tuple[Listing, bool]:
+    """
+    Like _read_listing(), but settled listings whose box was reclaimed are
+    answered from their tombstone: only the status in flags is set.
+    """
+    listing, listing_found = _read_listing(asset_id)
+    if listing_found:
+        return listing.copy(), True
+
+    tombstone, tombstone_exists = op.Box.get(TOMBSTONE_PREFIX + op.itob(asset_id))
+    if tombstone_exists:
+        listing.flags = arc4.UInt8.from_bytes(op.extract(tombstone, 0, 1))
+    return listing.copy(), tombstone_exists
+
+
+@subroutine
+def _write_listing(asset_id: UInt64, listing: Listing) -> None:
+    """Stores a listing in the current layout, replacing an older-sized box."""
+    key = op.itob(asset_id)
+    length, exists = op.Box.length(key)
+    if exists and length != UInt64(LISTING_BYTES):
+        op.Box.delete(key)
+    op.Box.put(key, listing.bytes)
+
+
+@subroutine
+def _index_key(vintage_year: arc4.UInt16, project_type: arc4.UInt8) -> Bytes:
+    return Bytes(INDEX_PREFIX) + vintage_year.bytes + project_type.bytes
+
+
+@subroutine
+def _index_update(asset_id: UInt64, listing: Bytes, add: bool) -> bool:
+    """
+    Adds a listing to (add) or removes it from its index page, keeping the
+    asset IDs sorted. The page is read once and searched in memory.
+    Returns False if the page was left unchanged: the listing was already
+    in it (add) or was not in it (remove).
+
+    listing is the encoded Listing: unlike a struct argument, Bytes is not
+    copied back to the caller, which keeps the program within its pages.
+    """
+    fields = Listing.from_bytes(listing)
+    key = _index_key(fields.vintage_year, fields.project_type) + op.itob(asset_id // UInt64(INDEX_PAGE_IDS))
+    page = op.Box.get(key)[0]
+
+    # Binary search over entry offsets: the first asset ID >= asset_id
+    offset = UInt64(0)
+    end = page.length
+    while offset < end:
+        middle = (offset + end) // UInt64(16) * UInt64(8)
+        if op.extract_uint64(page, middle) < asset_id:
+            offset = middle + UInt64(8)
+        else:
+            end = middle
+    if offset < page.length and op.extract_uint64(page, offset) == asset_id:
+        if add:
+            return False
+        if page.length == UInt64(8):
+            op.Box.delete(key)
+        else:
+            op.Box.splice(key, offset, UInt64(8), Bytes())
+            op.Box.resize(key, page.length - UInt64(8))
+    else:
+        if not add:
+            return False
+        if page:   # empty pages are deleted, so this one exists
+            op.Box.resize(key, page.length + UInt64(8))
+            op.Box.splice(key, offset, UInt64(0), op.itob(asset_id))
+        else:
+            op.Box.put(key, op.itob(asset_id))
+    return True
+
+
+@subroutine
+def _project_type_code(name: String) -> UInt64:
+    match name:
+        case "REDD+":
+            return UInt64(PROJECT_TYPE_REDD)
+        case "Reforestation":
+            return UInt64(PROJECT_TYPE_REFORESTATION)
+        case "Solar":
+            return UInt64(PROJECT_TYPE_SOLAR)
+        case "Wind":
+            return UInt64(PROJECT_TYPE_WIND)
+        case "Biogas":
+            return UInt64(PROJECT_TYPE_BIOGAS)
+        case "Methane Capture":
+            return UInt64(PROJECT_TYPE_METHANE_CAPTURE)
+        case "Ocean Conservation":
+            return UInt64(PROJECT_TYPE_OCEAN_CONSERVATION)
+        case "Blue Carbon":
+            return UInt64(PROJECT_TYPE_BLUE_CARBON)
+        case _:
+            return UInt64(PROJECT_TYPE_OTHER)
+
+
+@subroutine
+def _standard_code(name: String) -> UInt64:
+    match name:
+        case "Verra":
+            return UInt64(STANDARD_VERRA)
+        case "VCS":
+            return UInt64(STANDARD_VERRA)
+        case "Verra VCS":
+            return UInt64(STANDARD_VERRA)
+        case "Gold Standard":
+            return UInt64(STANDARD_GOLD_STANDARD)
+        case "GS":
+            return UInt64(STANDARD_GOLD_STANDARD)
+        case "ACR":
+            return UInt64(STANDARD_ACR)
+        case "CAR":
+            return UInt64(STANDARD_CAR)
+        case "BEE India":
+            return UInt64(STANDARD_BEE_INDIA)
+        case _:
+            return UInt64(STANDARD_OTHER)
+
+
+@subroutine
+def _status(listing: Listing) -> UInt64:
+    return listing.flags.native & UInt64(FLAG_STATUS_MASK)
+
+
+@subroutine
+def _is_fungible(listing: Listing) -> bool:
+    return (listing.flags.native & UInt64(FLAG_FUNGIBLE)) != UInt64(0)
+
+
+@subroutine
+def _flags_with_status(flags: arc4.UInt8, status: UInt64) -> arc4.UInt8:
+    # Always fits a byte, so skip the overflow check of arc4.UInt8(...)
+    value = (flags.native & UInt64(FLAG_FUNGIBLE)) | status
+    return arc4.UInt8.from_bytes(op.extract(op.itob(value), 7, 1))
+
+
+@subroutine
+def _units_in_escrow(listing: Listing) -> UInt64:
+    """
+    ASA units the contract holds for a listing.
+    NFT credits escrow a single unit; fungible credits one unit per remaining tonne.
+    """
+    if _is_fungible(listing):
+        return listing.co2_tonnes.native
+    return UInt64(1)
+
+
+@subroutine
+def _put_tombstone(key: Bytes, status: UInt64) -> None:
+    """Records how a reclaimed listing ended: status(1) | closed_at(8)."""
+    op.Box.put(
+        TOMBSTONE_PREFIX + key,
+        op.extract(op.itob(status), 7, 1) + op.itob(Global.latest_timestamp),
+    )
+
+
+@subroutine
+def _proceeds_key(seller: Account) -> Bytes:
+    return Bytes(PROCEEDS_PREFIX) + seller.bytes
@@ -1,49 +1,25 @@
 import logging
-from algokit_utils import (
-    AlgorandClient,
-    AlgoAmount,
-)
-
-logger = logging.getLogger(__name__)
 
+from smart_contracts._helpers import network
 
-def deploy() -> None:
-    algorand = AlgorandClient.testnet()
-    deployer = algorand.account.from_environment("DEPLOYER")
+logger = logging.getLogger(__name__)
 
-    from smart_contracts.artifacts.marketplace.carbon_marketplace_client import (
-        CarbonMarketplaceFactory,
-    )
 
-    factory = CarbonMarketplaceFactory(
-        algorand,
-        default_sender=deployer.address,
-        default_signer=deployer.signer,
-    )
+def deploy(replace: bool = False) -> None:
+    from deploy_all import deploy_contract
 
-    # 2.5% platform fee (250 basis points)
-    PLATFORM_FEE_BPS = 250
+    algorand = network.algorand()
+    deployer = network.deployer()
 
-    result, is_new = factory.deploy(
-        on_schema_break="replace",
-        on_update="update",
-        create_args={"args": (PLATFORM_FEE_BPS,)},
+    # Listings read credit terms from the issuance registry: its app ID comes
+    # from the manifest, so deploy it first.
+    record = deploy_contract(
+        algorand.client.algod, deployer.address, deployer.signer, "CarbonMarketplace", replace=replace
     )
 
-    app_id = result.app_id
-    app_address = result.app_address
-
     logger.info(f"✅ CarbonMarketplace deployed!")
-    logger.info(f"   App ID      : {app_id}")
-    logger.info(f"   App Address : {app_address}")
-    logger.info(f"   Fee         : {PLATFORM_FEE_BPS} bps (2.5%)")
-    logger.info(f"   Explorer    : https://testnet.explorer.perawallet.app/application/{app_id}/")
-
-    # Fund the contract for inner transactions
-    algorand.send.payment(
-        sender=deployer.address,
-        signer=deployer.signer,
-        receiver=app_address,
-        amount=AlgoAmount.from_algo(2),  # marketplace needs more for swaps
-    )
-    logger.info("   Funded with 2 ALGO for inner transactions")
\ No newline at end of file
+    logger.info(f"   App ID      : {record.app_id}")
+    logger.info(f"   App Address : {record.app_address}")
+    logger.info(f"   Fee         : {record.create_args[0]} bps")
+    logger.info(f"   Registry    : {record.create_args[1]}")
+    logger.info(f"   Explorer    : https://testnet.explorer.perawallet.app/application/{record.app_id}/")
@@ -0,0 +1,271 @@
+"""
+Off-chain view of CarbonMarketplace listing boxes.
+
+Box key = asset_id (8 bytes, big-endian)
+
+Version 2 (94 bytes) — the contract's Listing struct:
+    version(1) | flags(1) | vintage_year(2) | seller(32) | price(8) |
+    co2_tonnes(4) | min_qty(4) | listed_at(4) | expiry(4) |
+    project_type(1) | standard(1) | metadata_digest(32)
+    flags: status in the low nibble, FLAG_FUNGIBLE in bit 7
+    project_type / standard: PROJECT_TYPES / STANDARDS codes
+    metadata_digest: SHA-256 of the listing's IPFS metadata hash
+
+Version 1 (60 bytes): version 2 without its last three fields.
+
+Legacy version 0 (96 bytes):
+    asset_id(8) | seller(32) | price(8) | co2(8) | vintage(8) |
+    min_qty(8)  | listed_at(8) | expiry(8) | status(8)
+
+Tombstone key   = b"t" + asset_id(8)
+Tombstone value = status(1) | closed_at(8)
+
+Proceeds key    = b"p" + seller(32)   (pull-payment mode)
+Proceeds value  = unclaimed microAlgo(8)
+
+Index key       = b"i" + vintage_year(2) + project_type(1) + page(8),
+                  page = asset_id // INDEX_PAGE_IDS
+Index value     = asset_id(8) of each active listing in the page, ascending
+
+get_listings() view (103 bytes) = asset_id(8) | found(1) | version 2 listing(94)
+get_active_listings() page      = asset_ids (ARC-4 uint64[])
+"""
+
+import dataclasses
+import hashlib
+import struct
+
+from algosdk.encoding import decode_address, encode_address
+
+LISTING_VERSION = 2
+LISTING_BOX_BYTES = 94
+V1_LISTING_BOX_BYTES = 60
+LEGACY_LISTING_BOX_BYTES = 96
+LISTING_KEY_BYTES = 8
+LISTING_VIEW_BYTES = 8 + 1 + LISTING_BOX_BYTES
+TOMBSTONE_PREFIX = b"t"
+PROCEEDS_PREFIX = b"p"
+INDEX_PREFIX = b"i"
+INDEX_PAGE_IDS = 64
+INDEX_KEY_BYTES = 12
+
+STATUS_CLOSED = 0
+STATUS_ACTIVE = 1
+STATUS_SOLD = 2
+STATUS_CANCELLED = 3
+STATUS_EXPIRED = 4
+
+FLAG_STATUS_MASK = 0x0F
+FLAG_FUNGIBLE = 0x80
+
+# Code → name, as the contract encodes list_credit's project_type and
+# verification_standard. Code 0 is any other name; older layouts always store 0.
+PROJECT_TYPES = {
+    0: "Other",
+    1: "REDD+",
+    2: "Reforestation",
+    3: "Solar",
+    4: "Wind",
+    5: "Biogas",
+    6: "Methane Capture",
+    7: "Ocean Conservation",
+    8: "Blue Carbon",
+}
+STANDARDS = {
+    0: "Other",
+    1: "Verra",
+    2: "Gold Standard",
+    3: "ACR",
+    4: "CAR",
+    5: "BEE India",
+}
+_STANDARD_ALIASES = {"VCS": 1, "Verra VCS": 1, "GS": 2}
+
+_V2 = struct.Struct(">BBH32sQIIIIBB32s")
+_V1 = struct.Struct(">BBH32sQIIII")
+_LEGACY = struct.Struct(">Q32sQQQQQQQ")
+
+
+@dataclasses.dataclass(frozen=True)
+class Listing:
+    asset_id: int
+    version: int
+    seller: str
+    price_microalgo: int
+    co2_tonnes: int
+    vintage_year: int
+    min_purchase_qty: int
+    listed_at: int
+    expiry_timestamp: int
+    status: int
+    # None for legacy listings: only the ASA total tells them apart.
+    fungible: bool | None
+    project_type: int = 0
+    standard: int = 0
+    # All zero for listings stored before version 2
+    metadata_digest: bytes = bytes(32)
+
+    @property
+    def active(self) -> bool:
+        return self.status == STATUS_ACTIVE
+
+    def is_expired(self, now: int) -> bool:
+        """Mirrors the contract: a listing can no longer be sold once now >= expiry."""
+        return now >= self.expiry_timestamp
+
+
+def project_type_code(name: str) -> int:
+    """The code list_credit() stores for a project type name."""
+    return next((code for code, known in PROJECT_TYPES.items() if code and known == name), 0)
+
+
+def standard_code(name: str) -> int:
+    """The code list_credit() stores for a verification standard name."""
+    if name in _STANDARD_ALIASES:
+        return _STANDARD_ALIASES[name]
+    return next((code for code, known in STANDARDS.items() if code and known == name), 0)
+
+
+def metadata_digest(ipfs_metadata_hash: str) -> bytes:
+    """The digest list_credit() stores for an IPFS metadata hash."""
+    return hashlib.sha256(ipfs_metadata_hash.encode()).digest()
+
+
+def listing_box_name(asset_id: int) -> bytes:
+    return asset_id.to_bytes(LISTING_KEY_BYTES, "big")
+
+
+def is_listing_box(name: bytes) -> bool:
+    return len(name) == LISTING_KEY_BYTES
+
+
+def decode_listing(name: bytes, value: bytes) -> Listing:
+    asset_id = int.from_bytes(name, "big")
+    if len(value) == LISTING_BOX_BYTES:
+        (
+            version, flags, vintage, seller, price, co2, min_qty, listed_at, expiry,
+            project_type, standard, digest,
+        ) = _V2.unpack(value)
+        return Listing(
+            asset_id=asset_id,
+            version=version,
+            seller=encode_address(seller),
+            price_microalgo=price,
+            co2_tonnes=co2,
+            vintage_year=vintage,
+            min_purchase_qty=min_qty,
+            listed_at=listed_at,
+            expiry_timestamp=expiry,
+            status=flags & FLAG_STATUS_MASK,
+            fungible=bool(flags & FLAG_FUNGIBLE),
+            project_type=project_type,
+            standard=standard,
+            metadata_digest=digest,
+        )
+    if len(value) == V1_LISTING_BOX_BYTES:
+        version, flags, vintage, seller, price, co2, min_qty, listed_at, expiry = _V1.unpack(value)
+        return Listing(
+            asset_id=asset_id,
+            version=version,
+            seller=encode_address(seller),
+            price_microalgo=price,
+            co2_tonnes=co2,
+            vintage_year=vintage,
+            min_purchase_qty=min_qty,
+            listed_at=listed_at,
+            expiry_timestamp=expiry,
+            status=flags & FLAG_STATUS_MASK,
+            fungible=bool(flags & FLAG_FUNGIBLE),
+        )
+    if len(value) == LEGACY_LISTING_BOX_BYTES:
+        _, seller, price, co2, vintage, min_qty, listed_at, expiry, status = _LEGACY.unpack(value)
+        return Listing(
+            asset_id=asset_id,
+            version=0,
+            seller=encode_address(seller),
+            price_microalgo=price,
+            co2_tonnes=co2,
+            vintage_year=vintage,
+            min_purchase_qty=min_qty,
+            listed_at=listed_at,
+            expiry_timestamp=expiry,
+            status=status,
+            fungible=None,
+        )
+    raise ValueError(f"Unknown listing box size: {len(value)} bytes")
+
+
+def decode_listing_views(raw: bytes) -> dict[int, Listing | None]:
+    """
+    Decodes a get_listings() return value (ARC-4 array of ListingView).
+    Missing listings map to None; reclaimed ones carry only their status.
+    """
+    count = int.from_bytes(raw[:2], "big")
+    body = raw[2:]
+    if len(body) != count * LISTING_VIEW_BYTES:
+        raise ValueError(f"Expected {count} listing views, got {len(body)} bytes")
+
+    views: dict[int, Listing | None] = {}
+    for start in range(0, len(body), LISTING_VIEW_BYTES):
+        view = body[start : start + LISTING_VIEW_BYTES]
+        name, found, value = view[:8], view[8] & 0x80, view[9:]
+        views[int.from_bytes(name, "big")] = decode_listing(name, value) if found else None
+    return views
+
+
+@dataclasses.dataclass(frozen=True)
+class Tombstone:
+    asset_id: int
+    status: int
+    closed_at: int
+
+
+def tombstone_box_name(asset_id: int) -> bytes:
+    return TOMBSTONE_PREFIX + listing_box_name(asset_id)
+
+
+def is_tombstone_box(name: bytes) -> bool:
+    return len(name) == len(TOMBSTONE_PREFIX) + LISTING_KEY_BYTES and name.startswith(TOMBSTONE_PREFIX)
+
+
+def decode_tombstone(name: bytes, value: bytes) -> Tombstone:
+    return Tombstone(
+        asset_id=int.from_bytes(name[len(TOMBSTONE_PREFIX) :], "big"),
+        status=value[0],
+        closed_at=int.from_bytes(value[1:9], "big"),
+    )
+
+
+def proceeds_box_name(seller: str) -> bytes:
+    """Box a sale credits in pull-payment mode; reference it in buy calls."""
+    return PROCEEDS_PREFIX + decode_address(seller)
+
+
+def index_bucket_prefix(vintage_year: int, project_type: int) -> bytes:
+    """Name prefix shared by the index pages of one vintage year and project type code."""
+    return INDEX_PREFIX + vintage_year.to_bytes(2, "big") + bytes([project_type])
+
+
+def index_box_name(vintage_year: int, project_type: int, asset_id: int) -> bytes:
+    """Index page that holds `asset_id` while its listing is active."""
+    return index_bucket_prefix(vintage_year, project_type) + (asset_id // INDEX_PAGE_IDS).to_bytes(8, "big")
+
+
+def is_index_box(name: bytes, vintage_year: int, project_type: int) -> bool:
+    return len(name) == INDEX_KEY_BYTES and name.startswith(index_bucket_prefix(vintage_year, project_type))
+
+
+def decode_index(value: bytes) -> list[int]:
+    """Asset IDs held by an index page box, ascending."""
+    if len(value) % LISTING_KEY_BYTES:
+        raise ValueError(f"Index page of {len(value)} bytes is not a whole number of asset IDs")
+    return [int.from_bytes(value[start : start + 8], "big") for start in range(0, len(value), 8)]
+
+
+def decode_index_page(raw: bytes) -> list[int]:
+    """Decodes a get_active_listings() return value: the page's asset IDs."""
+    length = int.from_bytes(raw[:2], "big")
+    asset_ids = decode_index(raw[2:])
+    if len(asset_ids) != length:
+        raise ValueError(f"Expected {length} asset IDs, got {len(asset_ids)}")
+    return asset_ids
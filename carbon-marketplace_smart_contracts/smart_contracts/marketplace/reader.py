@@ -0,0 +1,88 @@
+"""
+Bulk listing reads for CarbonMarketplace.get_listings() and the listing
+index.
+
+A marketplace page is fetched with one simulate request instead of one call
+per listing: asset IDs are split into get_listings() calls of at most
+LISTINGS_PER_CALL (one box reference each), and up to MAX_GROUP_SIZE calls are
+simulated together. A page of 128 listings costs a single round-trip.
+
+Discovery starts from the listing index: get_active_listings_in() reads the
+index pages of one (vintage year, project type) bucket, so e.g. "active 2023
+reforestation credits under 5 Algo" reads the matching listings only:
+
+    ids = get_active_listings_in(client, 2023, project_type_code("Reforestation"))
+    cheap = [listing for listing in get_listings(client, ids).values()
+             if listing and listing.price_microalgo < 5_000_000]
+"""
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from smart_contracts._helpers.avm import MAX_GROUP_SIZE, MAX_TXN_REFERENCES, chunked
+from smart_contracts.marketplace.listing import (
+    Listing,
+    decode_index,
+    decode_listing_views,
+    is_index_box,
+    listing_box_name,
+)
+
+if TYPE_CHECKING:
+    from smart_contracts.artifacts.marketplace.carbon_marketplace_client import (
+        CarbonMarketplaceClient,
+    )
+
+# Bounded by box references per transaction; the contract allows up to 9.
+LISTINGS_PER_CALL = MAX_TXN_REFERENCES
+
+
+def get_listings(
+    client: "CarbonMarketplaceClient",
+    asset_ids: Sequence[int],
+) -> dict[int, Listing | None]:
+    """
+    Returns every requested listing keyed by asset ID; None when not found.
+
+    Listing boxes are referenced explicitly. Tombstones and the assets of
+    active legacy listings are only read on demand, so the simulation allows
+    unnamed resources for them.
+    """
+    from algokit_utils import CommonAppCallParams
+
+    listings: dict[int, Listing | None] = {}
+    unique_ids = list(dict.fromkeys(asset_ids))
+    for page in chunked(unique_ids, LISTINGS_PER_CALL * MAX_GROUP_SIZE):
+        composer = client.new_group()
+        for index, call_ids in enumerate(chunked(page, LISTINGS_PER_CALL)):
+            composer.get_listings(
+                args=(call_ids,),
+                params=CommonAppCallParams(
+                    box_references=[listing_box_name(asset_id) for asset_id in call_ids],
+                    note=f"get_listings:{index}".encode(),
+                ),
+            )
+        result = composer.simulate(allow_unnamed_resources=True, skip_signatures=True)
+        for abi_return in result.returns:
+            listings.update(decode_listing_views(abi_return.raw_value))
+    return listings
+
+
+def get_active_listings_in(
+    client: "CarbonMarketplaceClient",
+    vintage_year: int,
+    project_type: int,
+) -> list[int]:
+    """
+    Asset IDs of the active listings in one (vintage year, project type)
+    bucket, ascending. The bucket's pages are found among the app's box
+    names (page numbers sort with their big-endian names) and read in one
+    request. Expired listings stay listed until they are swept.
+    """
+    boxes = client.algorand.app
+    names = sorted(
+        box.name_raw
+        for box in boxes.get_box_names(client.app_id)
+        if is_index_box(box.name_raw, vintage_year, project_type)
+    )
+    return [asset_id for value in boxes.get_box_values(client.app_id, names) for asset_id in decode_index(value)]
@@ -0,0 +1,243 @@
+"""
+Box-storage maintenance for CarbonMarketplace.
+
+- sweep():   expired active listings  → sweep_expired()     (anyone)
+- compact(): settled listing boxes    → compact_listings()  (admin)
+- migrate(): older-layout listings    → migrate_listings()  (admin)
+
+Candidates are found by scanning the app's listing boxes, then submitted in
+the largest groups the pooled reference and inner-transaction limits allow:
+one maintenance call per group, with its references spread over readonly
+carrier calls. Run it periodically so box count and the app account's locked
+minimum balance track live listings, not history.
+
+    python -m smart_contracts.marketplace.sweeper <app_id> [--compact] [--migrate]
+"""
+
+import logging
+import sys
+import time
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING
+
+from smart_contracts._helpers.avm import (
+    MAX_GROUP_SIZE,
+    MAX_INNER_TXNS_PER_GROUP,
+    MAX_TXN_ACCOUNT_REFERENCES,
+    MAX_TXN_REFERENCES,
+    MIN_TXN_FEE,
+    References,
+    distribute_references,
+    pack,
+)
+from smart_contracts.marketplace.listing import (
+    LISTING_VERSION,
+    Listing,
+    decode_listing,
+    index_box_name,
+    is_listing_box,
+    listing_box_name,
+    tombstone_box_name,
+)
+
+if TYPE_CHECKING:
+    from algokit_utils import AlgorandClient
+
+    from smart_contracts.artifacts.marketplace.carbon_marketplace_client import (
+        CarbonMarketplaceClient,
+    )
+
+logger = logging.getLogger(__name__)
+
+# Inner-transaction headroom kept free for ensure_budget() op-up calls.
+OPUP_HEADROOM = 32
+
+# Group-wide pooled limits: (references, account references, inner transactions)
+_GROUP_CAPACITY = (
+    MAX_GROUP_SIZE * MAX_TXN_REFERENCES,
+    MAX_GROUP_SIZE * MAX_TXN_ACCOUNT_REFERENCES,
+    MAX_INNER_TXNS_PER_GROUP - OPUP_HEADROOM,
+)
+
+
+def fetch_listings(algorand: "AlgorandClient", app_id: int) -> list[Listing]:
+    """Reads and decodes every listing box the app holds."""
+    names = [box.name_raw for box in algorand.app.get_box_names(app_id) if is_listing_box(box.name_raw)]
+    values = algorand.app.get_box_values(app_id, names)
+    return [decode_listing(name, value) for name, value in zip(names, values)]
+
+
+def find_expired_listings(
+    algorand: "AlgorandClient",
+    app_id: int,
+    now: int | None = None,
+) -> list[Listing]:
+    """Returns every active listing whose expiry has passed."""
+    now = int(time.time()) if now is None else now
+    return [
+        listing
+        for listing in fetch_listings(algorand, app_id)
+        if listing.active and listing.is_expired(now)
+    ]
+
+
+def find_settled_listings(algorand: "AlgorandClient", app_id: int) -> list[Listing]:
+    """Returns every listing box that is no longer active."""
+    return [listing for listing in fetch_listings(algorand, app_id) if not listing.active]
+
+
+def find_legacy_listings(algorand: "AlgorandClient", app_id: int) -> list[Listing]:
+    """
+    Returns every listing stored in a layout older than LISTING_VERSION:
+    version 1 (60 bytes) and legacy (96 bytes, version 0).
+    """
+    return [listing for listing in fetch_listings(algorand, app_id) if listing.version < LISTING_VERSION]
+
+
+def plan_sweep_groups(listings: Sequence[Listing]) -> list[list[Listing]]:
+    """
+    Packs candidates into the fewest groups of one sweep_expired() call each.
+
+    Per listing: listing box + index page + asset + seller account references
+    and one inner transfer. Listings sharing a page share its reference.
+    """
+    return pack(listings, cost=lambda _: (4, 1, 1), capacity=_GROUP_CAPACITY)
+
+
+def sweep(client: "CarbonMarketplaceClient", listings: Sequence[Listing]) -> int:
+    """Sweeps the given listings and returns how many the contract cleaned up."""
+    return _send_in_groups(
+        client,
+        "sweep_expired",
+        plan_sweep_groups(listings),
+        lambda batch: distribute_references(
+            boxes=[listing_box_name(listing.asset_id) for listing in batch]
+            + [index_box_name(listing.vintage_year, listing.project_type, listing.asset_id) for listing in batch],
+            assets=[listing.asset_id for listing in batch],
+            accounts=[listing.seller for listing in batch],
+        ),
+        cover_inner_fees=True,
+    )
+
+
+def compact(client: "CarbonMarketplaceClient", listings: Sequence[Listing]) -> int:
+    """
+    Runs the compact_listings() migration over settled listings.
+    Per listing: listing box + tombstone box references, no inner transactions.
+    """
+    return _send_in_groups(
+        client,
+        "compact_listings",
+        pack(listings, cost=lambda _: (2, 0, 0), capacity=_GROUP_CAPACITY),
+        lambda batch: distribute_references(
+            boxes=[listing_box_name(listing.asset_id) for listing in batch]
+            + [tombstone_box_name(listing.asset_id) for listing in batch],
+        ),
+    )
+
+
+def migrate(client: "CarbonMarketplaceClient", listings: Sequence[Listing]) -> int:
+    """
+    Runs the migrate_listings() migration over older-layout listings.
+    Per listing: listing box, plus the asset for active legacy ones, whose
+    fungible flag is recovered from the ASA total (version 1 stores it).
+    Each old box read (at most 96 bytes) and rewrite fits one reference's I/O budget.
+    """
+    return _send_in_groups(
+        client,
+        "migrate_listings",
+        pack(listings, cost=lambda listing: (1 + _needs_asset(listing), 0, 0), capacity=_GROUP_CAPACITY),
+        lambda batch: distribute_references(
+            boxes=[listing_box_name(listing.asset_id) for listing in batch],
+            assets=[listing.asset_id for listing in batch if _needs_asset(listing)],
+        ),
+    )
+
+
+def _needs_asset(listing: Listing) -> bool:
+    return listing.active and listing.fungible is None
+
+
+def _send_in_groups(
+    client: "CarbonMarketplaceClient",
+    method: str,
+    groups: list[list[Listing]],
+    references: Callable[[list[Listing]], list[References]],
+    cover_inner_fees: bool = False,
+) -> int:
+    """Submits one `method(asset_ids)` call per group and sums the returned counts."""
+    from algokit_utils import AlgoAmount, CommonAppCallParams, SendParams
+
+    total = 0
+    for batch in groups:
+        calls = references(batch)
+
+        composer = client.new_group()
+        getattr(composer, method)(
+            args=([listing.asset_id for listing in batch],),
+            params=CommonAppCallParams(
+                box_references=calls[0].boxes,
+                asset_references=calls[0].assets,
+                account_references=calls[0].accounts,
+                max_fee=AlgoAmount.from_micro_algo(MIN_TXN_FEE * (1 + len(batch))),
+            ),
+        )
+        for index, carrier in enumerate(calls[1:], start=1):
+            composer.get_stats(
+                params=CommonAppCallParams(
+                    box_references=carrier.boxes,
+                    asset_references=carrier.assets,
+                    account_references=carrier.accounts,
+                    note=f"{method}-refs:{index}".encode(),
+                ),
+            )
+        result = composer.send(SendParams(cover_app_call_inner_transaction_fees=cover_inner_fees))
+        done = result.returns[0].value
+        total += done
+        logger.info(f"{method}: {done}/{len(batch)} listings")
+    return total
+
+
+def main(app_id: int, compact_settled: bool = False, migrate_legacy: bool = False) -> None:
+    from algokit_utils import AlgorandClient
+    from dotenv import load_dotenv
+
+    from smart_contracts.artifacts.marketplace.carbon_marketplace_client import (
+        CarbonMarketplaceClient,
+    )
+
+    load_dotenv()
+    algorand = AlgorandClient.from_environment()
+    operator = algorand.account.from_environment("DEPLOYER")
+    client = CarbonMarketplaceClient(
+        algorand=algorand,
+        app_id=app_id,
+        default_sender=operator.address,
+        default_signer=operator.signer,
+    )
+
+    candidates = find_expired_listings(algorand, app_id)
+    logger.info(f"Found {len(candidates)} expired listings")
+    if candidates:
+        logger.info(f"Swept {sweep(client, candidates)} listings in total")
+
+    if compact_settled:
+        settled = find_settled_listings(algorand, app_id)
+        logger.info(f"Found {len(settled)} settled listing boxes")
+        if settled:
+            logger.info(f"Compacted {compact(client, settled)} listings in total")
+
+    if migrate_legacy:
+        legacy = find_legacy_listings(algorand, app_id)
+        logger.info(f"Found {len(legacy)} listing boxes in an older layout")
+        if legacy:
+            logger.info(f"Migrated {migrate(client, legacy)} listings in total")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)-10s: %(message)s")
+    main(
+        int(sys.argv[1]),
+        compact_settled="--compact" in sys.argv[2:],
+        migrate_legacy="--migrate" in sys.argv[2:],
+    )
@@ -0,0 +1,176 @@
+"""
+Client-side driver for RetirementRegistry.retire_credits().
+
+Box and asset references, inner transactions and opcode budget are all pooled
+across the app calls of a group. The driver therefore packs as many credits as
+the group-wide limits allow into one retire_credits() call and spreads that
+call's references over "carrier" calls (cheap readonly calls to the same app)
+in the same group. A year-end run of thousands of credits needs
+ceil(n / credits-per-group) groups instead of one group per credit.
+
+Every call also appends to the company's ledger: its totals box plus the one
+or two 64-entry pages the batch lands on.
+"""
+
+import dataclasses
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from algosdk.encoding import decode_address
+
+from smart_contracts._helpers.avm import (
+    ABI_SELECTOR_BYTES,
+    MAX_APP_ARGS_BYTES,
+    MAX_GROUP_SIZE,
+    MAX_INNER_TXNS_PER_GROUP,
+    MAX_LOG_BYTES,
+    MAX_TXN_REFERENCES,
+    MIN_TXN_FEE,
+    abi_string_size,
+    distribute_references,
+    pack,
+)
+
+if TYPE_CHECKING:
+    from smart_contracts.artifacts.retirement.retirement_registry_client import (
+        RetirementRegistryClient,
+    )
+
+# Per credit: retirement box + ASA reference, clawback + destroy inner txns.
+REFS_PER_CREDIT = 2
+INNER_TXNS_PER_CREDIT = 2
+ENCODED_CREDIT_BYTES = 16   # RetireItem: asset_id(8) | co2_tonnes(8)
+
+# Logs per call: the CreditsRetired event carries every RetireItem.
+# selector(4) | company(32) | retired_at(8) | total_tonnes(8) | offset(2) | length(2)
+EVENT_HEAD_BYTES = 56
+ABI_RETURN_LOG_BYTES = 4 + 8
+
+# Per call: company totals box + at most two ledger pages (a batch never
+# exceeds one page, so it spans at most one page boundary).
+LEDGER_PAGE_SIZE = 64
+LEDGER_REFS_PER_CALL = 3
+
+# Inner-transaction headroom kept free for ensure_budget() op-up calls.
+OPUP_HEADROOM = 32
+
+
+@dataclasses.dataclass(frozen=True)
+class RetireItem:
+    """Off-chain mirror of the contract's RetireItem struct."""
+
+    asset_id: int
+    co2_tonnes: int
+
+    def as_tuple(self) -> tuple[int, int]:
+        return (self.asset_id, self.co2_tonnes)
+
+
+def retirement_box_name(asset_id: int) -> bytes:
+    """Retirement records are keyed by the 8-byte big-endian asset ID."""
+    return asset_id.to_bytes(8, "big")
+
+
+def company_totals_box_name(company: str) -> bytes:
+    return b"c" + decode_address(company)
+
+
+def ledger_page_box_name(company: str, page: int) -> bytes:
+    return b"p" + decode_address(company) + page.to_bytes(8, "big")
+
+
+def ledger_box_names(company: str, start: int, count: int) -> list[bytes]:
+    """Ledger boxes written when `count` retirements are appended after `start` existing ones."""
+    first_page = start // LEDGER_PAGE_SIZE
+    last_page = (start + count - 1) // LEDGER_PAGE_SIZE
+    return [company_totals_box_name(company)] + [
+        ledger_page_box_name(company, page) for page in range(first_page, last_page + 1)
+    ]
+
+
+def plan_retirement_groups(
+    credits: Sequence[RetireItem],
+    company_name: str,
+    ipfs_certificate: str,
+) -> list[list[RetireItem]]:
+    """
+    Packs a retirement list into the fewest groups, one retire_credits() call each.
+
+    A group is bounded by its pooled references (MAX_GROUP_SIZE calls x
+    MAX_TXN_REFERENCES), its pooled inner transactions, and the argument
+    size of the single retire_credits() call and its log output. Each group
+    reserves LEDGER_REFS_PER_CALL references for the company ledger.
+    """
+    if len({item.asset_id for item in credits}) != len(credits):
+        raise ValueError("Duplicate asset ID in retirement list")
+
+    arg_overhead = (
+        ABI_SELECTOR_BYTES
+        + 2  # credits array length
+        + abi_string_size(company_name)
+        + abi_string_size(ipfs_certificate)
+    )
+    return pack(
+        credits,
+        cost=lambda _: (
+            REFS_PER_CREDIT,
+            ENCODED_CREDIT_BYTES,
+            INNER_TXNS_PER_CREDIT,
+            ENCODED_CREDIT_BYTES,
+        ),
+        capacity=(
+            MAX_GROUP_SIZE * MAX_TXN_REFERENCES,
+            MAX_APP_ARGS_BYTES,
+            MAX_INNER_TXNS_PER_GROUP - OPUP_HEADROOM,
+            MAX_LOG_BYTES,
+        ),
+        overhead=(LEDGER_REFS_PER_CALL, arg_overhead, 0, EVENT_HEAD_BYTES + ABI_RETURN_LOG_BYTES),
+    )
+
+
+def retire_in_groups(
+    client: "RetirementRegistryClient",
+    company: str,
+    company_name: str,
+    ipfs_certificate: str,
+    credits: Sequence[RetireItem],
+) -> list[int]:
+    """
+    Retires every credit in `credits` from the `company` account (the
+    client's sender) and returns one certificate reference (retirement
+    timestamp) per submitted group.
+    """
+    from algokit_utils import AlgoAmount, CommonAppCallParams, SendParams
+
+    _tonnes, ledger_count = client.send.get_company_totals(args=(company,)).abi_return
+
+    references: list[int] = []
+    for batch in plan_retirement_groups(credits, company_name, ipfs_certificate):
+        calls = distribute_references(
+            boxes=[retirement_box_name(item.asset_id) for item in batch]
+            + ledger_box_names(company, ledger_count, len(batch)),
+            assets=[item.asset_id for item in batch],
+        )
+
+        composer = client.new_group()
+        composer.retire_credits(
+            args=([item.as_tuple() for item in batch], company_name, ipfs_certificate),
+            params=CommonAppCallParams(
+                box_references=calls[0].boxes,
+                asset_references=calls[0].assets,
+                # Pays for ensure_budget() op-ups beyond the carriers' pooled budget.
+                max_fee=AlgoAmount.from_micro_algo(MIN_TXN_FEE * (1 + len(batch))),
+            ),
+        )
+        for index, carrier in enumerate(calls[1:], start=1):
+            composer.get_global_stats(
+                params=CommonAppCallParams(
+                    box_references=carrier.boxes,
+                    asset_references=carrier.assets,
+                    note=f"retire-refs:{index}".encode(),
+                ),
+            )
+        result = composer.send(SendParams(cover_app_call_inner_transaction_fees=True))
+        references.append(result.returns[0].value)
+        ledger_count += len(batch)
+    return references
@@ -2,16 +2,58 @@ from algopy import (
     ARC4Contract,
     Asset,
     GlobalState,
+    Bytes,
     UInt64,
     Account,
     Txn,
     Global,
+    OpUpFeeSource,
     arc4,
+    ensure_budget,
     itxn,
     op,
+    subroutine,
+    urange,
 )
 
 
+# Approximate opcode cost of retiring one credit (clawback + destroy + box write).
+RETIRE_OPCODE_COST = 150
+
+# Per-company ledger
+# Totals box key = b"c" + company(32)             value = tonnes(8) | count(8)
+# Page box key   = b"p" + company(32) + page(8)    value = up to 64 asset IDs (8 each)
+COMPANY_TOTALS_PREFIX = b"c"
+COMPANY_PAGE_PREFIX   = b"p"
+LEDGER_PAGE_SIZE      = 64
+LEDGER_PAGE_BYTES     = LEDGER_PAGE_SIZE * 8
+
+
+class RetireItem(arc4.Struct):
+    """One credit in a batch retirement."""
+    asset_id:   arc4.UInt64
+    co2_tonnes: arc4.UInt64
+
+
+class CreditRetired(arc4.Struct):
+    """ARC-28 event, emitted by retire_credit()."""
+    asset_id:   arc4.UInt64
+    company:    arc4.Address
+    co2_tonnes: arc4.UInt64
+    retired_at: arc4.UInt64
+
+
+class CreditsRetired(arc4.Struct):
+    """
+    ARC-28 event, emitted once by retire_credits() for the whole batch
+    (a per-credit event would overrun the 1 KB log limit of large batches).
+    """
+    company:      arc4.Address
+    retired_at:   arc4.UInt64
+    total_tonnes: arc4.UInt64
+    credits:      arc4.DynamicArray[RetireItem]
+
+
 class RetirementRegistry(ARC4Contract):
     """
     Contract 3 — Retirement Registry
@@ -34,6 +76,12 @@ class RetirementRegistry(ARC4Contract):
         self.total_retirements.value    = UInt64(0)
 
 
+    @arc4.baremethod(allow_actions=["UpdateApplication"])
+    def update(self) -> None:
+        """Admin replaces the programs; the app ID, state and boxes are kept."""
+        assert Txn.sender == self.admin.value, "Admin only"
+
+
     @arc4.abimethod
     def retire_credit(
         self,
@@ -52,47 +100,136 @@ class RetirementRegistry(ARC4Contract):
 
         Returns: retirement timestamp (use as certificate reference ID)
         """
-        assert co2_tonnes.native > UInt64(0), "Invalid tonnes"
+        retirement_time = Global.latest_timestamp
+
+        self._retire(asset_id.native, co2_tonnes.native, retirement_time)
+
+        # Append to the company's ledger
+        company_tonnes, company_count = _company_totals(Txn.sender)
+        _append_to_ledger(Txn.sender, company_count, asset_id.native)
+        _put_company_totals(
+            Txn.sender,
+            company_tonnes + co2_tonnes.native,
+            company_count + UInt64(1),
+        )
+
+        # Update global stats
+        self.total_tonnes_retired.value = (
+            self.total_tonnes_retired.value + co2_tonnes.native
+        )
+        self.total_retirements.value = self.total_retirements.value + UInt64(1)
+
+        arc4.emit(CreditRetired(
+            asset_id   = asset_id,
+            company    = arc4.Address(Txn.sender),
+            co2_tonnes = co2_tonnes,
+            retired_at = arc4.UInt64(retirement_time),
+        ))
+        return arc4.UInt64(retirement_time)
+
+
+    @arc4.abimethod
+    def retire_credits(
+        self,
+        credits:          arc4.DynamicArray[RetireItem],
+        company_name:     arc4.String,
+        ipfs_certificate: arc4.String,
+    ) -> arc4.UInt64:
+        """
+        Permanently retire a batch of credits under one certificate.
+
+        Every credit is clawed back, destroyed and recorded exactly as in
+        retire_credit(); all records share this call's timestamp and txn ID.
+        Global totals are updated once for the whole batch.
+
+        Returns: retirement timestamp (one certificate reference for the batch)
+        """
+        assert credits.length > UInt64(0), "Empty batch"
+
+        ensure_budget(credits.length * UInt64(RETIRE_OPCODE_COST), OpUpFeeSource.GroupCredit)
 
         retirement_time = Global.latest_timestamp
+        tonnes          = UInt64(0)
 
-        # Step 1 — Clawback NFT from company wallet back to contract
+        company_tonnes, company_count = _company_totals(Txn.sender)
+
+        for i in urange(credits.length):
+            item = credits[i].copy()
+            self._retire(item.asset_id.native, item.co2_tonnes.native, retirement_time)
+            _append_to_ledger(Txn.sender, company_count, item.asset_id.native)
+            company_count += UInt64(1)
+            tonnes        += item.co2_tonnes.native
+
+        # Update company and global stats once
+        _put_company_totals(Txn.sender, company_tonnes + tonnes, company_count)
+        self.total_tonnes_retired.value = self.total_tonnes_retired.value + tonnes
+        self.total_retirements.value    = self.total_retirements.value + credits.length
+
+        arc4.emit(CreditsRetired(
+            company      = arc4.Address(Txn.sender),
+            retired_at   = arc4.UInt64(retirement_time),
+            total_tonnes = arc4.UInt64(tonnes),
+            credits      = credits.copy(),
+        ))
+        return arc4.UInt64(retirement_time)
+
+
+    @subroutine
+    def _retire(self, asset_id: UInt64, co2_tonnes: UInt64, retirement_time: UInt64) -> None:
+        """
+        Claws back one credit and writes its retirement box.
+
+        NFT credits (ASA total = 1) are clawed back whole and destroyed.
+        Fungible credits (ASA total = co2_tonnes, one unit per tonne) are
+        retired in part: co2_tonnes units are clawed back, the box records that
+        quantity, and the ASA is destroyed once every unit has been retired.
+        """
+        assert co2_tonnes > UInt64(0), "Invalid tonnes"
+
+        credit   = Asset(asset_id)
+        fungible = credit.total > UInt64(1)
+        key      = op.itob(asset_id)
+        amount   = UInt64(1)
+        tonnes   = co2_tonnes
+        if fungible:
+            # One certificate per (credit, company); later retirements add to it
+            key    = key + Txn.sender.bytes
+            amount = co2_tonnes
+            record, exists = op.Box.get(key)
+            if exists:
+                tonnes += op.btoi(op.extract(record, 40, 8))
+
+        # Step 1 — Clawback from company wallet back to contract
         itxn.AssetTransfer(
-            xfer_asset     = Asset(asset_id.native),
+            xfer_asset     = credit,
             asset_sender   = Txn.sender,
             asset_receiver = Global.current_application_address,
-            asset_amount   = 1,
+            asset_amount   = amount,
             fee            = Global.min_txn_fee,
         ).submit()
 
-        # Step 2 — Destroy the ASA permanently
+        # Step 2 — Destroy the ASA permanently, once no one else holds units
         # Calling AssetConfig with no fields = destroy
-        itxn.AssetConfig(
-            config_asset = Asset(asset_id.native),
-            fee          = Global.min_txn_fee,
-        ).submit()
+        if not fungible or credit.balance(Global.current_application_address) == credit.total:
+            itxn.AssetConfig(
+                config_asset = credit,
+                fee          = Global.min_txn_fee,
+            ).submit()
 
         # Step 3 — Write retirement record to box storage
-        # Box key   = asset_id (8 bytes) — unique per credit
+        # Box key   = asset_id (8 bytes) — unique per NFT credit
+        #             asset_id (8) + company (32) for a fungible credit
         # Box value = asset_id(8) | company_address(32) | co2_tonnes(8) | timestamp(8) | txn_id(32)
         # Total     = 88 bytes
         op.Box.put(
-            op.itob(asset_id.native),
-            op.itob(asset_id.native)   +   # offset 0  — 8 bytes
+            key,
+            op.itob(asset_id)          +   # offset 0  — 8 bytes
             Txn.sender.bytes           +   # offset 8  — 32 bytes  (company wallet)
-            op.itob(co2_tonnes.native) +   # offset 40 — 8 bytes
-            op.itob(retirement_time)   +   # offset 48 — 8 bytes
+            op.itob(tonnes)            +   # offset 40 — 8 bytes
+            op.itob(retirement_time)   +   # offset 48 — 8 bytes   (latest retirement)
             Txn.tx_id,                     # offset 56 — 32 bytes  (transaction proof)
         )
 
-        # Update global stats
-        self.total_tonnes_retired.value = (
-            self.total_tonnes_retired.value + co2_tonnes.native
-        )
-        self.total_retirements.value = self.total_retirements.value + UInt64(1)
-
-        return arc4.UInt64(retirement_time)
-
 
     @arc4.abimethod(readonly=True)
     def verify_retirement(
@@ -115,10 +252,103 @@ class RetirementRegistry(ARC4Contract):
         )
 
 
+    @arc4.abimethod(readonly=True)
+    def verify_fungible_retirement(
+        self,
+        asset_id: arc4.UInt64,
+        company:  arc4.Address,
+    ) -> tuple[arc4.UInt64, arc4.UInt64]:
+        """
+        Publicly verify how much of a fungible credit a company retired.
+
+        Returns: (co2_tonnes retired in total, date of the latest retirement)
+        """
+        box_value, box_exists = op.Box.get(op.itob(asset_id.native) + company.bytes)
+        assert box_exists, "Retirement certificate not found"
+
+        return (
+            arc4.UInt64(op.btoi(op.extract(box_value, 40, 8))),
+            arc4.UInt64(op.btoi(op.extract(box_value, 48, 8))),
+        )
+
+
+    @arc4.abimethod(readonly=True)
+    def get_company_totals(
+        self,
+        company: arc4.Address,
+    ) -> tuple[arc4.UInt64, arc4.UInt64]:
+        """
+        Verify a company's total offset claim without scanning history.
+
+        Returns: (co2_tonnes_retired, retirements) — zeros if it never retired
+        """
+        tonnes, count = _company_totals(company.native)
+        return arc4.UInt64(tonnes), arc4.UInt64(count)
+
+
+    @arc4.abimethod(readonly=True)
+    def get_company_retirements(
+        self,
+        company: arc4.Address,
+        page:    arc4.UInt64,
+    ) -> arc4.DynamicArray[arc4.UInt64]:
+        """
+        Lists a company's retired asset IDs, oldest first, 64 per page.
+        Each ID can be checked with verify_retirement().
+
+        Returns: asset IDs on that page — empty past the last page
+        """
+        _tonnes, count = _company_totals(company.native)
+        start = page.native * UInt64(LEDGER_PAGE_SIZE)
+        if start >= count:
+            return arc4.DynamicArray[arc4.UInt64]()
+
+        length = count - start
+        if length > UInt64(LEDGER_PAGE_SIZE):
+            length = UInt64(LEDGER_PAGE_SIZE)
+
+        ids = op.Box.extract(_ledger_page_key(company.native, page.native), 0, length * UInt64(8))
+        return arc4.DynamicArray[arc4.UInt64].from_bytes(op.extract(op.itob(length), 6, 2) + ids)
+
+
     @arc4.abimethod(readonly=True)
     def get_global_stats(self) -> tuple[arc4.UInt64, arc4.UInt64]:
         """Returns (total_tonnes_retired, total_retirements)."""
         return (
             arc4.UInt64(self.total_tonnes_retired.value),
             arc4.UInt64(self.total_retirements.value),
-        )
\ No newline at end of file
+        )
+
+
+@subroutine
+def _company_totals_key(company: Account) -> Bytes:
+    return Bytes(COMPANY_TOTALS_PREFIX) + company.bytes
+
+
+@subroutine
+def _ledger_page_key(company: Account, page: UInt64) -> Bytes:
+    return Bytes(COMPANY_PAGE_PREFIX) + company.bytes + op.itob(page)
+
+
+@subroutine
+def _company_totals(company: Account) -> tuple[UInt64, UInt64]:
+    """Returns (tonnes, count) for a company; zeros if it has no ledger yet."""
+    value, exists = op.Box.get(_company_totals_key(company))
+    if not exists:
+        return UInt64(0), UInt64(0)
+    return op.btoi(op.extract(value, 0, 8)), op.btoi(op.extract(value, 8, 8))
+
+
+@subroutine
+def _put_company_totals(company: Account, tonnes: UInt64, count: UInt64) -> None:
+    op.Box.put(_company_totals_key(company), op.itob(tonnes) + op.itob(count))
+
+
+@subroutine
+def _append_to_ledger(company: Account, index: UInt64, asset_id: UInt64) -> None:
+    """Writes asset_id as the company's index-th retirement, opening a new page when needed."""
+    key  = _ledger_page_key(company, index // UInt64(LEDGER_PAGE_SIZE))
+    slot = index % UInt64(LEDGER_PAGE_SIZE)
+    if slot == UInt64(0):
+        assert op.Box.create(key, UInt64(LEDGER_PAGE_BYTES)), "Ledger page exists"
+    op.Box.replace(key, slot * UInt64(8), op.itob(asset_id))
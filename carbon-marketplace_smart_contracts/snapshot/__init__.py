@@ -0,0 +1,9 @@
+"""
+Box snapshots: every listing, project and retirement box of the deployed apps,
+exported as memory-mappable binary columns.
+
+A snapshot is a directory of one fixed-width column file per field and a
+manifest recording the round, app IDs and column dtypes. Snapshots are taken
+incrementally: boxes the apps' transactions have not referenced since the
+previous snapshot's round are carried over instead of fetched again.
+"""
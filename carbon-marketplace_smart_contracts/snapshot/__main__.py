@@ -0,0 +1,51 @@
+"""
+python -m snapshot --algod URL [--indexer URL] [--out snapshots] [--manifest deployment.json]
+                   [--concurrency 16] [--full]
+
+Snapshots the listing, project and retirement boxes of the apps recorded in the
+deployment manifest into <out>/<round>/. With --indexer, the latest snapshot
+under --out is updated incrementally; without it (or with --full) every box is
+fetched.
+"""
+
+import argparse
+from pathlib import Path
+
+from ingestion.sources import IndexerSource
+from smart_contracts._helpers.manifest import app_ids
+from snapshot.export import DEFAULT_CONCURRENCY, BoxSource, take_snapshot
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m snapshot")
+    parser.add_argument("--algod", required=True, help="algod URL, e.g. https://testnet-api.algonode.cloud")
+    parser.add_argument("--algod-token", default="")
+    parser.add_argument("--indexer", help="indexer URL; enables incremental snapshots")
+    parser.add_argument("--indexer-token", default="")
+    parser.add_argument("--out", type=Path, default=Path("snapshots"))
+    parser.add_argument("--manifest", type=Path, default=Path("deployment.json"))
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="box requests in flight")
+    parser.add_argument("--full", action="store_true", help="fetch every box even if a snapshot exists")
+    args = parser.parse_args()
+
+    from algosdk.v2client.algod import AlgodClient
+    from algosdk.v2client.indexer import IndexerClient
+
+    apps = app_ids(args.manifest)
+    history = None
+    if args.indexer:
+        history = IndexerSource(IndexerClient(args.indexer_token, args.indexer), list(apps.values()))
+
+    path, stats = take_snapshot(
+        args.out,
+        apps,
+        BoxSource(AlgodClient(args.algod_token, args.algod), args.concurrency),
+        history,
+        full=args.full,
+    )
+    print(f"Snapshot of round {stats.round} at {path}: {stats.boxes} boxes "
+          f"({stats.fetched} fetched, {stats.carried} carried over) in {stats.seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+On-disk snapshot format.
+
+    <root>/<round>/manifest.json
+    <root>/<round>/<table>/<column>.bin
+
+Each column file holds one fixed-width value per box, in the dtype recorded in
+the manifest (big-endian integers as the contracts store them, V32 for
+addresses, S<n> for string keys), so readers np.memmap() a column without
+parsing. Rows are in key order and aligned across a table's columns. A
+snapshot is written to a temporary directory and renamed into place, so a
+directory named after a round is always complete.
+"""
+
+import dataclasses
+import json
+import shutil
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+
+
+@dataclasses.dataclass
+class TableData:
+    keys:    np.ndarray   # key column: asset IDs or project IDs
+    records: np.ndarray   # structured array in the table's layout
+
+
+def write_snapshot(
+    root: Path,
+    round_: int,
+    app_ids: Mapping[str, int],
+    tables: Mapping[str, TableData],
+    key_columns: Mapping[str, str],
+) -> Path:
+    """Writes a snapshot as <root>/<round>. Returns: its directory"""
+    final = root / str(round_)
+    staging = root / f".{round_}.tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    staging.mkdir(parents=True)
+
+    manifest: dict = {"version": SNAPSHOT_VERSION, "round": round_, "apps": dict(app_ids), "tables": {}}
+    for name, data in tables.items():
+        order = np.argsort(data.keys, kind="stable")
+        columns = {key_columns[name]: data.keys[order]}
+        columns.update((field, data.records[field][order]) for field in data.records.dtype.names)
+
+        (staging / name).mkdir()
+        for column, values in columns.items():
+            np.ascontiguousarray(values).tofile(staging / name / f"{column}.bin")
+        manifest["tables"][name] = {
+            "rows":    len(order),
+            "key":     key_columns[name],
+            "columns": {column: values.dtype.str for column, values in columns.items()},
+        }
+    (staging / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n")
+
+    shutil.rmtree(final, ignore_errors=True)
+    staging.rename(final)
+    return final
+
+
+def latest(root: Path) -> Path | None:
+    """The snapshot with the highest round under root, if any."""
+    rounds = [int(path.name) for path in root.glob("*") if path.name.isdigit() and (path / MANIFEST_NAME).exists()]
+    return root / str(max(rounds)) if rounds else None
+
+
+class Snapshot:
+    """Read-only view of a snapshot directory; columns are memory-mapped on access."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        manifest = json.loads((path / MANIFEST_NAME).read_text())
+        if manifest["version"] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version {manifest['version']} in {path}")
+        self.round:   int = manifest["round"]
+        self.app_ids: dict[str, int] = manifest["apps"]
+        self.tables:  dict[str, dict] = manifest["tables"]
+
+    @classmethod
+    def open(cls, root: Path) -> "Snapshot":
+        """A snapshot directory, or the latest snapshot under a root directory."""
+        if (root / MANIFEST_NAME).exists():
+            return cls(root)
+        path = latest(root)
+        if path is None:
+            raise FileNotFoundError(f"No snapshot in {root}")
+        return cls(path)
+
+    def rows(self, table: str) -> int:
+        return self.tables[table]["rows"] if table in self.tables else 0
+
+    def column(self, table: str, column: str) -> np.ndarray:
+        dtype = np.dtype(self.tables[table]["columns"][column])
+        rows = self.rows(table)
+        if rows == 0:
+            # mmap cannot map an empty file
+            return np.empty(0, dtype)
+        return np.memmap(self.path / table / f"{column}.bin", dtype=dtype, mode="r", shape=(rows,))
+
+    def keys(self, table: str) -> np.ndarray:
+        return self.column(table, self.tables[table]["key"])
+
+    def records(self, table: str, layout: np.dtype) -> np.ndarray:
+        """Reassembles a table's columns into a structured array (a copy) in layout."""
+        records = np.empty(self.rows(table), dtype=layout)
+        if not len(records):
+            return records
+        for field in layout.names:
+            records[field] = self.column(table, field)
+        return records
@@ -0,0 +1,90 @@
+"""
+Which boxes a snapshot exports, and how their names become key columns.
+
+A box belongs to a table when its name decodes with the table's key and its
+value has the size of the table's layout. The listing layouts (v2, v1 and
+legacy) share a key shape and differ only in size; other boxes (tombstones,
+proceeds, listing index buckets, ledger pages, totals) are left out.
+"""
+
+import dataclasses
+from collections.abc import Callable
+
+import numpy as np
+
+from smart_contracts._helpers import layouts
+
+REGISTRY    = "CreditIssuanceRegistry"
+MARKETPLACE = "CarbonMarketplace"
+RETIREMENT  = "RetirementRegistry"
+
+# Credit-terms index boxes: b"a" + asset_id(8), as in credit_issuance/contract.py
+CREDIT_INDEX_PREFIX = b"a"
+
+_ARC4_LENGTH_BYTES = 2
+
+
+@dataclasses.dataclass(frozen=True)
+class Key:
+    column: str
+    # None when the box name has a different shape
+    decode: Callable[[bytes], int | bytes | None]
+    encode: Callable[[int | bytes], bytes]
+    # String keys are stored as S<n>, n being the longest key in the snapshot
+    fixed_dtype: str | None
+
+
+def _uint64_key(prefix: bytes = b"") -> Key:
+    def decode(name: bytes) -> int | None:
+        if len(name) != len(prefix) + 8 or not name.startswith(prefix):
+            return None
+        return int.from_bytes(name[len(prefix):], "big")
+
+    return Key("asset_id", decode, lambda asset_id: prefix + asset_id.to_bytes(8, "big"), ">u8")
+
+
+def _decode_arc4_string(name: bytes) -> bytes | None:
+    if len(name) < _ARC4_LENGTH_BYTES or int.from_bytes(name[:_ARC4_LENGTH_BYTES], "big") != len(name) - 2:
+        return None
+    return name[_ARC4_LENGTH_BYTES:]
+
+
+PROJECT_KEY = Key(
+    "project_id",
+    _decode_arc4_string,
+    lambda project_id: len(project_id).to_bytes(_ARC4_LENGTH_BYTES, "big") + project_id,
+    None,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class Table:
+    name:     str
+    contract: str
+    layout:   np.dtype
+    key:      Key
+
+    def matches(self, name: bytes, value: bytes) -> bool:
+        return len(value) == self.layout.itemsize and self.key.decode(name) is not None
+
+    def key_dtype(self, keys: list) -> np.dtype:
+        return np.dtype(self.key.fixed_dtype or f"S{max(map(len, keys), default=1)}")
+
+
+TABLES = (
+    Table("listings",        MARKETPLACE, layouts.LISTING,        _uint64_key()),
+    Table("listings_v1",     MARKETPLACE, layouts.LISTING_V1,     _uint64_key()),
+    Table("listings_legacy", MARKETPLACE, layouts.LISTING_LEGACY, _uint64_key()),
+    Table("projects",        REGISTRY,    layouts.PROJECT,        PROJECT_KEY),
+    Table("credit_terms",    REGISTRY,    layouts.CREDIT_TERMS,   _uint64_key(CREDIT_INDEX_PREFIX)),
+    Table("retirements",     RETIREMENT,  layouts.RETIREMENT,     _uint64_key()),
+)
+
+
+def table_for(contract: str, name: bytes, value: bytes) -> Table | None:
+    return next((t for t in TABLES if t.contract == contract and t.matches(name, value)), None)
+
+
+def exported(contract: str, name: bytes) -> bool:
+    """Whether a box name can belong to any table; its size decides which."""
+    return any(t.contract == contract and t.key.decode(name) is not None for t in TABLES)
@@ -0,0 +1,16 @@
+import pytest
+
+
+@pytest.fixture
+def env():
+    """A fresh emulator Deployment of all three contracts, with registry calls answered."""
+    pytest.importorskip("algopy_testing")
+    pytest.importorskip("algosdk")
+    from algopy_testing import algopy_testing_context
+
+    from benchmarks.scenarios import Deployment
+
+    with algopy_testing_context() as ctx:
+        deployment = Deployment(ctx)
+        with deployment.registry_calls():
+            yield deployment
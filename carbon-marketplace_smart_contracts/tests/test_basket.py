@@ -0,0 +1,56 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset  # noqa: E402
+
+from benchmarks.scenarios import FEE_BPS, PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace import basket  # noqa: E402
+from smart_contracts.marketplace.contract import FILL_OPCODE_COST, MAX_BASKET_SIZE, STATUS_SOLD  # noqa: E402
+
+
+def _buy(env: Deployment, assets: list[Asset], paid: int) -> int:
+    with env.call(env.business, env.payment(env.business, paid)):
+        return env.marketplace.buy_credits(env.asset_ids(assets)).as_uint64().value
+
+
+def test_basket_pays_each_seller_once(env: Deployment) -> None:
+    other = env.ctx.any.account()
+    assets = [env.listing(), env.listing(seller=other), env.listing()]
+
+    assert _buy(env, assets, PRICE * 3) == PRICE * 3
+
+    inner = env.ctx.txn.last_group.itxn_groups
+    transfers = [group[0] for group in inner[:3]]
+    payments = [group[0] for group in inner[3:]]
+    assert [t.xfer_asset for t in transfers] == assets
+    assert all(t.asset_receiver == env.business for t in transfers)
+    assert [(p.receiver, p.amount) for p in payments] == [
+        (env.seller, 2 * PRICE - 2 * PRICE * FEE_BPS // 10_000),
+        (other, PRICE - PRICE * FEE_BPS // 10_000),
+    ]
+    assert env.marketplace.accrued_fees.value == 3 * PRICE * FEE_BPS // 10_000
+    assert env.marketplace.total_trades.value == 3
+
+
+def test_basket_buys_fungible_listings_out(env: Deployment) -> None:
+    asset = env.listing(total=100)
+
+    assert _buy(env, [asset], PRICE * 100) == PRICE * 100
+    assert env.ctx.txn.last_group.itxn_groups[0][0].asset_amount == 100
+
+
+def test_basket_rejections(env: Deployment) -> None:
+    with pytest.raises(AssertionError, match="Empty basket"):
+        _buy(env, [], 0)
+    with pytest.raises(AssertionError, match="Basket too large"):
+        _buy(env, [env.credit() for _ in range(MAX_BASKET_SIZE + 1)], 0)
+    with pytest.raises(AssertionError, match="Listing is not active"):
+        _buy(env, [env.listing(), env.listing(status=STATUS_SOLD)], PRICE * 2)
+    with pytest.raises(AssertionError, match="Wrong payment amount"):
+        _buy(env, [env.listing(), env.listing()], PRICE)
+
+
+def test_driver_mirrors_the_contract_limits() -> None:
+    assert (basket.MAX_BASKET_SIZE, basket.FILL_OPCODE_COST) == (MAX_BASKET_SIZE, FILL_OPCODE_COST)
@@ -0,0 +1,84 @@
+import pytest
+
+pytest.importorskip("algosdk")
+
+from algosdk.encoding import encode_address  # noqa: E402
+
+from smart_contracts._helpers.avm import (  # noqa: E402
+    MAX_INNER_TXNS_PER_CALL,
+    MAX_TXN_ACCOUNT_REFERENCES,
+    MAX_TXN_REFERENCES,
+    MIN_TXN_FEE,
+    opup_calls,
+)
+from smart_contracts.marketplace.basket import FILL_OPCODE_COST, MAX_BASKET_SIZE, plan_basket  # noqa: E402
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    STATUS_ACTIVE,
+    Listing,
+    index_box_name,
+    listing_box_name,
+    proceeds_box_name,
+)
+
+PRICE = 1_000_000
+
+
+def _listing(asset_id: int, seller: int, fungible: bool = False) -> Listing:
+    return Listing(
+        asset_id=asset_id,
+        version=2,
+        seller=encode_address(seller.to_bytes(32, "big")),
+        price_microalgo=PRICE,
+        co2_tonnes=100,
+        vintage_year=2024,
+        min_purchase_qty=1,
+        listed_at=0,
+        expiry_timestamp=2_000_000_000,
+        status=STATUS_ACTIVE,
+        fungible=fungible,
+        project_type=8,
+    )
+
+
+def test_full_basket_from_distinct_sellers_pools_six_app_calls() -> None:
+    listings = [_listing(100 + n, seller=n) for n in range(MAX_BASKET_SIZE)]
+
+    plan = plan_basket(listings)
+
+    opups = opup_calls(MAX_BASKET_SIZE * FILL_OPCODE_COST)
+    assert opups == 6
+    # 14 transfers + 14 payouts + op-ups: more than one call's 16
+    assert plan.inner_txns == 34
+    assert plan.inner_txns <= plan.app_calls * MAX_INNER_TXNS_PER_CALL
+    assert plan.max_fee == MIN_TXN_FEE * (1 + opups)
+    assert plan.total == PRICE * MAX_BASKET_SIZE
+
+    # 14 listing boxes + 1 shared index page + 14 assets + 14 sellers
+    assert plan.app_calls == 6
+    assert all(len(call) <= MAX_TXN_REFERENCES for call in plan.references)
+    assert all(len(call.accounts) <= MAX_TXN_ACCOUNT_REFERENCES for call in plan.references)
+    assert {box for call in plan.references for box in call.boxes} == {
+        listing_box_name(listing.asset_id) for listing in listings
+    } | {index_box_name(2024, 8, 100)}
+    assert sorted(a for call in plan.references for a in call.assets) == [listing.asset_id for listing in listings]
+    assert sorted(a for call in plan.references for a in call.accounts) == sorted(l.seller for l in listings)
+
+
+def test_pull_payments_reference_proceeds_boxes_instead_of_sellers() -> None:
+    listings = [_listing(1, seller=1, fungible=True), _listing(2, seller=1)]
+
+    plan = plan_basket(listings, pull_payments=True)
+
+    assert plan.inner_txns == 2 + opup_calls(2 * FILL_OPCODE_COST)
+    assert plan.total == PRICE * 100 + PRICE
+    assert not any(call.accounts for call in plan.references)
+    assert proceeds_box_name(listings[0].seller) in plan.references[0].boxes
+
+
+def test_empty_oversized_or_duplicate_baskets_are_rejected() -> None:
+    with pytest.raises(ValueError, match="Empty basket"):
+        plan_basket([])
+    with pytest.raises(ValueError, match="at most 14"):
+        plan_basket([_listing(n, seller=n) for n in range(MAX_BASKET_SIZE + 1)])
+    with pytest.raises(ValueError, match="Duplicate"):
+        plan_basket([_listing(1, seller=1), _listing(1, seller=2)])
@@ -0,0 +1,32 @@
+from smart_contracts._helpers.avm import MAX_TXN_REFERENCES, MIN_TXN_FEE, opup_calls
+from smart_contracts.credit_issuance.batching import (
+    REFS_PER_CREDIT,
+    CreditSpec,
+    credit_index_box_name,
+    mint_call_fee,
+    plan_mint_batches,
+)
+
+
+def _spec(n: int) -> CreditSpec:
+    return CreditSpec(f"VCS-{n:06d}", "Mangrove Restoration", 100, 2024, "bafy", 5)
+
+
+def test_opup_calls_follow_ensure_budget() -> None:
+    assert opup_calls(100, available=700) == 0
+    assert opup_calls(673) == 1          # 683 needed, 683 granted per op-up
+    assert opup_calls(674) == 2
+
+
+def test_mint_fee_pays_for_the_op_ups_only() -> None:
+    # 4 credits: ensure_budget(800) needs at most 2 op-ups on top of the call itself
+    assert mint_call_fee(4) == MIN_TXN_FEE * 3
+    assert mint_call_fee(1) == MIN_TXN_FEE * 2
+
+
+def test_batches_reference_project_and_index_boxes() -> None:
+    batches = plan_mint_batches([_spec(n) for n in range(9)])
+
+    assert [len(batch) for batch in batches] == [4, 4, 1]
+    assert all(len(batch) * REFS_PER_CREDIT <= MAX_TXN_REFERENCES for batch in batches)
+    assert credit_index_box_name(1234) == b"a" + (1234).to_bytes(8, "big")
@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+
+from benchmarks.harness import compare, load_baseline  # noqa: E402
+from benchmarks.scenarios import SCENARIOS, run_scenario, unbenchmarked_methods  # noqa: E402
+
+BASELINE = load_baseline()
+
+
+def test_every_abi_method_has_a_scenario() -> None:
+    assert unbenchmarked_methods() == []
+
+
+@pytest.mark.parametrize("method", sorted(SCENARIOS))
+def test_no_cost_regression(method: str) -> None:
+    metrics = run_scenario(method)
+    if method not in BASELINE:
+        pytest.skip("no baseline recorded — run `python -m benchmarks --update`")
+
+    regressions = compare(BASELINE, {method: metrics})
+    assert not regressions, "\n".join(str(regression) for regression in regressions)
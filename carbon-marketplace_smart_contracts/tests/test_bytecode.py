@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from smart_contracts._helpers import bytecode
+
+
+def test_build_output_is_served_without_compiling(tmp_path: Path) -> None:
+    output_dir, cache_dir = tmp_path / "out", tmp_path / "cache"
+    output_dir.mkdir()
+    (output_dir / "App.approval.teal").write_text("#pragma version 10\nint 1\n")
+    (output_dir / "App.approval.bin").write_bytes(b"\x0a\x81\x01")
+    (output_dir / "App.clear.teal").write_text("#pragma version 10\n")   # no .bin: not indexed
+
+    assert bytecode.index_build_output(output_dir, cache_dir) == 1
+
+    def compile_remote(source: str) -> bytes:
+        raise AssertionError("cache hit expected")
+
+    program, hit = bytecode.load_program(output_dir / "App.approval.teal", compile_remote, cache_dir)
+    assert (program, hit) == (b"\x0a\x81\x01", True)
+
+
+def test_miss_compiles_once_and_edits_invalidate(tmp_path: Path) -> None:
+    teal_path, cache_dir = tmp_path / "App.approval.teal", tmp_path / "cache"
+    teal_path.write_text("#pragma version 10\nint 1\n")
+    calls: list[str] = []
+
+    def compile_remote(source: str) -> bytes:
+        calls.append(source)
+        return source.encode()[-4:]
+
+    assert bytecode.load_program(teal_path, compile_remote, cache_dir)[1] is False
+    assert bytecode.load_program(teal_path, compile_remote, cache_dir)[1] is True
+    assert len(calls) == 1
+
+    teal_path.write_text("#pragma version 10\nint 2\n")
+    program, hit = bytecode.load_program(teal_path, compile_remote, cache_dir)
+    assert (program, hit, len(calls)) == (b"t 2\n", False, 2)
+    assert not list(cache_dir.glob("*.tmp"))
+
+
+def test_comments_do_not_split_the_cache(tmp_path: Path) -> None:
+    output_dir, cache_dir = tmp_path / "out", tmp_path / "cache"
+    output_dir.mkdir()
+    # The build CLI compiles with repo-relative paths; committed artifacts were
+    # compiled from inside the app folder.
+    (output_dir / "App.approval.teal").write_text(
+        '#pragma version 10\n\nmain:\n    pushbytes "a//b" // smart_contracts/app/contract.py:7\n'
+    )
+    (output_dir / "App.approval.bin").write_bytes(b"\x0a\x80\x04a//b")
+    bytecode.index_build_output(output_dir, cache_dir)
+
+    committed = tmp_path / "App.approval.teal"
+    committed.write_text('#pragma version 10\nmain:\n  pushbytes "a//b"    // contract.py:7\n')
+    assert bytecode.lookup(committed.read_bytes(), cache_dir) == b"\x0a\x80\x04a//b"
+
+    # A `//` inside a string literal is code, not a comment
+    assert bytecode.teal_hash('pushbytes "a//b"') != bytecode.teal_hash('pushbytes "a//c"')
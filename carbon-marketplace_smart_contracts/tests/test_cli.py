@@ -0,0 +1,23 @@
+from pathlib import Path
+
+import pytest
+
+import smart_contracts.__main__ as entry_point
+
+
+def test_cli_entry_point_imports_without_side_effects() -> None:
+    names = [contract.name for contract in entry_point.discover_contracts()]
+    assert names == ["credit_issuance", "marketplace", "retirement"]
+    assert "deploy" not in vars(entry_point.discover_contracts()[0])   # deploy_config not imported yet
+
+
+def test_build_all_asks_for_the_toolchain_version_once(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    calls = []
+    monkeypatch.setattr(entry_point, "_toolchain_version", lambda: calls.append(1) or "algokit 2.0")
+    monkeypatch.setattr(entry_point, "is_cached", lambda output_dir, digest: True)
+    monkeypatch.setattr(entry_point.bytecode, "index_build_output", lambda output_dir: 0)
+
+    results = entry_point.build_all(tmp_path, entry_point.discover_contracts())
+
+    assert [result.cached for result in results] == [True, True, True]
+    assert len(calls) == 1
@@ -0,0 +1,164 @@
+import base64
+import dataclasses
+import pathlib
+import shutil
+import subprocess
+import time
+
+import pytest
+
+pytest.importorskip("algosdk")
+
+from algosdk import transaction  # noqa: E402
+
+import deploy_all  # noqa: E402
+from smart_contracts._helpers import bytecode  # noqa: E402
+from smart_contracts._helpers.avm import PROGRAM_PAGE_BYTES  # noqa: E402
+from smart_contracts._helpers.manifest import (  # noqa: E402
+    AppRecord,
+    Manifest,
+    ReplacementRequired,
+    program_hash,
+)
+
+COMPILE_SECONDS = 0.05
+
+
+class FakeAlgod:
+    """Stands in for algod's compile endpoint with a fixed network delay."""
+
+    def __init__(self) -> None:
+        self.compiled: list[str] = []
+
+    def compile(self, source: str) -> dict:
+        time.sleep(COMPILE_SECONDS)
+        self.compiled.append(source)
+        return {"result": base64.b64encode(source[:8].encode()).decode()}
+
+    def suggested_params(self) -> transaction.SuggestedParams:
+        return transaction.SuggestedParams(1_000, 1, 1_001, "Z2g=", gen="testnet-v1.0", flat_fee=True)
+
+    def account_info(self, address: str) -> dict:
+        return {"amount": 5_000_000, "min-balance": 100_000}
+
+    def send_transactions(self, *args, **kwargs):
+        raise AssertionError("no transactions expected")
+
+
+@pytest.fixture(autouse=True)
+def _project_root(monkeypatch: pytest.MonkeyPatch, tmp_path: pathlib.Path) -> None:
+    monkeypatch.chdir(pathlib.Path(__file__).parent.parent)
+    monkeypatch.setattr(bytecode, "CACHE_DIR", tmp_path / "bytecode")
+
+
+def test_programs_fit_their_extra_pages(tmp_path: pathlib.Path) -> None:
+    puyapy = shutil.which("puyapy")
+    if puyapy is None:
+        pytest.skip("puyapy is not installed")
+
+    for spec in deploy_all.CONTRACTS:
+        subprocess.run(
+            [puyapy, f"smart_contracts/{spec.folder}/contract.py", f"--out-dir={tmp_path}", "--output-bytecode"],
+            check=True,
+            capture_output=True,
+        )
+        size = sum((tmp_path / f"{spec.name}.{program}.bin").stat().st_size for program in ("approval", "clear"))
+        assert size <= PROGRAM_PAGE_BYTES * (1 + deploy_all.EXTRA_PAGES), f"{spec.name}: {size} bytes"
+
+
+def test_programs_compile_concurrently() -> None:
+    client, timings = FakeAlgod(), deploy_all.Timings()
+    programs = deploy_all.compile_all(client, deploy_all.CONTRACTS, timings)
+
+    assert set(programs) == {spec.name for spec in deploy_all.CONTRACTS}
+    assert len(client.compiled) == 2 * len(deploy_all.CONTRACTS)
+    assert timings.compile_sequential >= 2 * len(deploy_all.CONTRACTS) * COMPILE_SECONDS
+    assert timings.compile_wall < timings.compile_sequential / 2
+
+
+def test_redeploy_loads_programs_from_the_bytecode_cache() -> None:
+    first, second = FakeAlgod(), FakeAlgod()
+    programs = deploy_all.compile_all(first, deploy_all.CONTRACTS, deploy_all.Timings())
+
+    timings = deploy_all.Timings()
+    assert deploy_all.compile_all(second, deploy_all.CONTRACTS, timings) == programs
+    assert second.compiled == []
+    assert timings.cache_hits == 2 * len(deploy_all.CONTRACTS)
+
+
+def test_marketplace_is_created_after_the_issuance_registry() -> None:
+    stages = [[spec.name for spec in stage] for stage in deploy_all.plan_stages(deploy_all.CONTRACTS)]
+    assert stages == [["CreditIssuanceRegistry", "RetirementRegistry"], ["CarbonMarketplace"]]
+
+
+def test_unresolvable_dependencies_are_rejected() -> None:
+    spec = deploy_all.CONTRACTS[1]
+    with pytest.raises(ValueError, match="Unresolvable"):
+        deploy_all.plan_stages([spec])
+
+
+def test_dependencies_recorded_in_the_manifest_resolve() -> None:
+    spec = deploy_all.CONTRACTS[1]
+    assert deploy_all.plan_stages([spec], deployed=["CreditIssuanceRegistry"]) == [[spec]]
+
+
+def _deployed(tmp_path: pathlib.Path) -> Manifest:
+    """A manifest recording every contract as deployed from the current programs."""
+    programs = deploy_all.compile_all(FakeAlgod(), deploy_all.CONTRACTS, deploy_all.Timings())
+    manifest, app_ids = Manifest("testnet-v1.0"), {}
+    for app_id, spec in enumerate(deploy_all.plan_stages(deploy_all.CONTRACTS)[0] + [deploy_all.CONTRACTS[1]], 1001):
+        approval, clear = programs[spec.name]
+        manifest.apps[spec.name] = AppRecord(
+            app_id=app_id,
+            app_address=f"APP{app_id}",
+            approval_hash=program_hash(approval),
+            clear_hash=program_hash(clear),
+            schema=spec.schema(),
+            create_args=spec.method_args(app_ids),
+        )
+        app_ids[spec.name] = app_id
+    manifest.save(tmp_path / "deployment.json")
+    return manifest
+
+
+def test_unchanged_redeploy_sends_no_transactions(tmp_path: pathlib.Path) -> None:
+    manifest = _deployed(tmp_path)
+
+    redeployed, timings = deploy_all.deploy_all(
+        FakeAlgod(), "DEPLOYER", signer=None, manifest_path=tmp_path / "deployment.json"
+    )
+    assert timings.transactions == 0
+    assert redeployed == manifest
+
+
+def test_schema_change_stops_before_sending_anything(tmp_path: pathlib.Path) -> None:
+    manifest = _deployed(tmp_path)
+    record = manifest.apps["RetirementRegistry"]
+    record.schema = dataclasses.replace(record.schema, extra_pages=0)
+    manifest.save(tmp_path / "deployment.json")
+
+    with pytest.raises(ReplacementRequired, match="^RetirementRegistry: schema changed.*--replace"):
+        deploy_all.deploy_all(FakeAlgod(), "DEPLOYER", signer=None, manifest_path=tmp_path / "deployment.json")
+    assert Manifest.load(tmp_path / "deployment.json", "testnet-v1.0") == manifest
+
+
+def test_single_contract_deploy_reads_the_registry_from_the_manifest(tmp_path: pathlib.Path) -> None:
+    manifest = _deployed(tmp_path)
+    registry_id = manifest.apps["CreditIssuanceRegistry"].app_id
+    assert manifest.apps["CarbonMarketplace"].create_args == [250, registry_id]
+
+    record = deploy_all.deploy_contract(
+        FakeAlgod(), "DEPLOYER", None, "CarbonMarketplace", manifest_path=tmp_path / "deployment.json"
+    )
+    assert record == manifest.apps["CarbonMarketplace"]
+
+
+def test_single_contract_deploy_never_replaces_silently(tmp_path: pathlib.Path) -> None:
+    manifest = _deployed(tmp_path)
+    manifest.apps["CreditIssuanceRegistry"].app_id = 2001   # registry was replaced since
+    manifest.save(tmp_path / "deployment.json")
+
+    with pytest.raises(ReplacementRequired, match="^CarbonMarketplace: create args changed"):
+        deploy_all.deploy_contract(
+            FakeAlgod(), "DEPLOYER", None, "CarbonMarketplace", manifest_path=tmp_path / "deployment.json"
+        )
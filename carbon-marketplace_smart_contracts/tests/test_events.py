@@ -0,0 +1,87 @@
+import ast
+import struct
+
+import pytest
+
+pytest.importorskip("algosdk")
+
+from algosdk.encoding import decode_address  # noqa: E402
+
+from benchmarks.harness import CONTRACT_SOURCES  # noqa: E402
+from smart_contracts._helpers.events import (  # noqa: E402
+    EVENT_SPECS,
+    decode_event,
+    decode_events,
+    event_selector,
+)
+
+ABI_RETURN_PREFIX = bytes.fromhex("151f7c75")
+
+_ARC4_TYPES = {
+    "arc4.UInt64": "uint64",
+    "arc4.Address": "address",
+    "arc4.Bool": "bool",
+    "arc4.String": "string",
+}
+
+
+def _struct_fields(source: str) -> dict[str, list[tuple[str, str]]]:
+    """Field names and ARC-4 types of every arc4.Struct in a contract module."""
+    structs: dict[str, list[tuple[str, str]]] = {}
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.ClassDef) and any(ast.unparse(base) == "arc4.Struct" for base in node.bases):
+            structs[node.name] = [
+                (stmt.target.id, ast.unparse(stmt.annotation))
+                for stmt in node.body
+                if isinstance(stmt, ast.AnnAssign)
+            ]
+    return structs
+
+
+def test_specs_mirror_the_contract_event_structs() -> None:
+    structs: dict[str, list[tuple[str, str]]] = {}
+    for path in CONTRACT_SOURCES.values():
+        structs.update(_struct_fields(path.read_text()))
+
+    def resolve(annotation: str) -> "str | list":
+        if annotation.startswith("arc4.DynamicArray["):
+            element = annotation.removeprefix("arc4.DynamicArray[").removesuffix("]")
+            return [(name, resolve(kind)) for name, kind in structs[element]]
+        return _ARC4_TYPES[annotation]
+
+    for name, fields in EVENT_SPECS.items():
+        assert [(field, resolve(kind)) for field, kind in structs[name]] == fields, name
+
+
+def test_decodes_a_basket_event_and_skips_the_abi_return() -> None:
+    buyer = bytes(range(32))
+    seller = bytes(range(32, 64))
+    fills = [(1001, seller, 1, 5_000_000, 1_900_000_000), (1002, seller, 40, 800_000, 1_950_000_000)]
+    body = buyer + struct.pack(">QQH", 5_800_000, 145_000, 32 + 8 + 8 + 2)
+    body += struct.pack(">H", len(fills)) + b"".join(
+        struct.pack(">Q", asset_id) + who + struct.pack(">QQQ", qty, cost, expiry)
+        for asset_id, who, qty, cost, expiry in fills
+    )
+    logs = [event_selector("CreditsBought") + body, ABI_RETURN_PREFIX + struct.pack(">Q", 5_800_000)]
+
+    (event,) = decode_events(logs)
+    assert event.name == "CreditsBought"
+    assert event.fields["total"] == 5_800_000
+    assert event.fields["platform_fee"] == 145_000
+    assert decode_address(event.fields["buyer"]) == buyer
+    assert [(fill["asset_id"], fill["qty"], fill["cost"]) for fill in event.fields["fills"]] == [
+        (1001, 1, 5_000_000),
+        (1002, 40, 800_000),
+    ]
+
+
+def test_decodes_a_string_field() -> None:
+    issuer = bytes(32)
+    head = struct.pack(">Q", 77) + issuer + struct.pack(">H", 8 + 32 + 2 + 4 * 8)
+    head += struct.pack(">QQQQ", 500, 500, 2023, 2_000_000_000)
+    log = event_selector("CreditMinted") + head + struct.pack(">H", 7) + b"PRJ-001"
+
+    event = decode_event(log)
+    assert event is not None
+    assert event.fields["project_id"] == "PRJ-001"
+    assert (event.fields["units"], event.fields["vintage_year"]) == (500, 2023)
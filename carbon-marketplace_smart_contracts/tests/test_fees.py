@@ -0,0 +1,55 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import TransactionType, arc4  # noqa: E402
+
+from benchmarks.scenarios import FEE_BPS, PRICE, Deployment  # noqa: E402
+
+FEE = PRICE * FEE_BPS // 10_000
+
+
+def _sell(env: Deployment) -> None:
+    asset = env.listing()
+    with env.call(env.business, env.payment(env.business, PRICE)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(1))
+
+
+def _withdraw(env: Deployment, amount: int) -> None:
+    with env.call(env.admin):
+        env.marketplace.withdraw_fees(arc4.UInt64(amount))
+
+
+def test_sales_accrue_the_fee_without_paying_it(env: Deployment) -> None:
+    _sell(env)
+    _sell(env)
+
+    payments = [group[0] for group in env.ctx.txn.last_group.itxn_groups if group[0].type == TransactionType.Payment]
+    assert [(p.receiver, p.amount) for p in payments] == [(env.seller, PRICE - FEE)]
+    with env.call(env.business):
+        *_, accrued = env.marketplace.get_stats()
+    assert accrued.as_uint64() == 2 * FEE
+
+
+def test_admin_withdraws_in_one_payment(env: Deployment) -> None:
+    _sell(env)
+    _sell(env)
+
+    _withdraw(env, FEE + 1)
+
+    payment = env.ctx.txn.last_group.last_itxn.payment
+    assert (payment.receiver, payment.amount) == (env.admin, FEE + 1)
+    assert env.marketplace.accrued_fees.value == FEE - 1
+
+
+def test_withdrawal_rejections(env: Deployment) -> None:
+    _sell(env)
+
+    with env.call(env.seller), pytest.raises(AssertionError, match="Admin only"):
+        env.marketplace.withdraw_fees(arc4.UInt64(1))
+    with pytest.raises(AssertionError, match="Amount must be > 0"):
+        _withdraw(env, 0)
+    with pytest.raises(AssertionError, match="Exceeds accrued fees"):
+        _withdraw(env, FEE + 1)
+    assert env.marketplace.accrued_fees.value == FEE
@@ -0,0 +1,29 @@
+from benchmarks.harness import CONTRACT_SOURCES, Metrics, Regression, abi_method_names, compare
+
+
+def test_abi_method_names_lists_abimethods_only() -> None:
+    names = abi_method_names(CONTRACT_SOURCES["RetirementRegistry"])
+
+    assert names[:3] == ["create_registry", "retire_credit", "retire_credits"]
+    assert "verify_retirement" in names       # readonly=True
+    assert "_retire" not in names             # @subroutine
+
+
+def test_compare_flags_growth_past_threshold() -> None:
+    baseline = {"C.m": {"inner_txns": 10, "box_writes": 2}}
+    current = {"C.m": Metrics(inner_txns=12, box_writes=2)}
+
+    assert compare(baseline, current, threshold=0.1) == [Regression("C.m", "inner_txns", 10, 12)]
+    assert compare(baseline, current, threshold=0.25) == []
+
+
+def test_compare_treats_new_metrics_as_zero_baseline() -> None:
+    baseline = {"C.m": {"inner_txns": 1}}
+    current = {"C.m": Metrics(inner_txns=1, boxes_created=1)}
+
+    assert compare(baseline, current) == [Regression("C.m", "boxes_created", 0, 1)]
+
+
+def test_compare_ignores_methods_without_baseline() -> None:
+    assert compare({}, {"C.m": Metrics(inner_txns=3)}) == []
+
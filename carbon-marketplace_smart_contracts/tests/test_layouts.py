@@ -0,0 +1,85 @@
+import struct
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("algosdk")
+
+from algosdk.encoding import encode_address  # noqa: E402
+
+from smart_contracts._helpers import layouts  # noqa: E402
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    STATUS_ACTIVE,
+    STATUS_SOLD,
+    decode_listing,
+    listing_box_name,
+    metadata_digest,
+    project_type_code,
+    standard_code,
+)
+
+SELLER = bytes(range(32))
+
+
+def _v2(status: int, fungible: bool, price: int) -> bytes:
+    flags = status | (0x80 if fungible else 0)
+    return struct.pack(
+        ">BBH32sQIIIIBB32s",
+        2, flags, 2023, SELLER, price, 500, 10, 1_700_000_000, 1_800_000_000,
+        project_type_code("REDD+"), standard_code("VCS"), metadata_digest("bafy"),
+    )
+
+
+def test_layout_sizes_match_the_contracts() -> None:
+    assert layouts.LISTING.itemsize == 94
+    assert layouts.LISTING_V1.itemsize == 60
+    assert layouts.LISTING_LEGACY.itemsize == 96
+    assert layouts.PROJECT.itemsize == 40
+    assert layouts.CREDIT_TERMS.itemsize == 24
+    assert layouts.RETIREMENT.itemsize == 88
+
+
+def test_listings_decode_like_the_per_box_decoder() -> None:
+    values = [_v2(STATUS_ACTIVE, True, 1_000 + n) for n in range(1_000)] + [_v2(STATUS_SOLD, False, 7)]
+    names = [listing_box_name(100 + n) for n in range(len(values))]
+
+    records = layouts.decode(values, layouts.LISTING)
+    asset_ids = layouts.decode_keys(names)
+
+    expected = [decode_listing(name, value) for name, value in zip(names, values)]
+    assert asset_ids.tolist() == [listing.asset_id for listing in expected]
+    assert records["price"].tolist() == [listing.price_microalgo for listing in expected]
+    assert layouts.listing_status(records).tolist() == [listing.status for listing in expected]
+    assert layouts.listing_fungible(records).tolist() == [listing.fungible for listing in expected]
+    assert layouts.addresses(records["seller"][:2]) == [encode_address(SELLER)] * 2
+
+    # Filtering on box data alone: REDD+ credits verified by Verra
+    matches = (records["project_type"] == 1) & (records["standard"] == 1)
+    assert matches.all()
+    assert {listing.metadata_digest for listing in expected} == {records["metadata_digest"][0].tobytes()}
+
+
+def test_v1_listings_decode_without_the_v2_fields() -> None:
+    value = struct.pack(">BBH32sQIIII", 1, STATUS_ACTIVE, 2022, SELLER, 9, 5, 1, 1_700_000_000, 1_800_000_000)
+    listing = decode_listing(listing_box_name(3), value)
+    assert (listing.version, listing.price_microalgo, listing.project_type, listing.standard) == (1, 9, 0, 0)
+    assert listing.metadata_digest == bytes(32)
+    assert layouts.LISTING_LAYOUTS[len(value)] == layouts.LISTING_V1
+
+
+def test_frombuffer_is_a_view_and_rejects_partial_records() -> None:
+    buffer = struct.pack(">QQQQQ", 7, 50, 2022, 1_700_000_000, 1_900_000_000) * 3
+    projects = layouts.frombuffer(buffer, layouts.PROJECT)
+    assert projects.base is not None
+    assert projects["expiry"].tolist() == [1_900_000_000] * 3
+
+    with pytest.raises(ValueError, match="whole number"):
+        layouts.frombuffer(buffer[:-1], layouts.PROJECT)
+
+
+def test_retirement_records() -> None:
+    txn_id = bytes(32 * [9])
+    raw = struct.pack(">Q32sQQ32s", 42, SELLER, 12, 1_700_000_123, txn_id)
+    (record,) = layouts.frombuffer(raw, layouts.RETIREMENT)
+    assert (int(record["asset_id"]), int(record["co2_tonnes"]), int(record["retired_at"])) == (42, 12, 1_700_000_123)
+    assert record["txn_id"].tobytes() == txn_id
@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, UInt64, arc4  # noqa: E402
+
+from benchmarks.scenarios import IPFS_HASH, NOW, ONE_YEAR, PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    STATUS_ACTIVE,
+    decode_listing,
+    listing_box_name,
+    metadata_digest,
+    project_type_code,
+    standard_code,
+)
+
+
+def _list(env: Deployment, asset: Asset, amount: int = 1, listed: Asset | None = None) -> None:
+    transfer = env.ctx.any.txn.asset_transfer(
+        sender=env.seller,
+        asset_receiver=env.marketplace_app.address,
+        xfer_asset=asset,
+        asset_amount=UInt64(amount),
+    )
+    with env.call(env.seller, transfer):
+        env.marketplace.list_credit(
+            arc4.UInt64((listed or asset).id),
+            arc4.UInt64(PRICE),
+            arc4.String("Solar"),
+            arc4.String("Gold Standard"),
+            arc4.UInt64(1),
+            arc4.String(IPFS_HASH),
+        )
+
+
+def test_terms_come_from_the_registry(env: Deployment) -> None:
+    asset = env.credit()
+
+    _list(env, asset)
+
+    name = listing_box_name(asset.id.value)
+    listing = decode_listing(name, env.ctx.ledger.get_box(env.marketplace_app, name))
+    assert (listing.expiry_timestamp, listing.vintage_year, listing.co2_tonnes) == (NOW + 5 * ONE_YEAR, 2024, 100)
+    assert (listing.status, listing.listed_at, listing.seller) == (STATUS_ACTIVE, NOW, str(env.seller))
+    assert (listing.project_type, listing.standard) == (project_type_code("Solar"), standard_code("Gold Standard"))
+    assert listing.metadata_digest == metadata_digest(IPFS_HASH)
+
+
+def test_rejects_credits_the_registry_did_not_issue(env: Deployment) -> None:
+    foreign = env.ctx.any.asset(total=UInt64(1), decimals=UInt64(0))
+
+    with pytest.raises(AssertionError, match="Not a registry credit"):
+        _list(env, foreign)
+
+
+def test_rejects_credits_past_their_registry_expiry(env: Deployment) -> None:
+    asset = env.credit()
+    env.ctx.ledger.patch_global_fields(latest_timestamp=NOW + 5 * ONE_YEAR)
+
+    with pytest.raises(AssertionError, match="Cannot list an expired credit"):
+        _list(env, asset)
+
+
+def test_escrow_must_match_the_listing(env: Deployment) -> None:
+    asset = env.credit()
+
+    with pytest.raises(AssertionError, match="Wrong asset ID"):
+        _list(env, asset, listed=env.credit())
+    with pytest.raises(AssertionError, match="Must send exactly 1"):
+        _list(env, asset, amount=2)
+    _list(env, asset)
+    with pytest.raises(AssertionError, match="Already listed"):
+        _list(env, asset)
@@ -0,0 +1,134 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, UInt64, arc4  # noqa: E402
+
+from benchmarks.scenarios import IPFS_HASH, NOW, PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace.contract import (  # noqa: E402
+    INDEX_PAGE_IDS,
+    PROJECT_TYPE_BLUE_CARBON,
+    STATUS_ACTIVE,
+)
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    decode_index,
+    decode_index_page,
+    decode_listing,
+    index_box_name,
+    listing_box_name,
+    project_type_code,
+)
+from smart_contracts.marketplace.reader import get_active_listings_in  # noqa: E402
+
+
+def _list(env: Deployment, project_type: str = "Blue Carbon") -> Asset:
+    asset = env.credit()
+    transfer = env.ctx.any.txn.asset_transfer(
+        sender=env.seller,
+        asset_receiver=env.marketplace_app.address,
+        xfer_asset=asset,
+        asset_amount=UInt64(1),
+    )
+    with env.call(env.seller, transfer):
+        env.marketplace.list_credit(
+            arc4.UInt64(asset.id),
+            arc4.UInt64(PRICE),
+            arc4.String(project_type),
+            arc4.String("VCS"),
+            arc4.UInt64(1),
+            arc4.String(IPFS_HASH),
+        )
+    return asset
+
+
+def _bucket(env: Deployment, assets: list[Asset], project_type: int = PROJECT_TYPE_BLUE_CARBON) -> list[int]:
+    """Indexed asset IDs of every page the given assets fall in, ascending."""
+    pages = {index_box_name(2024, project_type, asset.id.value) for asset in assets}
+    return sorted(
+        asset_id
+        for name in pages
+        if env.ctx.ledger.box_exists(env.marketplace_app, name)
+        for asset_id in decode_index(env.ctx.ledger.get_box(env.marketplace_app, name))
+    )
+
+
+def _page(env: Deployment, page: int) -> list[int]:
+    with env.call(env.business):
+        ids = env.marketplace.get_active_listings(
+            arc4.UInt16(2024), arc4.UInt8(PROJECT_TYPE_BLUE_CARBON), arc4.UInt64(page)
+        )
+    return decode_index_page(ids.bytes.value)
+
+
+def test_buckets_track_active_listings(env: Deployment) -> None:
+    assets = [_list(env) for _ in range(3)]
+    solar = _list(env, "Solar")
+    ids = sorted(asset.id.value for asset in assets)
+
+    assert _bucket(env, assets) == ids
+    assert _bucket(env, [solar], project_type_code("Solar")) == [solar.id.value]
+
+    with env.call(env.business, env.payment(env.business, PRICE)):
+        env.marketplace.buy_credit(arc4.UInt64(ids[1]), arc4.UInt64(1))
+    assert _bucket(env, assets) == [ids[0], ids[2]]
+
+    with env.call(env.seller):
+        env.marketplace.cancel_listing(arc4.UInt64(ids[0]))
+    assert _bucket(env, assets) == [ids[2]]
+
+    env.ctx.ledger.patch_global_fields(latest_timestamp=NOW + 10 * 31_536_000)
+    with env.call(env.business):
+        env.marketplace.sweep_expired(env.asset_ids([Asset(ids[2])]))
+    assert not env.ctx.ledger.box_exists(env.marketplace_app, index_box_name(2024, PROJECT_TYPE_BLUE_CARBON, ids[2]))
+
+
+def test_pages_split_a_bucket_by_asset_id(env: Deployment) -> None:
+    assets = [env.listing() for _ in range(INDEX_PAGE_IDS + 4)]
+    ids = sorted(asset.id.value for asset in assets)
+    pages = sorted({asset_id // INDEX_PAGE_IDS for asset_id in ids})
+
+    assert len(pages) >= 2
+    assert [asset_id for page in pages for asset_id in _page(env, page)] == ids
+    assert all(len(_page(env, page)) <= INDEX_PAGE_IDS for page in pages)
+    assert _page(env, pages[-1] + 1) == []
+
+
+def test_index_listings_backfills_once(env: Deployment) -> None:
+    assets = [env.listing(indexed=False) for _ in range(2)]
+    with env.call(env.seller):
+        assert env.marketplace.index_listings(env.asset_ids(assets)).as_uint64() == 2
+    with env.call(env.seller):
+        assert env.marketplace.index_listings(env.asset_ids(assets)).as_uint64() == 0
+    assert _bucket(env, assets) == sorted(asset.id.value for asset in assets)
+
+
+def test_a_bucket_has_no_cap(env: Deployment) -> None:
+    # More listings than the 4 KB a single bucket box could hold
+    crowd = [env.listing() for _ in range(600)]
+
+    asset = _list(env)
+    name = listing_box_name(asset.id.value)
+    assert decode_listing(name, env.ctx.ledger.get_box(env.marketplace_app, name)).status == STATUS_ACTIVE
+    assert _bucket(env, [*crowd, asset]) == sorted(a.id.value for a in [*crowd, asset])
+
+
+def test_reader_collects_a_bucket_from_its_pages() -> None:
+    def ids(*asset_ids: int) -> bytes:
+        return b"".join(asset_id.to_bytes(8, "big") for asset_id in asset_ids)
+
+    boxes = {
+        index_box_name(2024, PROJECT_TYPE_BLUE_CARBON, 700): ids(700, 701),
+        index_box_name(2024, PROJECT_TYPE_BLUE_CARBON, 5): ids(5),
+        index_box_name(2023, PROJECT_TYPE_BLUE_CARBON, 6): ids(6),
+        listing_box_name(5): bytes(94),
+    }
+    apps = SimpleNamespace(
+        get_box_names=lambda app_id: [SimpleNamespace(name_raw=name) for name in boxes],
+        get_box_values=lambda app_id, names: [boxes[name] for name in names],
+    )
+    client = SimpleNamespace(app_id=1, algorand=SimpleNamespace(app=apps))
+
+    assert get_active_listings_in(client, 2024, PROJECT_TYPE_BLUE_CARBON) == [5, 700, 701]
@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import pytest
+
+from smart_contracts._helpers.manifest import (
+    CREATE,
+    SKIP,
+    UPDATE,
+    AppRecord,
+    Manifest,
+    ReplacementRequired,
+    Schema,
+    plan_action,
+    program_hash,
+    top_up_amount,
+)
+
+SCHEMA = Schema(global_uints=2, global_bytes=1, local_uints=0, local_bytes=0, extra_pages=1)
+
+
+def _record(approval: bytes = b"approval", clear: bytes = b"clear", create_args: list | None = None) -> AppRecord:
+    return AppRecord(
+        app_id=1001,
+        app_address="APP",
+        approval_hash=program_hash(approval),
+        clear_hash=program_hash(clear),
+        schema=SCHEMA,
+        create_args=create_args or [],
+    )
+
+
+def test_plan_action() -> None:
+    record = _record()
+    assert plan_action(None, b"approval", b"clear", SCHEMA, []) == CREATE
+    assert plan_action(record, b"approval", b"clear", SCHEMA, []) == SKIP
+    assert plan_action(record, b"approval v2", b"clear", SCHEMA, []) == UPDATE
+    assert plan_action(record, b"approval", b"clear v2", SCHEMA, []) == UPDATE
+
+
+def test_replacing_an_app_needs_consent() -> None:
+    record = _record(create_args=[250, 1])
+    wider = Schema(global_uints=3, global_bytes=1, local_uints=0, local_bytes=0, extra_pages=1)
+
+    with pytest.raises(ReplacementRequired, match="^schema changed since app 1001"):
+        plan_action(record, b"approval v2", b"clear", wider, [250, 1])
+    # e.g. the marketplace after the registry it reads from was replaced
+    with pytest.raises(ReplacementRequired, match="^create args changed"):
+        plan_action(record, b"approval", b"clear", SCHEMA, [250, 2])
+    with pytest.raises(ReplacementRequired, match="^schema and create args changed.*--replace"):
+        plan_action(record, b"approval", b"clear", wider, [250, 2])
+
+    assert plan_action(record, b"approval v2", b"clear", wider, [250, 1], replace=True) == CREATE
+    assert plan_action(record, b"approval", b"clear", SCHEMA, [250, 1], replace=True) == SKIP
+
+
+def test_top_up_only_below_required_balance() -> None:
+    assert top_up_amount(balance=0, min_balance=100_000, min_spending=1_000_000) == 1_100_000
+    assert top_up_amount(balance=600_000, min_balance=100_000, min_spending=1_000_000) == 500_000
+    assert top_up_amount(balance=1_100_000, min_balance=100_000, min_spending=1_000_000) == 0
+    assert top_up_amount(balance=5_000_000, min_balance=100_000, min_spending=1_000_000) == 0
+
+
+def test_manifest_round_trip(tmp_path: Path) -> None:
+    path = tmp_path / "deployment.json"
+    assert Manifest.load(path, "testnet-v1.0").apps == {}
+
+    manifest = Manifest("testnet-v1.0", {"CarbonMarketplace": _record(create_args=[250, 1])})
+    manifest.save(path)
+    assert Manifest.load(path, "testnet-v1.0") == manifest
+
+    with pytest.raises(ValueError, match="not mainnet-v1.0"):
+        Manifest.load(path, "mainnet-v1.0")
@@ -0,0 +1,80 @@
+import struct
+
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, arc4  # noqa: E402
+
+from benchmarks.scenarios import NOW, ONE_YEAR, PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    LISTING_BOX_BYTES,
+    LISTING_VERSION,
+    STATUS_ACTIVE,
+    STATUS_SOLD,
+    decode_listing,
+    listing_box_name,
+)
+
+
+def _legacy(env: Deployment, total: int = 1, status: int = STATUS_ACTIVE) -> Asset:
+    """A version 0 (96-byte) listing box."""
+    asset = env.credit(total)
+    value = struct.pack(
+        ">Q32sQQQQQQQ",
+        asset.id.value, env.seller.bytes.value, PRICE, 100, 2024, 1, NOW - 60, NOW + ONE_YEAR, status,
+    )
+    env.ctx.ledger.set_box(env.marketplace_app, listing_box_name(asset.id.value), value)
+    return asset
+
+
+def _v1(env: Deployment) -> Asset:
+    """A version 1 (60-byte) listing box."""
+    asset = env.credit()
+    value = struct.pack(
+        ">BBH32sQIIII", 1, STATUS_ACTIVE, 2023, env.seller.bytes.value, PRICE, 100, 1, NOW - 60, NOW + ONE_YEAR
+    )
+    env.ctx.ledger.set_box(env.marketplace_app, listing_box_name(asset.id.value), value)
+    return asset
+
+
+def _box(env: Deployment, asset: Asset) -> bytes:
+    return env.ctx.ledger.get_box(env.marketplace_app, listing_box_name(asset.id.value))
+
+
+def test_migrates_older_layouts_once(env: Deployment) -> None:
+    legacy, fungible, v1, current = _legacy(env), _legacy(env, total=100), _v1(env), env.listing()
+    assets = [legacy, fungible, v1, current, env.credit()]
+
+    with env.call(env.admin):
+        assert env.marketplace.migrate_listings(env.asset_ids(assets)).as_uint64() == 3
+    with env.call(env.admin):
+        assert env.marketplace.migrate_listings(env.asset_ids(assets)).as_uint64() == 0
+
+    listings = {asset: decode_listing(listing_box_name(asset.id.value), _box(env, asset)) for asset in assets[:4]}
+    assert all(len(_box(env, asset)) == LISTING_BOX_BYTES for asset in listings)
+    assert all(listing.version == LISTING_VERSION for listing in listings.values())
+    assert [listings[asset].fungible for asset in (legacy, fungible, v1)] == [False, True, False]
+    assert (listings[v1].vintage_year, listings[v1].project_type, listings[v1].standard) == (2023, 0, 0)
+    assert listings[legacy].price_microalgo == PRICE and listings[legacy].seller == listings[current].seller
+
+
+def test_migration_is_admin_only(env: Deployment) -> None:
+    with env.call(env.seller), pytest.raises(AssertionError, match="Admin only"):
+        env.marketplace.migrate_listings(env.asset_ids([_legacy(env)]))
+
+
+def test_legacy_listings_migrate_on_their_next_write(env: Deployment) -> None:
+    asset = _legacy(env, total=100)
+
+    with env.call(env.business, env.payment(env.business, PRICE * 40)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(40))
+
+    listing = decode_listing(listing_box_name(asset.id.value), _box(env, asset))
+    assert (listing.version, listing.status, listing.fungible) == (LISTING_VERSION, STATUS_ACTIVE, True)
+    assert listing.co2_tonnes == 60
+
+    with env.call(env.business, env.payment(env.business, PRICE * 60)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(60))
+    assert decode_listing(listing_box_name(asset.id.value), _box(env, asset)).status == STATUS_SOLD
@@ -0,0 +1,50 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, UInt64  # noqa: E402
+
+from benchmarks.scenarios import PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace.contract import MAX_LISTINGS_PER_READ, RECLAIM_TOMBSTONE  # noqa: E402
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    STATUS_ACTIVE,
+    STATUS_CANCELLED,
+    Listing,
+    decode_listing_views,
+)
+
+
+def _read(env: Deployment, assets: list[Asset]) -> dict[int, Listing | None]:
+    with env.call(env.business):
+        views = env.marketplace.get_listings(env.asset_ids(assets))
+    return decode_listing_views(views.bytes.value)
+
+
+def test_reads_a_page_in_request_order(env: Deployment) -> None:
+    assets = [env.listing(), env.listing(total=100), env.credit()]
+
+    views = _read(env, assets)
+
+    assert list(views) == [asset.id.value for asset in assets]
+    first, fungible, missing = views.values()
+    assert first is not None and (first.status, first.price_microalgo, first.fungible) == (STATUS_ACTIVE, PRICE, False)
+    assert fungible is not None and (fungible.fungible, fungible.co2_tonnes) == (True, 100)
+    assert missing is None
+
+
+def test_reclaimed_listings_report_their_status(env: Deployment) -> None:
+    env.marketplace.reclaim_mode.value = UInt64(RECLAIM_TOMBSTONE)
+    asset = env.listing()
+    with env.call(env.seller):
+        env.marketplace.cancel_listing(env.asset_ids([asset])[0])
+
+    view = _read(env, [asset])[asset.id.value]
+
+    assert view is not None and (view.status, view.price_microalgo) == (STATUS_CANCELLED, 0)
+
+
+def test_page_size_is_capped(env: Deployment) -> None:
+    assert len(_read(env, [env.listing() for _ in range(MAX_LISTINGS_PER_READ)])) == MAX_LISTINGS_PER_READ
+    with pytest.raises(AssertionError, match="Too many listings"):
+        _read(env, [env.credit() for _ in range(MAX_LISTINGS_PER_READ + 1)])
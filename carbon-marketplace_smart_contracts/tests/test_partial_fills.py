@@ -0,0 +1,95 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, UInt64, arc4  # noqa: E402
+
+from benchmarks.scenarios import IPFS_HASH, PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    STATUS_ACTIVE,
+    STATUS_SOLD,
+    decode_listing,
+    listing_box_name,
+)
+
+
+def _list_fungible(env: Deployment, tonnes: int, min_qty: int) -> Asset:
+    asset = env.credit(total=tonnes)
+    transfer = env.ctx.any.txn.asset_transfer(
+        sender=env.seller,
+        asset_receiver=env.marketplace_app.address,
+        xfer_asset=asset,
+        asset_amount=UInt64(tonnes),
+    )
+    with env.call(env.seller, transfer):
+        env.marketplace.list_credit(
+            arc4.UInt64(asset.id),
+            arc4.UInt64(PRICE),
+            arc4.String("Blue Carbon"),
+            arc4.String("VCS"),
+            arc4.UInt64(min_qty),
+            arc4.String(IPFS_HASH),
+        )
+    return asset
+
+
+def _listing(env: Deployment, asset: Asset):
+    name = listing_box_name(asset.id.value)
+    return decode_listing(name, env.ctx.ledger.get_box(env.marketplace_app, name))
+
+
+def _buy(env: Deployment, asset: Asset, qty: int, paid: int | None = None) -> None:
+    with env.call(env.business, env.payment(env.business, PRICE * qty if paid is None else paid)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(qty))
+
+
+def test_fungible_listing_sells_in_lots(env: Deployment) -> None:
+    asset = _list_fungible(env, tonnes=100, min_qty=10)
+    listing = _listing(env, asset)
+    assert listing.fungible and listing.co2_tonnes == 100 and listing.min_purchase_qty == 10
+
+    _buy(env, asset, 30)
+    transfer = env.ctx.txn.last_group.get_itxn_group(0).asset_transfer(0)
+    assert transfer.asset_receiver == env.business
+    assert transfer.asset_amount == 30
+    listing = _listing(env, asset)
+    assert (listing.status, listing.co2_tonnes) == (STATUS_ACTIVE, 70)
+
+    _buy(env, asset, 70)
+    listing = _listing(env, asset)
+    assert (listing.status, listing.co2_tonnes) == (STATUS_SOLD, 0)
+    assert env.marketplace.total_credits_bought[env.business] == 100
+
+
+def test_lot_below_minimum_is_allowed_only_to_buy_out(env: Deployment) -> None:
+    asset = _list_fungible(env, tonnes=25, min_qty=10)
+    _buy(env, asset, 20)
+
+    with pytest.raises(AssertionError, match="Not enough credits left"):
+        _buy(env, asset, 6)
+    _buy(env, asset, 5)
+    assert _listing(env, asset).status == STATUS_SOLD
+
+
+def test_rejects_small_lots_and_wrong_payments(env: Deployment) -> None:
+    asset = _list_fungible(env, tonnes=100, min_qty=10)
+
+    with pytest.raises(AssertionError, match="Below minimum purchase qty"):
+        _buy(env, asset, 5)
+    with pytest.raises(AssertionError, match="Qty must be > 0"):
+        _buy(env, asset, 0)
+    assert _listing(env, asset).co2_tonnes == 100
+    # The emulator does not roll back a failed call, so this check goes last.
+    with pytest.raises(AssertionError, match="Wrong payment amount"):
+        _buy(env, asset, 10, paid=PRICE)
+
+
+def test_nft_listing_sells_whole(env: Deployment) -> None:
+    asset = env.listing()
+
+    with pytest.raises(AssertionError, match="Not enough credits left"):
+        _buy(env, asset, 2)
+    _buy(env, asset, 1)
+    listing = _listing(env, asset)
+    assert not listing.fungible and listing.status == STATUS_SOLD
@@ -0,0 +1,71 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Account, TransactionType, arc4  # noqa: E402
+
+from benchmarks.scenarios import FEE_BPS, PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace.listing import proceeds_box_name  # noqa: E402
+
+PAYOUT = PRICE - PRICE * FEE_BPS // 10_000
+
+
+def _pull(env: Deployment, enabled: bool) -> None:
+    with env.call(env.admin):
+        env.marketplace.set_pull_payments(arc4.Bool(enabled))
+
+
+def _proceeds(env: Deployment, seller: Account) -> int:
+    with env.call(env.business):
+        return env.marketplace.get_proceeds(arc4.Address(seller)).as_uint64().value
+
+
+def _payments(env: Deployment) -> list[tuple[Account, int]]:
+    return [
+        (group[0].receiver, group[0].amount.value)
+        for group in env.ctx.txn.last_group.itxn_groups
+        if group[0].type == TransactionType.Payment
+    ]
+
+
+def test_sales_credit_the_seller_until_claimed(env: Deployment) -> None:
+    _pull(env, True)
+    asset = env.listing()
+    with env.call(env.business, env.payment(env.business, PRICE)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(1))
+    assert _payments(env) == []
+    basket = [env.listing(), env.listing()]
+    with env.call(env.business, env.payment(env.business, 2 * PRICE)):
+        env.marketplace.buy_credits(env.asset_ids(basket))
+    assert _payments(env) == []
+
+    assert _proceeds(env, env.seller) == 3 * PAYOUT
+    assert env.ctx.ledger.box_exists(env.marketplace_app, proceeds_box_name(str(env.seller)))
+
+    with env.call(env.seller):
+        assert env.marketplace.claim_proceeds().as_uint64() == 3 * PAYOUT
+    assert _payments(env) == [(env.seller, 3 * PAYOUT)]
+    assert not env.ctx.ledger.box_exists(env.marketplace_app, proceeds_box_name(str(env.seller)))
+    assert _proceeds(env, env.seller) == 0
+
+
+def test_balance_stays_claimable_after_switching_back(env: Deployment) -> None:
+    _pull(env, True)
+    asset = env.listing()
+    with env.call(env.business, env.payment(env.business, PRICE)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(1))
+    _pull(env, False)
+
+    asset = env.listing()
+    with env.call(env.business, env.payment(env.business, PRICE)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(1))
+    assert _payments(env) == [(env.seller, PAYOUT)]
+    assert _proceeds(env, env.seller) == PAYOUT
+
+
+def test_claim_and_switch_rejections(env: Deployment) -> None:
+    with env.call(env.seller), pytest.raises(AssertionError, match="Admin only"):
+        env.marketplace.set_pull_payments(arc4.Bool(True))
+    with env.call(env.seller), pytest.raises(AssertionError, match="No proceeds"):
+        env.marketplace.claim_proceeds()
@@ -0,0 +1,100 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, arc4  # noqa: E402
+
+from benchmarks.scenarios import NOW, PRICE, Deployment  # noqa: E402
+from smart_contracts.marketplace.contract import (  # noqa: E402
+    RECLAIM_DELETE,
+    RECLAIM_TOMBSTONE,
+    TOMBSTONE_TTL,
+)
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    STATUS_CANCELLED,
+    STATUS_SOLD,
+    decode_tombstone,
+    listing_box_name,
+    tombstone_box_name,
+)
+
+
+def _set_mode(env: Deployment, mode: int) -> None:
+    with env.call(env.admin):
+        env.marketplace.set_reclaim_mode(arc4.UInt64(mode))
+
+
+def _has_box(env: Deployment, name: bytes) -> bool:
+    return env.ctx.ledger.box_exists(env.marketplace_app, name)
+
+
+def _tombstone(env: Deployment, asset: Asset) -> tuple[int, int]:
+    name = tombstone_box_name(asset.id.value)
+    tombstone = decode_tombstone(name, env.ctx.ledger.get_box(env.marketplace_app, name))
+    return tombstone.status, tombstone.closed_at
+
+
+def test_reclaim_mode_is_admin_only(env: Deployment) -> None:
+    with env.call(env.seller), pytest.raises(AssertionError, match="Admin only"):
+        env.marketplace.set_reclaim_mode(arc4.UInt64(RECLAIM_DELETE))
+    with pytest.raises(AssertionError, match="Unknown reclaim mode"):
+        _set_mode(env, RECLAIM_TOMBSTONE + 1)
+
+
+def test_delete_mode_drops_cancelled_listings(env: Deployment) -> None:
+    _set_mode(env, RECLAIM_DELETE)
+    asset = env.listing()
+
+    with env.call(env.seller):
+        env.marketplace.cancel_listing(arc4.UInt64(asset.id))
+
+    assert not _has_box(env, listing_box_name(asset.id.value))
+    assert not _has_box(env, tombstone_box_name(asset.id.value))
+    with env.call(env.business), pytest.raises(AssertionError, match="Listing not found"):
+        env.marketplace.get_listing(arc4.UInt64(asset.id))
+
+
+def test_tombstone_answers_for_a_sold_listing(env: Deployment) -> None:
+    _set_mode(env, RECLAIM_TOMBSTONE)
+    asset = env.listing()
+
+    with env.call(env.business, env.payment(env.business, PRICE)):
+        env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(1))
+
+    assert not _has_box(env, listing_box_name(asset.id.value))
+    assert _tombstone(env, asset) == (STATUS_SOLD, NOW)
+    with env.call(env.business):
+        _seller, price, *_, status, _type, _standard, _digest = env.marketplace.get_listing(arc4.UInt64(asset.id))
+    assert (price.as_uint64(), status.as_uint64()) == (0, STATUS_SOLD)
+
+
+def test_compact_applies_the_mode_to_settled_listings(env: Deployment) -> None:
+    sold, cancelled, active = env.listing(status=STATUS_SOLD), env.listing(status=STATUS_CANCELLED), env.listing()
+    assets = [sold, cancelled, active, env.credit()]
+    with env.call(env.admin), pytest.raises(AssertionError, match="Reclaim mode is keep"):
+        env.marketplace.compact_listings(env.asset_ids(assets))
+
+    _set_mode(env, RECLAIM_TOMBSTONE)
+    with env.call(env.admin):
+        assert env.marketplace.compact_listings(env.asset_ids(assets)).as_uint64() == 2
+
+    assert _tombstone(env, sold) == (STATUS_SOLD, NOW)
+    assert _tombstone(env, cancelled) == (STATUS_CANCELLED, NOW)
+    assert _has_box(env, listing_box_name(active.id.value))
+
+
+def test_prune_only_deletes_old_tombstones(env: Deployment) -> None:
+    _set_mode(env, RECLAIM_TOMBSTONE)
+    old, young = env.listing(status=STATUS_SOLD), env.listing(status=STATUS_SOLD)
+    with env.call(env.admin):
+        env.marketplace.compact_listings(env.asset_ids([old]))
+    env.ctx.ledger.patch_global_fields(latest_timestamp=NOW + TOMBSTONE_TTL)
+    with env.call(env.admin):
+        env.marketplace.compact_listings(env.asset_ids([young]))
+
+    with env.call(env.ctx.any.account()):
+        assert env.marketplace.prune_tombstones(env.asset_ids([old, young, env.credit()])).as_uint64() == 1
+
+    assert not _has_box(env, tombstone_box_name(old.id.value))
+    assert _has_box(env, tombstone_box_name(young.id.value))
@@ -0,0 +1,107 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, arc4  # noqa: E402
+
+from benchmarks.scenarios import NOW, Deployment  # noqa: E402
+from smart_contracts.retirement.contract import LEDGER_PAGE_SIZE, RetireItem  # noqa: E402
+
+
+def _retire(env: Deployment, credits: list[tuple[Asset, int]]) -> int:
+    batch = arc4.DynamicArray[RetireItem](
+        *[RetireItem(asset_id=arc4.UInt64(asset.id), co2_tonnes=arc4.UInt64(tonnes)) for asset, tonnes in credits]
+    )
+    with env.call(env.business):
+        return env.retirement.retire_credits(batch, arc4.String("Acme"), arc4.String("bafycert")).as_uint64().value
+
+
+def test_batch_burns_and_certifies_every_credit(env: Deployment) -> None:
+    credits = [(env.credit(), 10), (env.credit(), 20), (env.credit(), 30)]
+
+    assert _retire(env, credits) == NOW
+
+    inner = env.ctx.txn.last_group.itxn_groups
+    assert len(inner) == 2 * len(credits)
+    for (asset, _), clawback, destroy in zip(credits, inner[::2], inner[1::2], strict=True):
+        assert (clawback[0].xfer_asset, clawback[0].asset_sender) == (asset, env.business)
+        assert destroy[0].config_asset == asset
+    for asset, tonnes in credits:
+        with env.call(env.admin):
+            company, co2, retired_at = env.retirement.verify_retirement(arc4.UInt64(asset.id))
+        assert (company.native, co2.as_uint64(), retired_at.as_uint64()) == (env.business, tonnes, NOW)
+
+    with env.call(env.admin):
+        tonnes, count = env.retirement.get_global_stats()
+    assert (tonnes.as_uint64(), count.as_uint64()) == (60, 3)
+
+
+def test_batch_rejections(env: Deployment) -> None:
+    with pytest.raises(AssertionError, match="Empty batch"):
+        _retire(env, [])
+    with pytest.raises(AssertionError, match="Invalid tonnes"):
+        _retire(env, [(env.credit(), 0)])
+
+
+def test_unknown_certificate(env: Deployment) -> None:
+    with env.call(env.admin), pytest.raises(AssertionError, match="Retirement certificate not found"):
+        env.retirement.verify_retirement(arc4.UInt64(env.credit().id))
+
+
+def test_partial_fungible_retirement_keeps_the_asa_until_every_unit_is_back(env: Deployment) -> None:
+    credit = env.credit(total=500)
+    app = env.retirement_app.address
+    # The emulator does not move balances for inner transfers, so each step sets
+    # the registry's holding to what the clawback leaves it with.
+    env.ctx.ledger.update_asset_holdings(credit, app, balance=120)
+    _retire(env, [(credit, 120)])
+
+    (clawback,) = env.ctx.txn.last_group.itxn_groups
+    assert (clawback[0].xfer_asset, clawback[0].asset_sender, clawback[0].asset_amount) == (credit, env.business, 120)
+    with env.call(env.admin):
+        tonnes, retired_at = env.retirement.verify_fungible_retirement(arc4.UInt64(credit.id), arc4.Address(env.business))
+    assert (tonnes.as_uint64(), retired_at.as_uint64()) == (120, NOW)
+    with env.call(env.admin), pytest.raises(AssertionError, match="Retirement certificate not found"):
+        env.retirement.verify_retirement(arc4.UInt64(credit.id))
+
+    env.ctx.ledger.update_asset_holdings(credit, app, balance=500)
+    _retire(env, [(credit, 380)])
+
+    clawback, destroy = env.ctx.txn.last_group.itxn_groups
+    assert clawback[0].asset_amount == 380
+    assert destroy[0].config_asset == credit
+    with env.call(env.admin):
+        tonnes, _ = env.retirement.verify_fungible_retirement(arc4.UInt64(credit.id), arc4.Address(env.business))
+    assert tonnes.as_uint64() == 500
+    assert _totals(env, env.business) == (500, 2)
+
+
+def _totals(env: Deployment, company: object) -> tuple[int, int]:
+    with env.call(env.admin):
+        tonnes, count = env.retirement.get_company_totals(arc4.Address(company))
+    return tonnes.as_uint64().value, count.as_uint64().value
+
+
+def _page(env: Deployment, page: int) -> list[int]:
+    with env.call(env.admin):
+        ids = env.retirement.get_company_retirements(arc4.Address(env.business), arc4.UInt64(page))
+    return [asset_id.as_uint64().value for asset_id in ids]
+
+
+def test_company_ledger_pages_every_retirement(env: Deployment) -> None:
+    assert _totals(env, env.business) == (0, 0)
+
+    batch = [(env.credit(), 2) for _ in range(LEDGER_PAGE_SIZE - 1)]
+    _retire(env, batch)
+    single = [env.credit() for _ in range(2)]
+    for asset in single:
+        with env.call(env.business):
+            env.retirement.retire_credit(arc4.UInt64(asset.id), arc4.String("Acme"), arc4.UInt64(5), arc4.String("bafy"))
+
+    retired = [asset.id.value for asset, _ in batch] + [asset.id.value for asset in single]
+    assert _totals(env, env.business) == (2 * len(batch) + 10, LEDGER_PAGE_SIZE + 1)
+    assert _page(env, 0) == retired[:LEDGER_PAGE_SIZE]
+    assert _page(env, 1) == retired[LEDGER_PAGE_SIZE:]
+    assert _page(env, 2) == []
+    assert _totals(env, env.seller) == (0, 0)
@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+
+from benchmarks.simulate import run  # noqa: E402
+
+
+def test_simulation_keeps_invariants_and_is_reproducible() -> None:
+    first = run(credits=300, seed=11, checkpoints=3, issuers=3, businesses=5)
+    second = run(credits=300, seed=11, checkpoints=3, issuers=3, businesses=5)
+
+    assert first["operations"] == second["operations"]
+    assert [point["boxes"] for point in first["checkpoints"]] == [
+        point["boxes"] for point in second["checkpoints"]
+    ]
+    assert first["checkpoints"][-1]["credits_minted"] == 300
+
+
+def test_storage_grows_with_credits() -> None:
+    report = run(credits=200, seed=3, checkpoints=4, issuers=2, businesses=3)
+
+    issuance_boxes = [point["boxes"]["issuance"] for point in report["checkpoints"]]
+    assert issuance_boxes == sorted(issuance_boxes)
+    assert issuance_boxes[-1] >= 2 * 200   # project box + reverse index per credit
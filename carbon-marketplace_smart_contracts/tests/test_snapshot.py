@@ -0,0 +1,123 @@
+import base64
+import struct
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("algosdk")
+
+from smart_contracts._helpers import layouts  # noqa: E402
+from snapshot.columns import Snapshot  # noqa: E402
+from snapshot.export import BoxSource, take_snapshot  # noqa: E402
+
+APP_IDS = {"CreditIssuanceRegistry": 11, "CarbonMarketplace": 12, "RetirementRegistry": 13}
+SELLER = bytes(range(32))
+
+
+def _listing(price: int) -> bytes:
+    return struct.pack(
+        ">BBH32sQIIIIBB32s", 2, 1, 2023, SELLER, price, 500, 10, 1_700_000_000, 1_800_000_000, 1, 1, bytes(32)
+    )
+
+
+def _key(asset_id: int) -> bytes:
+    return asset_id.to_bytes(8, "big")
+
+
+class FakeAlgod:
+    def __init__(self) -> None:
+        self.round = 100
+        self.fetched: list[bytes] = []
+        self.boxes = {
+            12: {
+                _key(1): _listing(1_000),
+                _key(2): _listing(2_000),
+                _key(3): _listing(3_000),
+                _key(4): struct.pack(">Q32sQQQQQQQ", 4, SELLER, 4_000, 10, 2019, 1, 1_600_000_000, 1_650_000_000, 1),
+                b"t" + _key(9): bytes(9),   # tombstone: not exported
+            },
+            11: {
+                b"\x00\x05PRJ-1": struct.pack(">QQQQQ", 1, 500, 2023, 1_700_000_000, 1_800_000_000),
+                b"a" + _key(1): struct.pack(">QQQ", 1_800_000_000, 2023, 500),
+            },
+            13: {
+                _key(7): struct.pack(">Q32sQQ32s", 7, SELLER, 12, 1_700_000_123, bytes(32)),
+            },
+        }
+
+    def status(self) -> dict:
+        return {"last-round": self.round}
+
+    def application_boxes(self, app_id: int) -> dict:
+        return {"boxes": [{"name": base64.b64encode(name).decode()} for name in self.boxes[app_id]]}
+
+    def application_box_by_name(self, app_id: int, name: bytes) -> dict:
+        self.fetched.append(name)
+        return {"value": base64.b64encode(self.boxes[app_id][name]).decode()}
+
+
+class FakeHistory:
+    def __init__(self) -> None:
+        self.transactions_by_round: dict[int, list[dict]] = {}
+
+    def transactions(self, after_round: int, up_to: int) -> list[dict]:
+        return [
+            txn
+            for round_, txns in sorted(self.transactions_by_round.items())
+            if after_round < round_ <= up_to
+            for txn in txns
+        ]
+
+
+def test_full_snapshot_is_memory_mapped(tmp_path: Path) -> None:
+    algod = FakeAlgod()
+    path, stats = take_snapshot(tmp_path, APP_IDS, BoxSource(algod, concurrency=4))
+
+    assert (stats.round, stats.fetched, stats.carried) == (100, 7, 0)
+    snapshot = Snapshot.open(tmp_path)
+    assert snapshot.path == path == tmp_path / "100"
+
+    assert isinstance(snapshot.column("listings", "price"), np.memmap)
+    assert snapshot.keys("listings").tolist() == [1, 2, 3]
+    assert snapshot.column("listings", "price").tolist() == [1_000, 2_000, 3_000]
+    assert snapshot.keys("listings_legacy").tolist() == [4]
+    assert snapshot.keys("projects").tolist() == [b"PRJ-1"]
+    assert snapshot.column("credit_terms", "vintage_year").tolist() == [2023]
+    assert snapshot.records("retirements", layouts.RETIREMENT)["co2_tonnes"].tolist() == [12]
+
+
+def test_incremental_snapshot_fetches_only_changed_boxes(tmp_path: Path) -> None:
+    algod, history = FakeAlgod(), FakeHistory()
+    take_snapshot(tmp_path, APP_IDS, BoxSource(algod), history)
+
+    algod.round = 110
+    algod.fetched.clear()
+    listings = algod.boxes[12]
+    listings[_key(2)] = _listing(2_500)
+    del listings[_key(3)]
+    listings[_key(5)] = _listing(5_000)
+    history.transactions_by_round[105] = [{
+        "application-transaction": {
+            "application-id": 12,
+            "box-references": [
+                {"app": 0, "name": base64.b64encode(_key(2)).decode()},
+                {"app": 0, "name": base64.b64encode(_key(3)).decode()},
+            ],
+        },
+    }]
+
+    _, stats = take_snapshot(tmp_path, APP_IDS, BoxSource(algod), history)
+
+    assert sorted(algod.fetched) == [_key(2), _key(5)]
+    assert (stats.fetched, stats.carried) == (2, 5)
+    snapshot = Snapshot.open(tmp_path)
+    assert snapshot.round == 110
+    assert snapshot.keys("listings").tolist() == [1, 2, 5]
+    assert snapshot.column("listings", "price").tolist() == [1_000, 2_500, 5_000]
+    assert snapshot.keys("projects").tolist() == [b"PRJ-1"]
+
+    # Nothing new on chain: the latest snapshot is reused
+    algod.fetched.clear()
+    path, stats = take_snapshot(tmp_path, APP_IDS, BoxSource(algod), history)
+    assert (path, algod.fetched, stats.carried) == (tmp_path / "110", [], 7)
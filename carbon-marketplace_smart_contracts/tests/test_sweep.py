@@ -0,0 +1,70 @@
+import pytest
+
+pytest.importorskip("algopy_testing")
+pytest.importorskip("algosdk")
+
+from algopy import Asset, UInt64, arc4  # noqa: E402
+
+from benchmarks.scenarios import NOW, Deployment  # noqa: E402
+from smart_contracts.marketplace.contract import RECLAIM_TOMBSTONE  # noqa: E402
+from smart_contracts.marketplace.listing import (  # noqa: E402
+    STATUS_EXPIRED,
+    STATUS_SOLD,
+    decode_tombstone,
+    listing_box_name,
+    tombstone_box_name,
+)
+
+
+def _sweep(env: Deployment, assets: list[Asset]) -> int:
+    with env.call(env.ctx.any.account()):
+        return env.marketplace.sweep_expired(env.asset_ids(assets)).as_uint64().value
+
+
+def _has_box(env: Deployment, name: bytes) -> bool:
+    return env.ctx.ledger.box_exists(env.marketplace_app, name)
+
+
+def test_anyone_sweeps_expired_listings(env: Deployment) -> None:
+    expired = [env.listing(expiry=NOW - 1), env.listing(total=100, expiry=NOW)]
+    live = env.listing()
+    sold = env.listing(status=STATUS_SOLD, expiry=NOW - 1)
+    missing = env.credit()
+
+    assert _sweep(env, [expired[0], live, sold, missing, expired[1]]) == 2
+
+    returned = [group[0] for group in env.ctx.txn.last_group.itxn_groups]
+    assert [(t.xfer_asset, t.asset_receiver, t.asset_amount) for t in returned] == [
+        (expired[0], env.seller, 1),
+        (expired[1], env.seller, 100),
+    ]
+    assert not any(_has_box(env, listing_box_name(asset.id.value)) for asset in expired)
+    assert _has_box(env, listing_box_name(live.id.value))
+    assert _has_box(env, listing_box_name(sold.id.value))
+
+
+def test_sweeping_twice_is_a_no_op(env: Deployment) -> None:
+    asset = env.listing(expiry=NOW - 1)
+
+    assert _sweep(env, [asset]) == 1
+    assert _sweep(env, [asset]) == 0
+
+
+def test_tombstone_mode_records_the_expiry(env: Deployment) -> None:
+    env.marketplace.reclaim_mode.value = UInt64(RECLAIM_TOMBSTONE)
+    asset = env.listing(expiry=NOW - 1)
+
+    assert _sweep(env, [asset]) == 1
+    name = tombstone_box_name(asset.id.value)
+    tombstone = decode_tombstone(name, env.ctx.ledger.get_box(env.marketplace_app, name))
+    assert (tombstone.status, tombstone.closed_at) == (STATUS_EXPIRED, NOW)
+
+
+def test_expired_listing_cannot_be_bought(env: Deployment) -> None:
+    asset = env.listing(expiry=NOW - 1)
+
+    with env.call(env.business):
+        assert env.marketplace.is_listing_expired(arc4.UInt64(asset.id)).native
+    with pytest.raises(AssertionError, match="has expired and cannot be sold"):
+        with env.call(env.business, env.payment(env.business, 1)):
+            env.marketplace.buy_credit(arc4.UInt64(asset.id), arc4.UInt64(1))
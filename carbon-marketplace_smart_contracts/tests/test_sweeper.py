@@ -0,0 +1,61 @@
+import struct
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("algosdk")
+
+from smart_contracts._helpers.avm import References  # noqa: E402
+from smart_contracts.marketplace import sweeper  # noqa: E402
+from smart_contracts.marketplace.listing import listing_box_name  # noqa: E402
+
+SELLER = bytes(32)
+
+
+class FakeApps:
+    """Stands in for algorand.app's box reads."""
+
+    def __init__(self, boxes: dict[bytes, bytes]) -> None:
+        self.boxes = boxes
+
+    def get_box_names(self, app_id: int) -> list[SimpleNamespace]:
+        return [SimpleNamespace(name_raw=name) for name in self.boxes]
+
+    def get_box_values(self, app_id: int, names: list[bytes]) -> list[bytes]:
+        return [self.boxes[name] for name in names]
+
+
+def _boxes() -> dict[bytes, bytes]:
+    legacy = struct.pack(">Q32sQQQQQQQ", 1, SELLER, 5, 100, 2024, 1, 0, 2_000_000_000, 1)
+    v1 = struct.pack(">BBH32sQIIII", 1, 1, 2024, SELLER, 5, 100, 1, 0, 2_000_000_000)
+    v2 = struct.pack(">BBH32sQIIIIBB32s", 2, 1, 2024, SELLER, 5, 100, 1, 0, 2_000_000_000, 8, 1, bytes(32))
+    return {
+        listing_box_name(1): legacy,
+        listing_box_name(2): v1,
+        listing_box_name(3): v2,
+        b"t" + listing_box_name(4): bytes(9),
+    }
+
+
+def test_finds_every_listing_below_the_current_version() -> None:
+    algorand = SimpleNamespace(app=FakeApps(_boxes()))
+
+    legacy = sweeper.find_legacy_listings(algorand, app_id=12)
+
+    assert [(listing.asset_id, listing.version) for listing in legacy] == [(1, 0), (2, 1)]
+
+
+def test_only_legacy_listings_reference_their_asset(monkeypatch: pytest.MonkeyPatch) -> None:
+    sent: list[References] = []
+
+    def send_in_groups(client: object, method: str, groups: list, references: object) -> int:
+        for batch in groups:
+            sent.extend(references(batch))
+        return sum(len(batch) for batch in groups)
+
+    monkeypatch.setattr(sweeper, "_send_in_groups", send_in_groups)
+    legacy = sweeper.find_legacy_listings(SimpleNamespace(app=FakeApps(_boxes())), app_id=12)
+
+    assert sweeper.migrate(client=None, listings=legacy) == 2
+    assert [asset for call in sent for asset in call.assets] == [1]
+    assert sorted(box for call in sent for box in call.boxes) == [listing_box_name(1), listing_box_name(2)]